@@ -1,7 +1,6 @@
 # SPDX-License-Identifier: Apache-2.0
 # Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
 
-import zenoh
 from edgefirst.schemas.sensor_msgs import CameraInfo
 import rerun as rr
 from argparse import ArgumentParser
@@ -9,6 +8,23 @@ import sys
 import asyncio
 import time
 import threading
+import os
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from edgefirst_samples import (  # noqa: E402
+    add_session_args,
+    add_sink_args,
+    log,
+    open_session,
+    payload_bytes,
+    setup_sink,
+    stage_timer,
+)
+from edgefirst_samples.static import (  # noqa: E402
+    ChangeFilter,
+    StaticTopic,
+    add_static_arg,
+)
 
 
 class MessageDrain:
@@ -33,10 +49,12 @@ class MessageDrain:
 
 
 def info_worker(msg):
-    info = CameraInfo.deserialize(msg.payload.to_bytes())
+    timer = stage_timer(msg)
+    info = CameraInfo.deserialize(payload_bytes(msg))
+    timer.lap("deserialize")
     width = info.width
     height = info.height
-    rr.log(
+    log(
         "CameraInfo", rr.TextLog("Camera Width: %d Camera Height: %d" % (width, height))
     )
 
@@ -55,21 +73,19 @@ async def info_handler(drain):
 async def main_async(args):
     # Setup rerun
     args.memory_limit = 10
-    rr.script_setup(args, "camera-info")
+    setup_sink(args, "camera-info")
 
-    # Zenoh config
-    config = zenoh.Config()
-    config.insert_json5("scouting/multicast/interface", "'lo'")
-    if args.remote:
-        config.insert_json5("mode", "'client'")
-        config.insert_json5("connect", f'{{"endpoints": ["{args.remote}"]}}')
-    session = zenoh.open(config)
+    session = open_session(args)
 
     # Create drains
     loop = asyncio.get_running_loop()
     drain = MessageDrain(loop)
 
-    session.declare_subscriber("rt/camera/info", drain.callback)
+    # Fetched once and then every --info-refresh seconds, not on every publish,
+    # and only logged again when the contents change.
+    StaticTopic(
+        session, "rt/camera/info", ChangeFilter(drain.callback), args.info_refresh
+    )
     await asyncio.gather((info_handler(drain)))
 
     while True:
@@ -78,14 +94,9 @@ async def main_async(args):
 
 def main():
     parser = ArgumentParser(description="EdgeFirst Samples - Camera Info")
-    parser.add_argument(
-        "-r",
-        "--remote",
-        type=str,
-        default=None,
-        help="Connect to the remote endpoint instead of local.",
-    )
-    rr.script_add_args(parser)
+    add_session_args(parser)
+    add_static_arg(parser)
+    add_sink_args(parser)
     args = parser.parse_args()
 
     try:
@@ -1,7 +1,6 @@
 # SPDX-License-Identifier: Apache-2.0
 # Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
 
-import zenoh
 from edgefirst.schemas.edgefirst_msgs import DmaBuffer
 import rerun as rr
 import rerun.blueprint as rrb
@@ -14,6 +13,19 @@ import asyncio
 import time
 import threading
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from edgefirst_samples import (  # noqa: E402
+    add_session_args,
+    add_sink_args,
+    count_copy,
+    declare_subscriber,
+    log,
+    open_session,
+    payload_bytes,
+    setup_sink,
+    stage_timer,
+)
+
 # Constants for syscall
 SYS_pidfd_open = 434  # From syscall.h
 SYS_pidfd_getfd = 438  # From syscall.h
@@ -57,7 +69,9 @@ class MessageDrain:
 
 
 def dma_worker(msg):
-    dma_buf = DmaBuffer.deserialize(msg.payload.to_bytes())
+    timer = stage_timer(msg)
+    dma_buf = DmaBuffer.deserialize(payload_bytes(msg))
+    timer.lap("deserialize")
     pidfd = pidfd_open(dma_buf.pid)
     if pidfd < 0:
         return
@@ -68,7 +82,10 @@ def dma_worker(msg):
 
     # Now fd can be used as a file descriptor
     mm = mmap.mmap(fd, dma_buf.length)
-    rr.log(
+    timer.lap("decode")
+    # The frame is copied as the logged image outlives the mapping.
+    count_copy(msg, dma_buf.length)
+    log(
         "/camera",
         rr.Image(
             bytes=mm[:],
@@ -96,7 +113,7 @@ async def dma_handler(drain):
 async def main_async(args):
     # Setup rerun
     args.memory_limit = 10
-    rr.script_setup(args, "camera-dma")
+    setup_sink(args, "camera-dma")
     blueprint = rrb.Blueprint(
         rrb.Grid(contents=[rrb.Spatial2DView(origin="/camera", name="Camera Feed")])
     )
@@ -106,19 +123,13 @@ async def main_async(args):
         print("DMA example is only functional when run on an EdgeFirst Platform")
         return
 
-    # Zenoh config
-    config = zenoh.Config()
-    config.insert_json5("scouting/multicast/interface", "'lo'")
-    if args.remote:
-        config.insert_json5("mode", "'client'")
-        config.insert_json5("connect", f'{{"endpoints": ["{args.remote}"]}}')
-    session = zenoh.open(config)
+    session = open_session(args)
 
     # Create drains
     loop = asyncio.get_running_loop()
     drain = MessageDrain(loop)
 
-    session.declare_subscriber("rt/camera/dma", drain.callback)
+    declare_subscriber(session, "rt/camera/dma", drain.callback)
     await asyncio.gather((dma_handler(drain)))
 
     while True:
@@ -127,14 +138,8 @@ async def main_async(args):
 
 def main():
     parser = ArgumentParser(description="EdgeFirst Samples - DMA")
-    parser.add_argument(
-        "-r",
-        "--remote",
-        type=str,
-        default=None,
-        help="Connect to the remote endpoint instead of local.",
-    )
-    rr.script_add_args(parser)
+    add_session_args(parser)
+    add_sink_args(parser)
     args = parser.parse_args()
 
     try:
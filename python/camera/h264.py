@@ -6,11 +6,24 @@ import asyncio
 import io
 import sys
 import av
-import zenoh
 import time
 import threading
 import rerun as rr
 import rerun.blueprint as rrb
+import os
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from edgefirst_samples import (  # noqa: E402
+    add_session_args,
+    add_sink_args,
+    count_copy,
+    declare_subscriber,
+    log,
+    open_session,
+    payload_bytes,
+    setup_sink,
+    stage_timer,
+)
 
 
 class MessageDrain:
@@ -35,7 +48,11 @@ class MessageDrain:
 
 
 def h264_worker(msg, raw_data, container):
-    raw_data.write(msg.payload.to_bytes())
+    timer = stage_timer(msg)
+    data = payload_bytes(msg)
+    # The demuxer reads from raw_data, so the packet is copied once more.
+    raw_data.write(data)
+    count_copy(msg, len(data))
     raw_data.seek(0)
     for packet in container.demux():
         try:
@@ -44,8 +61,9 @@ def h264_worker(msg, raw_data, container):
             raw_data.seek(0)
             raw_data.truncate(0)
             for frame in packet.decode():
+                timer.lap("decode")
                 frame_array = frame.to_ndarray(format="rgb24")
-                rr.log("/camera", rr.Image(frame_array))
+                log("/camera", rr.Image(frame_array))
         except Exception:
             continue
 
@@ -66,25 +84,19 @@ async def h264_handler(drain):
 async def main_async(args):
     # Setup rerun
     args.memory_limit = 10
-    rr.script_setup(args, "camera-h264")
+    setup_sink(args, "camera-h264")
     blueprint = rrb.Blueprint(
         rrb.Grid(contents=[rrb.Spatial2DView(origin="/camera", name="Camera Feed")])
     )
     rr.send_blueprint(blueprint)
 
-    # Zenoh config
-    config = zenoh.Config()
-    config.insert_json5("scouting/multicast/interface", "'lo'")
-    if args.remote:
-        config.insert_json5("mode", "'client'")
-        config.insert_json5("connect", f'{{"endpoints": ["{args.remote}"]}}')
-    session = zenoh.open(config)
+    session = open_session(args)
 
     # Create drains
     loop = asyncio.get_running_loop()
     drain = MessageDrain(loop)
 
-    session.declare_subscriber("rt/camera/h264", drain.callback)
+    declare_subscriber(session, "rt/camera/h264", drain.callback)
     await asyncio.gather((h264_handler(drain)))
 
     while True:
@@ -93,14 +105,8 @@ async def main_async(args):
 
 def main():
     parser = ArgumentParser(description="EdgeFirst Samples - H264")
-    parser.add_argument(
-        "-r",
-        "--remote",
-        type=str,
-        default=None,
-        help="Connect to the remote endpoint instead of local.",
-    )
-    rr.script_add_args(parser)
+    add_session_args(parser)
+    add_sink_args(parser)
     args = parser.parse_args()
 
     try:
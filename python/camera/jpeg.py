@@ -1,18 +1,29 @@
 # SPDX-License-Identifier: Apache-2.0
 # Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
 
-import zenoh
-from edgefirst.schemas.sensor_msgs import CompressedImage
 import rerun as rr
 from argparse import ArgumentParser
-import numpy as np
 import sys
 import cv2
 import asyncio
-import zenoh
 import time
-import threading
 import rerun.blueprint as rrb
+import os
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from edgefirst_samples import (  # noqa: E402
+    add_session_args,
+    add_sink_args,
+    add_workers_arg,
+    declare_subscriber,
+    log,
+    open_session,
+    payload_bytes,
+    run_workers,
+    setup_sink,
+    stage_timer,
+)
+from edgefirst_samples.cdr import decode_compressed_image  # noqa: E402
 
 
 class MessageDrain:
@@ -37,47 +48,36 @@ class MessageDrain:
 
 
 def jpeg_worker(msg):
-    image = CompressedImage.deserialize(msg.payload.to_bytes())
-    np_arr = np.frombuffer(bytearray(image.data), np.uint8)
-    im = cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
+    timer = stage_timer(msg)
+    image = decode_compressed_image(payload_bytes(msg))
+    timer.lap("deserialize")
+    im = cv2.imdecode(image.data, cv2.IMREAD_COLOR)
+    timer.lap("decode")
     im = cv2.cvtColor(im, cv2.COLOR_BGR2RGB)
-    rr.log("/camera", rr.Image(im))
+    log("/camera", rr.Image(im))
 
 
-async def jpeg_handler(drain):
-    while True:
-        msg = await drain.get_latest()
-        thread = threading.Thread(target=jpeg_worker, args=[msg])
-        thread.start()
-
-        while thread.is_alive():
-            await asyncio.sleep(0.001)
-        thread.join()
+async def jpeg_handler(drain, workers):
+    await run_workers(drain, jpeg_worker, workers)
 
 
 async def main_async(args):
     # Setup rerun
     args.memory_limit = 10
-    rr.script_setup(args, "camera-jpeg")
+    setup_sink(args, "camera-jpeg")
     blueprint = rrb.Blueprint(
         rrb.Grid(contents=[rrb.Spatial2DView(origin="/camera", name="Camera Feed")])
     )
     rr.send_blueprint(blueprint)
 
-    # Zenoh config
-    config = zenoh.Config()
-    config.insert_json5("scouting/multicast/interface", "'lo'")
-    if args.remote:
-        config.insert_json5("mode", "'client'")
-        config.insert_json5("connect", f'{{"endpoints": ["{args.remote}"]}}')
-    session = zenoh.open(config)
+    session = open_session(args)
 
     # Create drains
     loop = asyncio.get_running_loop()
     drain = MessageDrain(loop)
 
-    session.declare_subscriber("rt/camera/jpeg", drain.callback)
-    await asyncio.gather((jpeg_handler(drain)))
+    declare_subscriber(session, "rt/camera/jpeg", drain.callback)
+    await asyncio.gather((jpeg_handler(drain, args.workers)))
 
     while True:
         asyncio.sleep(0.001)
@@ -85,14 +85,9 @@ async def main_async(args):
 
 def main():
     parser = ArgumentParser(description="EdgeFirst Samples - JPEG")
-    parser.add_argument(
-        "-r",
-        "--remote",
-        type=str,
-        default=None,
-        help="Connect to the remote endpoint instead of local.",
-    )
-    rr.script_add_args(parser)
+    add_session_args(parser)
+    add_sink_args(parser)
+    add_workers_arg(parser)
     args = parser.parse_args()
 
     try:
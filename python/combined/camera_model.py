@@ -6,7 +6,6 @@ import asyncio
 import io
 import sys
 import av
-import zenoh
 import zstd
 import cv2
 import time
@@ -14,7 +13,22 @@ import threading
 import rerun as rr
 import rerun.blueprint as rrb
 import numpy as np
-from edgefirst.schemas.edgefirst_msgs import Detect, Mask
+from edgefirst.schemas.edgefirst_msgs import Detect
+import os
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from edgefirst_samples import (  # noqa: E402
+    add_session_args,
+    add_sink_args,
+    count_copy,
+    declare_subscriber,
+    log,
+    open_session,
+    payload_bytes,
+    setup_sink,
+    stage_timer,
+)
+from edgefirst_samples.cdr import decode_mask  # noqa: E402
 
 
 class FrameSize:
@@ -54,7 +68,11 @@ class MessageDrain:
 
 
 def h264_worker(msg, frame_storage, raw_data, container):
-    raw_data.write(msg.payload.to_bytes())
+    timer = stage_timer(msg)
+    data = payload_bytes(msg)
+    # The demuxer reads from raw_data, so the packet is copied once more.
+    raw_data.write(data)
+    count_copy(msg, len(data))
     raw_data.seek(0)
     for packet in container.demux():
         try:
@@ -63,9 +81,10 @@ def h264_worker(msg, frame_storage, raw_data, container):
             raw_data.seek(0)
             raw_data.truncate(0)
             for frame in packet.decode():
+                timer.lap("decode")
                 frame_array = frame.to_ndarray(format="rgb24")
                 frame_storage.set(frame_array.shape[1], frame_array.shape[0])
-                rr.log("/camera", rr.Image(frame_array))
+                log("/camera", rr.Image(frame_array))
         except Exception:
             continue
 
@@ -87,7 +106,9 @@ async def h264_handler(drain, frame_storage):
 
 
 def boxes2d_worker(msg, boxes_tracked, frame_size):
-    detection = Detect.deserialize(msg.payload.to_bytes())
+    timer = stage_timer(msg)
+    detection = Detect.deserialize(payload_bytes(msg))
+    timer.lap("deserialize")
     centers, sizes, labels, colors = [], [], [], []
     for box in detection.boxes:
         if box.track.id and box.track.id not in boxes_tracked:
@@ -105,7 +126,7 @@ def boxes2d_worker(msg, boxes_tracked, frame_size):
             (int(box.center_x * frame_size[0]), int(box.center_y * frame_size[1]))
         )
         sizes.append((int(box.width * frame_size[0]), int(box.height * frame_size[1])))
-    rr.log(
+    log(
         "/camera/boxes",
         rr.Boxes2D(centers=centers, sizes=sizes, labels=labels, colors=colors),
     )
@@ -128,24 +149,26 @@ async def boxes2d_handler(drain, frame_storage):
 
 
 def mask_worker(msg, frame_size, remote):
-    mask = Mask.deserialize(msg.payload.to_bytes())
+    timer = stage_timer(msg)
+    mask = decode_mask(payload_bytes(msg))
+    timer.lap("deserialize")
     if remote:
-        decoded_array = zstd.decompress(bytes(mask.mask))
+        decoded_array = zstd.decompress(mask.mask)
         np_arr = np.frombuffer(decoded_array, np.uint8).reshape(
             mask.height, mask.width, -1
         )
     else:
-        np_arr = np.asarray(mask.mask, dtype=np.uint8)
-        np_arr = np.reshape(np_arr, [mask.height, mask.width, -1])
+        np_arr = mask.mask.reshape(mask.height, mask.width, -1)
+    timer.lap("decode")
     np_arr = cv2.resize(np_arr, frame_size)
     np_arr = np.argmax(np_arr, axis=2)
 
-    rr.log("/camera/mask", rr.SegmentationImage(np_arr))
+    log("/camera/mask", rr.SegmentationImage(np_arr))
 
 
 async def mask_handler(drain, frame_storage, remote):
     _ = await frame_storage.get()
-    rr.log(
+    log(
         "/",
         rr.AnnotationContext(
             [(0, "background", (0, 0, 0, 0)), (1, "person", (0, 255, 0))]
@@ -165,20 +188,14 @@ async def mask_handler(drain, frame_storage, remote):
 async def main_async(args):
     # Setup rerun
     # args.memory_limit = 10
-    rr.script_setup(args, "camera-model")
+    setup_sink(args, "camera-model")
 
     blueprint = rrb.Blueprint(
         rrb.Grid(contents=[rrb.Spatial2DView(origin="/camera", name="Camera Feed")])
     )
     rr.send_blueprint(blueprint)
 
-    # Zenoh config
-    config = zenoh.Config()
-    config.insert_json5("scouting/multicast/interface", "'lo'")
-    if args.remote:
-        config.insert_json5("mode", "'client'")
-        config.insert_json5("connect", f'{{"endpoints": ["{args.remote}"]}}')
-    session = zenoh.open(config)
+    session = open_session(args)
 
     # Create drains
     loop = asyncio.get_running_loop()
@@ -187,12 +204,12 @@ async def main_async(args):
     mask_drain = MessageDrain(loop)
     frame_size_storage = FrameSize()
 
-    session.declare_subscriber("rt/camera/h264", h264_drain.callback)
-    session.declare_subscriber("rt/model/boxes2d", boxes_drain.callback)
+    declare_subscriber(session, "rt/camera/h264", h264_drain.callback)
+    declare_subscriber(session, "rt/model/boxes2d", boxes_drain.callback)
     if args.remote:
-        session.declare_subscriber("rt/model/mask_compressed", mask_drain.callback)
+        declare_subscriber(session, "rt/model/mask_compressed", mask_drain.callback)
     else:
-        session.declare_subscriber("rt/model/mask", mask_drain.callback)
+        declare_subscriber(session, "rt/model/mask", mask_drain.callback)
     await asyncio.gather(
         h264_handler(h264_drain, frame_size_storage),
         boxes2d_handler(boxes_drain, frame_size_storage),
@@ -205,14 +222,8 @@ async def main_async(args):
 
 def main():
     parser = ArgumentParser(description="EdgeFirst Samples - Camera-Model")
-    parser.add_argument(
-        "-r",
-        "--remote",
-        type=str,
-        default=None,
-        help="Connect to the remote endpoint instead of local.",
-    )
-    rr.script_add_args(parser)
+    add_session_args(parser)
+    add_sink_args(parser)
     args = parser.parse_args()
 
     try:
@@ -6,7 +6,6 @@ import asyncio
 import io
 import sys
 import av
-import zenoh
 import threading
 import time
 import numpy as np
@@ -15,7 +14,20 @@ import rerun.blueprint as rrb
 from edgefirst.schemas.edgefirst_msgs import Detect
 from edgefirst.schemas.sensor_msgs import PointCloud2
 from edgefirst.schemas import decode_pcd, colormap, turbo_colormap
-import threading
+import os
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from edgefirst_samples import (  # noqa: E402
+    add_session_args,
+    add_sink_args,
+    count_copy,
+    declare_subscriber,
+    log,
+    open_session,
+    payload_bytes,
+    setup_sink,
+    stage_timer,
+)
 
 
 class FrameSize:
@@ -55,7 +67,11 @@ class MessageDrain:
 
 
 def h264_worker(msg, frame_storage, raw_data, container):
-    raw_data.write(msg.payload.to_bytes())
+    timer = stage_timer(msg)
+    data = payload_bytes(msg)
+    # The demuxer reads from raw_data, so the packet is copied once more.
+    raw_data.write(data)
+    count_copy(msg, len(data))
     raw_data.seek(0)
     for packet in container.demux():
         try:
@@ -64,9 +80,10 @@ def h264_worker(msg, frame_storage, raw_data, container):
             raw_data.seek(0)
             raw_data.truncate(0)
             for frame in packet.decode():
+                timer.lap("decode")
                 frame_array = frame.to_ndarray(format="rgb24")
                 frame_storage.set(frame_array.shape[1], frame_array.shape[0])
-                rr.log("/camera", rr.Image(frame_array))
+                log("/camera", rr.Image(frame_array))
         except Exception:
             continue
 
@@ -88,7 +105,9 @@ async def h264_handler(drain, frame_storage):
 
 
 def boxes2d_worker(msg, boxes_tracked, frame_size):
-    detection = Detect.deserialize(msg.payload.to_bytes())
+    timer = stage_timer(msg)
+    detection = Detect.deserialize(payload_bytes(msg))
+    timer.lap("deserialize")
     centers, sizes, labels, colors = [], [], [], []
     for box in detection.boxes:
         if box.track.id and box.track.id not in boxes_tracked:
@@ -106,7 +125,7 @@ def boxes2d_worker(msg, boxes_tracked, frame_size):
             (int(box.center_x * frame_size[0]), int(box.center_y * frame_size[1]))
         )
         sizes.append((int(box.width * frame_size[0]), int(box.height * frame_size[1])))
-    rr.log(
+    log(
         "/camera/boxes",
         rr.Boxes2D(centers=centers, sizes=sizes, labels=labels, colors=colors),
     )
@@ -129,16 +148,19 @@ async def boxes2d_handler(drain, frame_storage):
 
 
 def clusters_worker(msg):
-    pcd = PointCloud2.deserialize(msg.payload.to_bytes())
+    timer = stage_timer(msg)
+    pcd = PointCloud2.deserialize(payload_bytes(msg))
+    timer.lap("deserialize")
     points = decode_pcd(pcd)
+    timer.lap("decode")
     clusters = [p for p in points if p.cluster_id > 0]
     if not clusters:
-        rr.log("/pointcloud/clusters", rr.Points3D([], colors=[]))
+        log("/pointcloud/clusters", rr.Points3D([], colors=[]))
         return
     max_id = max(p.cluster_id for p in clusters)
     pos = [[p.x, p.y, p.z] for p in clusters]
     colors = [colormap(turbo_colormap, p.cluster_id / max_id) for p in clusters]
-    rr.log("/pointcloud/clusters", rr.Points3D(pos, colors=colors))
+    log("/pointcloud/clusters", rr.Points3D(pos, colors=colors))
 
 
 async def clusters_handler(drain):
@@ -155,7 +177,7 @@ async def clusters_handler(drain):
 async def main_async(args):
     # Setup rerun
     # args.memory_limit = 10
-    rr.script_setup(args, "camera-radar")
+    setup_sink(args, "camera-radar")
 
     blueprint = rrb.Blueprint(
         rrb.Grid(
@@ -167,13 +189,7 @@ async def main_async(args):
     )
     rr.send_blueprint(blueprint)
 
-    # Zenoh config
-    config = zenoh.Config()
-    config.insert_json5("scouting/multicast/interface", "'lo'")
-    if args.remote:
-        config.insert_json5("mode", "'client'")
-        config.insert_json5("connect", f'{{"endpoints": ["{args.remote}"]}}')
-    session = zenoh.open(config)
+    session = open_session(args)
 
     # Create drains
     loop = asyncio.get_running_loop()
@@ -183,9 +199,9 @@ async def main_async(args):
     frame_size_storage = FrameSize()
 
     # Declare subscribers
-    session.declare_subscriber("rt/camera/h264", h264_drain.callback)
-    session.declare_subscriber("rt/model/boxes2d", boxes2d_drain.callback)
-    session.declare_subscriber("rt/radar/clusters", radar_drain.callback)
+    declare_subscriber(session, "rt/camera/h264", h264_drain.callback)
+    declare_subscriber(session, "rt/model/boxes2d", boxes2d_drain.callback)
+    declare_subscriber(session, "rt/radar/clusters", radar_drain.callback)
 
     # Launch concurrent processing tasks
     await asyncio.gather(
@@ -200,14 +216,8 @@ async def main_async(args):
 
 def main():
     parser = ArgumentParser(description="EdgeFirst Samples - Camera-Radar")
-    parser.add_argument(
-        "-r",
-        "--remote",
-        type=str,
-        default=None,
-        help="Connect to the remote endpoint instead of local.",
-    )
-    rr.script_add_args(parser)
+    add_session_args(parser)
+    add_sink_args(parser)
     args = parser.parse_args()
 
     try:
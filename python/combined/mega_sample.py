@@ -5,7 +5,6 @@ from argparse import ArgumentParser
 import time
 import rerun as rr
 import rerun.blueprint as rrb
-import zenoh
 import ctypes
 import os
 import asyncio
@@ -17,6 +16,28 @@ import numpy as np
 from edgefirst.schemas.sensor_msgs import PointCloud2
 from edgefirst.schemas import decode_pcd, colormap, turbo_colormap
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from edgefirst_samples import (  # noqa: E402
+    add_session_args,
+    add_sink_args,
+    count_copy,
+    declare_subscriber,
+    log,
+    open_session,
+    payload_bytes,
+    setup_sink,
+    stage_timer,
+    watch_topics,
+)
+from edgefirst_samples.cdr import decode_compressed_image, decode_mask  # noqa: E402
+from edgefirst_samples.gps import GpsTrack, add_track_args  # noqa: E402
+from edgefirst_samples.static import (  # noqa: E402
+    ChangeFilter,
+    StaticTopic,
+    add_static_arg,
+)
+from edgefirst_samples.stats import topic_stats  # noqa: E402
+
 # Constants for syscall
 SYS_pidfd_open = 434  # From syscall.h
 SYS_pidfd_getfd = 438  # From syscall.h
@@ -72,7 +93,11 @@ class MessageDrain:
 
 
 def h264_worker(msg, frame_storage, raw_data, container):
-    raw_data.write(msg.payload.to_bytes())
+    timer = stage_timer(msg)
+    data = payload_bytes(msg)
+    # The demuxer reads from raw_data, so the packet is copied once more.
+    raw_data.write(data)
+    count_copy(msg, len(data))
     raw_data.seek(0)
     for packet in container.demux():
         try:
@@ -81,9 +106,10 @@ def h264_worker(msg, frame_storage, raw_data, container):
             raw_data.seek(0)
             raw_data.truncate(0)
             for frame in packet.decode():
+                timer.lap("decode")
                 frame_array = frame.to_ndarray(format="rgb24")
                 frame_storage.set(frame_array.shape[1], frame_array.shape[0])
-                rr.log("/camera", rr.Image(frame_array))
+                log("/camera", rr.Image(frame_array))
         except Exception:
             continue
 
@@ -91,24 +117,33 @@ def h264_worker(msg, frame_storage, raw_data, container):
 async def h264_handler(drain, frame_storage):
     raw_data = io.BytesIO()
     container = av.open(raw_data, format="h264", mode="r")
+    thread = None
 
-    while True:
-        msg = await drain.get_latest()
-        thread = threading.Thread(
-            target=h264_worker, args=[msg, frame_storage, raw_data, container]
-        )
-        thread.start()
-
-        while thread.is_alive():
-            await asyncio.sleep(0.001)
-        thread.join()
+    try:
+        while True:
+            msg = await drain.get_latest()
+            thread = threading.Thread(
+                target=h264_worker, args=[msg, frame_storage, raw_data, container]
+            )
+            thread.start()
+
+            while thread.is_alive():
+                await asyncio.sleep(0.001)
+            thread.join()
+    finally:
+        # Once cancelled the worker may still be demuxing from the container.
+        if thread is not None:
+            thread.join()
+        container.close()
 
 
 def dma_worker(msg, frame_storage):
     from edgefirst.schemas.edgefirst_msgs import DmaBuffer
     import mmap
 
-    dma_buf = DmaBuffer.deserialize(msg.payload.to_bytes())
+    timer = stage_timer(msg)
+    dma_buf = DmaBuffer.deserialize(payload_bytes(msg))
+    timer.lap("deserialize")
     pidfd = pidfd_open(dma_buf.pid)
     if pidfd < 0:
         return
@@ -120,7 +155,10 @@ def dma_worker(msg, frame_storage):
     frame_storage.set(dma_buf.width, dma_buf.height)
     # Now fd can be used as a file descriptor
     mm = mmap.mmap(fd, dma_buf.length)
-    rr.log(
+    timer.lap("decode")
+    # The frame is copied as the logged image outlives the mapping.
+    count_copy(msg, dma_buf.length)
+    log(
         "/camera",
         rr.Image(
             bytes=mm[:],
@@ -146,16 +184,16 @@ async def dma_handler(drain, frame_storage):
 
 
 def jpeg_worker(msg, frame_storage):
-    import numpy as np
     import cv2
-    from edgefirst.schemas.sensor_msgs import CompressedImage
 
-    image = CompressedImage.deserialize(msg.payload.to_bytes())
-    np_arr = np.frombuffer(bytearray(image.data), np.uint8)
-    im = cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
+    timer = stage_timer(msg)
+    image = decode_compressed_image(payload_bytes(msg))
+    timer.lap("deserialize")
+    im = cv2.imdecode(image.data, cv2.IMREAD_COLOR)
+    timer.lap("decode")
     im = cv2.cvtColor(im, cv2.COLOR_BGR2RGB)
-    frame_storage.set(im.shape[0], im.shape[1])
-    rr.log("/camera", rr.Image(im))
+    frame_storage.set(im.shape[1], im.shape[0])
+    log("/camera", rr.Image(im))
 
 
 async def jpeg_handler(drain, frame_storage):
@@ -172,7 +210,9 @@ async def jpeg_handler(drain, frame_storage):
 def boxes2d_worker(msg, boxes_tracked, frame_size):
     from edgefirst.schemas.edgefirst_msgs import Detect
 
-    detection = Detect.deserialize(msg.payload.to_bytes())
+    timer = stage_timer(msg)
+    detection = Detect.deserialize(payload_bytes(msg))
+    timer.lap("deserialize")
     centers, sizes, labels, colors = [], [], [], []
     for box in detection.boxes:
         if box.track.id and box.track.id not in boxes_tracked:
@@ -190,8 +230,8 @@ def boxes2d_worker(msg, boxes_tracked, frame_size):
             (int(box.center_x * frame_size[0]), int(box.center_y * frame_size[1]))
         )
         sizes.append((int(box.width * frame_size[0]), int(box.height * frame_size[1])))
-    rr.log("/camera/boxes", rr.Boxes2D(centers=centers, sizes=sizes, labels=labels))
-    rr.log(
+    log("/camera/boxes", rr.Boxes2D(centers=centers, sizes=sizes, labels=labels))
+    log(
         "/metrics/detection_inference",
         rr.Scalars(
             float(detection.model_time.sec) + float(detection.model_time.nanosec / 1e9)
@@ -215,38 +255,53 @@ async def boxes2d_handler(drain, frame_storage):
         thread.join()
 
 
-def mask_worker(msg, frame_size, remote):
-    from edgefirst.schemas.edgefirst_msgs import Mask
+def mask_worker(msg, frame_size, compressed):
     import zstd
     import numpy as np
     import cv2
 
-    mask = Mask.deserialize(msg.payload.to_bytes())
-    if remote:
-        decoded_array = zstd.decompress(bytes(mask.mask))
+    timer = stage_timer(msg)
+    mask = decode_mask(payload_bytes(msg))
+    timer.lap("deserialize")
+    if compressed:
+        decoded_array = zstd.decompress(mask.mask)
         np_arr = np.frombuffer(decoded_array, np.uint8).reshape(
             mask.height, mask.width, -1
         )
     else:
-        np_arr = np.asarray(mask.mask, dtype=np.uint8)
-        np_arr = np.reshape(np_arr, [mask.height, mask.width, -1])
+        np_arr = mask.mask.reshape(mask.height, mask.width, -1)
+    timer.lap("decode")
     np_arr = cv2.resize(np_arr, frame_size)
     np_arr = np.argmax(np_arr, axis=2)
-    rr.log(
-        "/",
-        rr.AnnotationContext(
-            [(0, "background", (0, 0, 0)), (1, "person", (0, 255, 0))]
-        ),
-    )
-    rr.log("/camera/mask", rr.SegmentationImage(np_arr))
+    log("/camera/mask", rr.SegmentationImage(np_arr))
 
 
-async def mask_handler(drain, frame_storage, remote):
+# Mask classes until rt/model/info provides the labels of the model.
+DEFAULT_CLASSES = [(0, "background", (0, 0, 0)), (1, "person", (0, 255, 0))]
+
+
+def model_info_worker(msg):
+    """Names the mask classes after the labels of the model."""
+    from edgefirst.schemas.edgefirst_msgs import ModelInfo
+
+    timer = stage_timer(msg)
+    info = ModelInfo.deserialize(payload_bytes(msg))
+    timer.lap("deserialize")
+    classes = [
+        (index, label, (0, 0, 0)) if index == 0 else (index, label)
+        for index, label in enumerate(info.labels)
+    ]
+    log("/", rr.AnnotationContext(classes or DEFAULT_CLASSES), static=True)
+
+
+async def mask_handler(drain, frame_storage, compressed):
     _ = await frame_storage.get()
     while True:
         msg = await drain.get_latest()
         frame_size = await frame_storage.get()
-        thread = threading.Thread(target=mask_worker, args=[msg, frame_size, remote])
+        thread = threading.Thread(
+            target=mask_worker, args=[msg, frame_size, compressed]
+        )
         thread.start()
 
         while thread.is_alive():
@@ -254,17 +309,24 @@ async def mask_handler(drain, frame_storage, remote):
         thread.join()
 
 
-def gps_worker(msg):
+def gps_worker(msg, track):
     from edgefirst.schemas.sensor_msgs import NavSatFix
 
-    gps = NavSatFix.deserialize(msg.payload.to_bytes())
-    rr.log("/gps", rr.GeoPoints(lat_lon=[gps.latitude, gps.longitude]))
+    timer = stage_timer(msg)
+    gps = NavSatFix.deserialize(payload_bytes(msg))
+    timer.lap("deserialize")
+    log("/gps", rr.GeoPoints(lat_lon=[gps.latitude, gps.longitude]))
+    if track.add(gps.latitude, gps.longitude):
+        track.log()
 
 
-async def gps_handler(drain):
+async def gps_handler(drain, args):
+    track = GpsTrack(
+        "/gps/track", args.track_tolerance, args.track_segment, args.track_segments
+    )
     while True:
         msg = await drain.get_latest()
-        thread = threading.Thread(target=gps_worker, args=[msg])
+        thread = threading.Thread(target=gps_worker, args=[msg, track])
         thread.start()
 
         while thread.is_alive():
@@ -275,13 +337,15 @@ async def gps_handler(drain):
 def boxes3d_worker(msg):
     from edgefirst.schemas.edgefirst_msgs import Detect
 
-    detection = Detect.deserialize(msg.payload.to_bytes())
+    timer = stage_timer(msg)
+    detection = Detect.deserialize(payload_bytes(msg))
+    timer.lap("deserialize")
     # The 3D boxes are in an _optical frame of reference, where x is right, y is down, and z (distance) is forward
     # We will convert them to a normal frame of reference, where x is forward, y is left, and z is up
     centers = [(x.distance, -x.center_x, -x.center_y) for x in detection.boxes]
     sizes = [(x.width, x.width, x.height) for x in detection.boxes]
 
-    rr.log("/pointcloud/fusion/boxes", rr.Boxes3D(centers=centers, sizes=sizes))
+    log("/pointcloud/fusion/boxes", rr.Boxes3D(centers=centers, sizes=sizes))
 
 
 async def boxes3d_handler(drain):
@@ -296,16 +360,19 @@ async def boxes3d_handler(drain):
 
 
 def radar_worker(msg):
-    pcd = PointCloud2.deserialize(msg.payload.to_bytes())
+    timer = stage_timer(msg)
+    pcd = PointCloud2.deserialize(payload_bytes(msg))
+    timer.lap("deserialize")
     points = decode_pcd(pcd)
+    timer.lap("decode")
     clusters = [p for p in points if p.cluster_id > 0]
     if not clusters:
-        rr.log("/pointcloud/radar/clusters", rr.Points3D([], colors=[]))
+        log("/pointcloud/radar/clusters", rr.Points3D([], colors=[]))
         return
     max_id = max(p.cluster_id for p in clusters)
     pos = [[p.x, p.y, p.z] for p in clusters]
     colors = [colormap(turbo_colormap, p.cluster_id / max_id) for p in clusters]
-    rr.log("/pointcloud/radar/clusters", rr.Points3D(pos, colors=colors))
+    log("/pointcloud/radar/clusters", rr.Points3D(pos, colors=colors))
 
 
 async def radar_handler(drain):
@@ -320,18 +387,21 @@ async def radar_handler(drain):
 
 
 def lidar_worker(msg):
+    timer = stage_timer(msg)
     if not msg:
         return
-    pcd = PointCloud2.deserialize(msg.payload.to_bytes())
+    pcd = PointCloud2.deserialize(payload_bytes(msg))
+    timer.lap("deserialize")
     points = decode_pcd(pcd)
+    timer.lap("decode")
     clusters = [p for p in points if p.cluster_id > 0]
     if not clusters:
-        rr.log("/pointcloud/lidar/clusters", rr.Points3D([], colors=[]))
+        log("/pointcloud/lidar/clusters", rr.Points3D([], colors=[]))
         return
     max_id = max(p.cluster_id for p in clusters)
     pos = [[p.x, p.y, p.z] for p in clusters]
     colors = [colormap(turbo_colormap, p.cluster_id / max_id) for p in clusters]
-    rr.log("/pointcloud/lidar/clusters", rr.Points3D(pos, colors=colors))
+    log("/pointcloud/lidar/clusters", rr.Points3D(pos, colors=colors))
 
 
 async def lidar_handler(drain):
@@ -345,64 +415,105 @@ async def lidar_handler(drain):
         thread.join()
 
 
-async def main_async(args):
-    loop = asyncio.get_running_loop()
+class TopicManager:
+    """Attaches a handler to the preferred topic of each group as it appears.
 
-    # Setup rerun
-    args.memory_limit = 10
-    # Create the default Zenoh configuration and if the remote argument is
-    # provided set the mode to client and add the target to the endpoints.
-    config = zenoh.Config()
-    config.insert_json5("scouting/multicast/interface", "'lo'")
-    if args.remote is not None:
-        config.insert_json5("mode", "'client'")
-        config.insert_json5("connect", '{"endpoints": ["%s"]}' % args.remote)
-    session = zenoh.open(config)
-
-    # Create a subscriber for all topics matching the pattern "rt/**"
-    subscriber = session.declare_subscriber("rt/**")
-
-    # Keep a list of discovered topics to avoid noise from duplicates
-    camera_topics = set()
-    model_topics = set()
-    radar_topics = set()
-    fusion_topics = set()
-    lidar_topics = set()
-    misc_topics = set()
-    start = time.time()
-
-    print("Gathering available topics")
-    while True:
-        if time.time() - start >= 5:
-            break
-        msg = subscriber.recv()
-
-        # Ignore message if the topic is known otherwise save the topic
-        topic = str(msg.key_expr)
-        if "rt/camera" in topic:
-            if topic not in camera_topics:
-                camera_topics.add(topic)
-        elif "rt/model" in topic:
-            if topic not in model_topics:
-                model_topics.add(topic)
-        elif "rt/radar" in topic:
-            if topic not in radar_topics:
-                radar_topics.add(topic)
-        elif "rt/fusion" in topic:
-            if topic not in fusion_topics:
-                fusion_topics.add(topic)
-        elif "rt/lidar" in topic:
-            if topic not in lidar_topics:
-                lidar_topics.add(topic)
-        else:
-            if topic not in misc_topics:
-                misc_topics.add(topic)
+    groups maps a group name to its (topic, handler) choices in order of
+    preference, where handler(drain) returns the coroutine processing the
+    topic. A group switches to a more preferred topic once it shows up, and
+    back to the best remaining one once its topic is gone. A topic which has
+    received nothing for idle seconds is detached so its subscriber and handler
+    are released until the topic is seen again.
+    """
 
-    subscriber.undeclare()
-    del subscriber
+    def __init__(self, session, loop, groups, idle):
+        self._session = session
+        self._loop = loop
+        self._groups = groups
+        self._idle = idle
+        # group -> (rank, topic, subscriber, task, attached time)
+        self._attached = {}
+        # Topics reported by discovery and not gone since.
+        self._seen = set()
+        # Declared last, it reports the topics seen so far right away.
+        self._watcher = watch_topics(session, self.found, on_lost=self.lost)
+
+    def found(self, topic):
+        """Discovery callback, safe to call from any thread."""
+        if not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._found, topic)
+
+    def lost(self, topic):
+        """Discovery callback, safe to call from any thread."""
+        if not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._lost, topic)
+
+    def _found(self, topic):
+        self._seen.add(topic)
+        for group, choices in self._groups.items():
+            if any(choice == topic for choice, _ in choices):
+                self._attach_best(group)
+
+    def _lost(self, topic):
+        self._seen.discard(topic)
+        for group, current in list(self._attached.items()):
+            if current[1] == topic:
+                self._detach(group)
+
+    def _attach_best(self, group):
+        """Attaches the most preferred seen topic of group unless already so."""
+        current = self._attached.get(group)
+        for rank, (topic, handler) in enumerate(self._groups[group]):
+            if current is not None and current[0] <= rank:
+                return
+            if topic in self._seen:
+                if current is not None:
+                    self._release(group)
+                self._attach(group, rank, topic, handler)
+                return
+
+    def _attach(self, group, rank, topic, handler):
+        drain = MessageDrain(self._loop)
+        subscriber = declare_subscriber(self._session, topic, drain.callback)
+        task = asyncio.ensure_future(handler(drain))
+        self._attached[group] = (rank, topic, subscriber, task, time.perf_counter())
+        print("Attached %s" % topic)
+
+    def _release(self, group):
+        _, topic, subscriber, task, _ = self._attached.pop(group)
+        subscriber.undeclare()
+        task.cancel()
+        print("Detached %s" % topic)
+        return topic
+
+    def _detach(self, group):
+        """Detaches the topic of group, which is gone or went quiet, in favour of
+        the best remaining one. The topic is attached again once it reappears."""
+        topic = self._release(group)
+        self._seen.discard(topic)
+        self._watcher.forget(topic)
+        self._attach_best(group)
+
+    async def run(self):
+        """Detaches the topics which went quiet, never returns."""
+        while True:
+            await asyncio.sleep(min(1.0, self._idle))
+            now = time.perf_counter()
+            for group, (_, topic, _, _, attached) in list(self._attached.items()):
+                last = max(topic_stats(topic).last or 0.0, attached)
+                if now - last > self._idle:
+                    self._detach(group)
+
+    def close(self):
+        self._watcher.undeclare()
+
+
+async def main_async(args):
+    loop = asyncio.get_running_loop()
 
+    # Setup rerun before any topic is known so the first frame shows at once.
     args.memory_limit = 10
-    rr.script_setup(args, "mega_sample")
+    setup_sink(args, "mega_sample")
     blueprint = rrb.Blueprint(
         rrb.Grid(
             contents=[
@@ -414,84 +525,97 @@ async def main_async(args):
         )
     )
     rr.send_blueprint(blueprint)
+    log("/", rr.AnnotationContext(DEFAULT_CLASSES), static=True)
 
-    async_funcs = []
-
-    cam_drain = MessageDrain(loop)
-    boxes2d_drain = MessageDrain(loop)
-    mask_drain = MessageDrain(loop)
-    radar_drain = MessageDrain(loop)
-    lidar_drain = MessageDrain(loop)
-    gps_drain = MessageDrain(loop)
-    boxes3d_drain = MessageDrain(loop)
-
+    session = open_session(args)
+    # The model info is fetched at once instead of waiting for its next
+    # publish, masks are drawn with the default classes meanwhile.
+    model_info = StaticTopic(
+        session, "rt/model/info", ChangeFilter(model_info_worker), args.info_refresh
+    )
     frame_size_storage = FrameSize()
 
-    cam_topic = None
-    if args.remote is None and "rt/camera/dma" in camera_topics:
-        cam_topic = "rt/camera/dma"
-        session.declare_subscriber(cam_topic, cam_drain.callback)
-        async_funcs.append(dma_handler(cam_drain, frame_size_storage))
-    elif "rt/camera/h264" in camera_topics:
-        cam_topic = "rt/camera/h264"
-        session.declare_subscriber(cam_topic, cam_drain.callback)
-        async_funcs.append(h264_handler(cam_drain, frame_size_storage))
-    elif "rt/camera/jpeg" in camera_topics:
-        cam_topic = "rt/camera/jpeg"
-        session.declare_subscriber(cam_topic, cam_drain.callback)
-        async_funcs.append(jpeg_handler(cam_drain, frame_size_storage))
+    # Topics of each sensor in order of preference, DMA buffers are only
+    # readable on the device and remote clients prefer the compressed mask.
+    camera = [
+        ("rt/camera/h264", lambda drain: h264_handler(drain, frame_size_storage)),
+        ("rt/camera/jpeg", lambda drain: jpeg_handler(drain, frame_size_storage)),
+    ]
+    masks = [
+        ("rt/model/mask", lambda drain: mask_handler(drain, frame_size_storage, False)),
+        (
+            "rt/model/mask_compressed",
+            lambda drain: mask_handler(drain, frame_size_storage, True),
+        ),
+    ]
+    lidar = [("rt/lidar/clusters", lidar_handler)]
+    if args.remote is None:
+        camera.insert(
+            0, ("rt/camera/dma", lambda drain: dma_handler(drain, frame_size_storage))
+        )
     else:
-        print("No camera topic available")
-
-    if "rt/model/boxes2d" in model_topics:
-        session.declare_subscriber("rt/model/boxes2d", boxes2d_drain.callback)
-        async_funcs.append(boxes2d_handler(boxes2d_drain, frame_size_storage))
-
-    if args.remote is None and "rt/model/mask" in model_topics:
-        session.declare_subscriber("rt/model/mask", mask_drain.callback)
-    elif args.remote is not None and "rt/model/mask_compressed" in model_topics:
-        session.declare_subscriber("rt/model/mask_compressed", mask_drain.callback)
-    elif "rt/model/mask" in model_topics:
-        session.declare_subscriber("rt/model/mask", mask_drain.callback)
-    elif "rt/model/mask_compressed" in model_topics:
-        session.declare_subscriber("rt/model/mask_compressed", mask_drain.callback)
-
-    if "rt/model/mask" in model_topics or "rt/model/mask_compressed" in model_topics:
-        async_funcs.append(mask_handler(mask_drain, frame_size_storage, args.remote))
-
-    if "rt/gps" in misc_topics:
-        session.declare_subscriber("rt/gps", gps_drain.callback)
-        async_funcs.append(gps_handler(gps_drain))
-
-    if "rt/fusion/boxes3d" in fusion_topics:
-        session.declare_subscriber("rt/fusion/boxes3d", boxes3d_drain.callback)
-        async_funcs.append(boxes3d_handler(boxes3d_drain))
-
-    if "rt/radar/clusters" in radar_topics:
-        session.declare_subscriber("rt/radar/clusters", radar_drain.callback)
-        async_funcs.append(radar_handler(radar_drain))
-
-    if "rt/lidar/clusters" in lidar_topics:
-        session.declare_subscriber("rt/lidar/clusters", lidar_drain.callback)
-        async_funcs.append(lidar_handler(lidar_drain))
-
-    # Launch concurrent processing tasks
-    await asyncio.gather(*async_funcs)
-
-    while True:
-        asyncio.sleep(0.01)
+        masks.reverse()
+    if args.lite:
+        # Reduced topics republished by relay.py come first when present.
+        camera.insert(
+            0,
+            (
+                "rt/lite/camera/jpeg",
+                lambda drain: jpeg_handler(drain, frame_size_storage),
+            ),
+        )
+        masks.insert(
+            0,
+            (
+                "rt/lite/model/mask_compressed",
+                lambda drain: mask_handler(drain, frame_size_storage, True),
+            ),
+        )
+        lidar.insert(0, ("rt/lite/lidar/clusters", lidar_handler))
+    groups = {
+        "camera": camera,
+        "boxes2d": [
+            (
+                "rt/model/boxes2d",
+                lambda drain: boxes2d_handler(drain, frame_size_storage),
+            )
+        ],
+        "mask": masks,
+        "gps": [("rt/gps", lambda drain: gps_handler(drain, args))],
+        "boxes3d": [("rt/fusion/boxes3d", boxes3d_handler)],
+        "radar": [("rt/radar/clusters", radar_handler)],
+        "lidar": lidar,
+    }
+
+    # Handlers are attached as soon as their topic is seen, discovery keeps
+    # watching to pick up topics appearing later.
+    manager = TopicManager(session, loop, groups, args.idle_timeout)
+    try:
+        await manager.run()
+    finally:
+        # Leaving the session open can hang the interpreter at exit.
+        manager.close()
+        model_info.undeclare()
+        session.close()
 
 
 def main():
     parser = ArgumentParser(description="EdgeFirst Samples - Mega Sample")
+    add_session_args(parser)
+    add_static_arg(parser)
+    add_track_args(parser)
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=5.0,
+        help="Seconds without messages after which a topic's handler is detached.",
+    )
     parser.add_argument(
-        "-r",
-        "--remote",
-        type=str,
-        default=None,
-        help="Connect to the remote endpoint instead of local.",
+        "--lite",
+        action="store_true",
+        help="Prefer the reduced rt/lite topics republished by relay.py.",
     )
-    rr.script_add_args(parser)
+    add_sink_args(parser)
     args = parser.parse_args()
 
     try:
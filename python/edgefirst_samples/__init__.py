@@ -0,0 +1,36 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
+
+"""
+Helpers shared by the Python samples, the counterpart of rust/lib.rs.
+
+The samples live in subdirectories and are run as scripts, so they add the
+parent directory to sys.path before importing this package.
+"""
+
+from .discovery import discover_topics, watch_topics
+from .qos import add_qos_arg
+from .session import add_session_args, add_shm_arg, open_session, zenoh_config
+from .sink import add_sink_args, log, set_sensor_time, setup_sink
+from .stats import count_copy, declare_subscriber, payload_bytes, stage_timer
+from .workers import add_workers_arg, run_workers
+
+__all__ = [
+    "add_qos_arg",
+    "add_session_args",
+    "add_shm_arg",
+    "add_sink_args",
+    "add_workers_arg",
+    "count_copy",
+    "declare_subscriber",
+    "discover_topics",
+    "log",
+    "open_session",
+    "payload_bytes",
+    "run_workers",
+    "set_sensor_time",
+    "setup_sink",
+    "stage_timer",
+    "watch_topics",
+    "zenoh_config",
+]
@@ -0,0 +1,193 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
+
+"""
+Decoders of the large EdgeFirst messages returning NumPy views of the payload.
+
+pycdr2 deserializes every sequence into a list of Python ints, millions of
+objects per frame for a mask or radar cube, and the samples then copy those
+lists into arrays. These decoders walk the CDR layout of the message instead
+and return the sequences with np.frombuffer, so the payload is never copied.
+The arrays are read-only and keep the payload alive.
+"""
+
+import struct
+from types import SimpleNamespace
+
+import numpy as np
+
+# sensor_msgs/PointField datatypes.
+POINT_FIELD_TYPES = {
+    1: "i1",
+    2: "u1",
+    3: "i2",
+    4: "u2",
+    5: "i4",
+    6: "u4",
+    7: "f4",
+    8: "f8",
+}
+
+
+class CdrReader:
+    """Minimal CDR reader returning views into the payload instead of lists."""
+
+    def __init__(self, payload):
+        self._buf = memoryview(payload)
+        # Encapsulation header, representation 0x0001 is little-endian CDR.
+        self._endian = "<" if self._buf[1] == 1 else ">"
+        self._pos = 4
+
+    def _align(self, size):
+        self._pos += -(self._pos - 4) % size
+
+    def _unpack(self, fmt, size):
+        self._align(size)
+        (value,) = struct.unpack_from(self._endian + fmt, self._buf, self._pos)
+        self._pos += size
+        return value
+
+    def uint8(self):
+        value = self._buf[self._pos]
+        self._pos += 1
+        return value
+
+    def int32(self):
+        return self._unpack("i", 4)
+
+    def uint32(self):
+        return self._unpack("I", 4)
+
+    def uint64(self):
+        return self._unpack("Q", 8)
+
+    def string(self):
+        length = self.uint32()
+        value = bytes(self._buf[self._pos : self._pos + length - 1]).decode()
+        self._pos += length
+        return value
+
+    def sequence(self):
+        """A sequence<uint8> as a memoryview of the payload."""
+        length = self.uint32()
+        value = self._buf[self._pos : self._pos + length]
+        self._pos += length
+        return value
+
+    def array(self, dtype):
+        """A sequence of dtype elements as an ndarray view of the payload."""
+        length = self.uint32()
+        dtype = np.dtype(dtype).newbyteorder(self._endian)
+        self._align(dtype.itemsize)
+        value = np.frombuffer(self._buf, dtype, count=length, offset=self._pos)
+        self._pos += length * dtype.itemsize
+        return value
+
+    def header(self):
+        """A std_msgs/Header."""
+        sec = self.int32()
+        nanosec = self.uint32()
+        return SimpleNamespace(sec=sec, nanosec=nanosec, frame_id=self.string())
+
+
+def decode_image(payload):
+    """Decodes a sensor_msgs/Image, the pixel data is a view of the payload."""
+    reader = CdrReader(payload)
+    header = reader.header()
+    image = SimpleNamespace(
+        header=header, height=reader.uint32(), width=reader.uint32()
+    )
+    image.encoding = reader.string()
+    image.is_bigendian = reader.uint8()
+    image.step = reader.uint32()
+    image.data = reader.sequence()
+    return image
+
+
+def decode_compressed_image(payload):
+    """Decodes a sensor_msgs/CompressedImage with data as a uint8 array."""
+    reader = CdrReader(payload)
+    header = reader.header()
+    return SimpleNamespace(
+        header=header, format=reader.string(), data=reader.array(np.uint8)
+    )
+
+
+def decode_mask(payload):
+    """Decodes an edgefirst_msgs/Mask with mask as a uint8 array."""
+    reader = CdrReader(payload)
+    mask = SimpleNamespace(
+        height=reader.uint32(), width=reader.uint32(), length=reader.uint32()
+    )
+    mask.encoding = reader.string()
+    mask.mask = reader.array(np.uint8)
+    mask.boxed = bool(reader.uint8())
+    return mask
+
+
+def decode_radar_cube(payload):
+    """Decodes an edgefirst_msgs/RadarCube with cube as an int16 array."""
+    reader = CdrReader(payload)
+    cube = SimpleNamespace(header=reader.header(), timestamp=reader.uint64())
+    cube.layout = reader.array(np.uint8).tolist()
+    cube.shape = reader.array(np.uint16).tolist()
+    cube.scales = reader.array(np.float32).tolist()
+    cube.cube = reader.array(np.int16)
+    cube.is_complex = bool(reader.uint8())
+    return cube
+
+
+def decode_point_cloud(payload):
+    """Decodes a sensor_msgs/PointCloud2, data is a view of the payload.
+
+    Clouds encoded by edgefirst_samples.pointcodec are decoded as well.
+    """
+    from .pointcodec import decode_quantized, is_quantized
+
+    if is_quantized(payload):
+        return decode_quantized(payload)
+    reader = CdrReader(payload)
+    pcd = SimpleNamespace(
+        header=reader.header(), height=reader.uint32(), width=reader.uint32()
+    )
+    pcd.fields = []
+    for _ in range(reader.uint32()):
+        name = reader.string()
+        offset = reader.uint32()
+        datatype = reader.uint8()
+        pcd.fields.append(
+            SimpleNamespace(
+                name=name, offset=offset, datatype=datatype, count=reader.uint32()
+            )
+        )
+    pcd.is_bigendian = bool(reader.uint8())
+    pcd.point_step = reader.uint32()
+    pcd.row_step = reader.uint32()
+    pcd.data = reader.sequence()
+    pcd.is_dense = bool(reader.uint8())
+    return pcd
+
+
+def point_array(pcd):
+    """The points of a decoded PointCloud2 as a structured array view.
+
+    Each field is a column of the array, points["x"], so a sample can pick the
+    fields it needs without unpacking every point in Python.
+    """
+    endian = ">" if pcd.is_bigendian else "<"
+    dtype = np.dtype(
+        {
+            "names": [field.name for field in pcd.fields],
+            "formats": [
+                (
+                    (endian + POINT_FIELD_TYPES[field.datatype], (field.count,))
+                    if field.count > 1
+                    else endian + POINT_FIELD_TYPES[field.datatype]
+                )
+                for field in pcd.fields
+            ],
+            "offsets": [field.offset for field in pcd.fields],
+            "itemsize": pcd.point_step,
+        }
+    )
+    return np.frombuffer(pcd.data, dtype, count=pcd.height * pcd.width)
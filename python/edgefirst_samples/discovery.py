@@ -0,0 +1,288 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
+
+import threading
+import time
+
+import zenoh
+
+from .replay import McapSession
+
+# Seconds between the admin space queries of TopicWatcher.
+ADMIN_INTERVAL = 1.0
+
+# Chunk of the liveliness token keys separating a topic from its schema. It is
+# verbatim, so rt/** never matches the schema tokens.
+SCHEMA_CHUNK = "@schema"
+
+
+def token_key(topic, schema=None):
+    """Key of the liveliness token announcing topic along with its schema.
+
+    rt/camera/info with sensor_msgs/msg/CameraInfo gives
+    rt/camera/info/@schema/sensor_msgs/msg/CameraInfo, which discovery reads
+    the schema from without receiving a message.
+    """
+    return "%s/%s/%s" % (topic, SCHEMA_CHUNK, schema) if schema else topic
+
+
+def split_token_key(key_expr):
+    """The (topic, schema) of a token key, schema is None for a plain topic."""
+    topic, sep, schema = str(key_expr).partition("/%s/" % SCHEMA_CHUNK)
+    return topic, schema if sep else None
+
+
+def schema_of(encoding):
+    """The schema part of a Zenoh encoding such as application/cdr;a/msg/B."""
+    encoding = str(encoding)
+    return encoding.split(";", maxsplit=1)[1] if ";" in encoding else ""
+
+
+class TopicCollector:
+    """Subscriber callback gathering the schema of every topic it sees."""
+
+    def __init__(self, on_topic=None):
+        self.topics = {}
+        self.changed = time.monotonic()
+        self._lock = threading.Lock()
+        self._on_topic = on_topic
+
+    def callback(self, msg):
+        self.add(str(msg.key_expr), schema_of(msg.encoding))
+
+    def add(self, topic, schema):
+        with self._lock:
+            if topic in self.topics:
+                return
+            self.topics[topic] = schema
+            self.changed = time.monotonic()
+        if self._on_topic is not None:
+            self._on_topic(topic, schema)
+
+    def remove(self, topic):
+        with self._lock:
+            self.topics.pop(topic, None)
+
+
+def _expired(deadline):
+    return deadline is not None and time.monotonic() >= deadline
+
+
+def announced_topics(session, key_expr, timeout):
+    """{topic: schema} of the publishers announcing liveliness tokens on their
+    topics under key_expr, schema is None when the token does not carry it.
+
+    Tokens carry no payload, so nothing but the key expressions crosses the
+    network.
+    """
+    topics = {}
+    for query in (key_expr, "%s/%s/**" % (key_expr, SCHEMA_CHUNK)):
+        for reply in session.liveliness().get(query, timeout=timeout):
+            if reply.ok:
+                topic, schema = split_token_key(reply.ok.key_expr)
+                if topics.get(topic) is None:
+                    topics[topic] = schema
+    return dict(sorted(topics.items()))
+
+
+def complete_schemas(session, announced, schemas=True, deadline=None, on_topic=None):
+    """Fills in the schemas announced_topics() could not read from the tokens.
+
+    Each topic without one is subscribed to until its first message when
+    schemas is set, or until the monotonic deadline. Returns the {topic:
+    schema} of every announced topic, schema is None when it stays unknown.
+    """
+    collector = TopicCollector(on_topic)
+    for topic, schema in announced.items():
+        if schema is not None or not schemas:
+            collector.add(topic, schema)
+    subscribers = {
+        topic: session.declare_subscriber(topic, collector.callback)
+        for topic in announced
+        if topic not in collector.topics
+    }
+    try:
+        while subscribers and not _expired(deadline):
+            time.sleep(0.01)
+            for topic in list(subscribers):
+                if topic in collector.topics:
+                    subscribers.pop(topic).undeclare()
+    finally:
+        for subscriber in subscribers.values():
+            subscriber.undeclare()
+    return {topic: collector.topics.get(topic) for topic in announced}
+
+
+def probe_topics(session, key_expr, deadline=None, quiet=0.25, on_topic=None):
+    """{topic: schema} of the messages published under key_expr.
+
+    Subscribes to key_expr until no new topic has appeared for quiet seconds, or
+    until the monotonic deadline when quiet is None, then undeclares the
+    subscriber.
+    """
+    collector = TopicCollector(on_topic)
+    subscriber = session.declare_subscriber(key_expr, collector.callback)
+    try:
+        while not _expired(deadline):
+            time.sleep(0.01)
+            if (
+                quiet is not None
+                and collector.topics
+                and time.monotonic() - collector.changed >= quiet
+            ):
+                break
+    finally:
+        subscriber.undeclare()
+    return dict(collector.topics)
+
+
+def discover_topics(
+    session, key_expr="rt/**", timeout=1.0, schemas=True, quiet=0.25, on_topic=None
+):
+    """Returns a {topic: schema} dictionary of the topics under key_expr.
+
+    Topics announced with liveliness tokens are found without receiving any
+    message, along with their schemas when the tokens carry them, see
+    token_key(). Otherwise the schema is read from a single message of the
+    topic when schemas is set and is None when it is not. Without tokens this
+    falls back to subscribing to key_expr, which returns once no new topic has
+    appeared for quiet seconds, or after timeout when quiet is None. A timeout
+    of None waits until interrupted. An MCAP replay lists the channels of the
+    recording.
+    """
+    if isinstance(session, McapSession):
+        topics = session.topics(key_expr)
+        for topic, schema in topics.items():
+            if on_topic is not None:
+                on_topic(topic, schema)
+        return topics
+
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    announced = announced_topics(session, key_expr, timeout or 1.0)
+    if announced:
+        return complete_schemas(session, announced, schemas, deadline, on_topic)
+    return probe_topics(session, key_expr, deadline, quiet, on_topic)
+
+
+def admin_publishers(session, key_expr, timeout):
+    """Topics under key_expr with a publisher declared, as listed by the admin
+    space of the routers, which zenohd enables.
+
+    Only the key expressions of the publishers cross the network.
+    """
+    topics = set()
+    for reply in session.get("@/*/*/publisher/%s" % key_expr, timeout=timeout):
+        if reply.ok:
+            topics.add(str(reply.ok.key_expr).split("/publisher/", maxsplit=1)[1])
+    return topics
+
+
+def admin_space(session, timeout):
+    """Whether any router or peer answers queries on its admin space."""
+    return any(reply.ok for reply in session.get("@/*/*", timeout=timeout))
+
+
+class TopicWatcher:
+    """Reports each topic under key_expr once to on_topic(topic), as it appears,
+    and to on_lost(topic) once its publisher is gone.
+
+    No message is received to do so. A liveliness subscriber reports the topics
+    announced by tokens, including those declared earlier, and a thread lists
+    the publishers in the admin space every interval seconds. When no admin
+    space answers, publishers without tokens are looked for once by
+    subscribing to key_expr for probe seconds. The callbacks run on Zenoh
+    threads or the watcher's. forget() reports a topic again once it
+    reappears, as does a token which was undeclared and is declared again. An
+    MCAP replay reports the channels of the recording. Undeclare the watcher
+    before closing the session.
+    """
+
+    def __init__(
+        self,
+        session,
+        on_topic,
+        key_expr="rt/**",
+        on_lost=None,
+        interval=ADMIN_INTERVAL,
+        probe=1.0,
+    ):
+        self._collector = TopicCollector(lambda topic, schema: on_topic(topic))
+        self._on_lost = on_lost
+        self._tokens = set()
+        self._published = set()
+        self._subscribers = []
+        self._stop = threading.Event()
+        self._thread = None
+        if isinstance(session, McapSession):
+            for topic in session.topics(key_expr):
+                self._collector.add(topic, None)
+            return
+        self._subscribers = [
+            session.liveliness().declare_subscriber(query, self._token, history=True)
+            for query in (key_expr, "%s/%s/**" % (key_expr, SCHEMA_CHUNK))
+        ]
+        self._thread = threading.Thread(
+            target=self._poll,
+            args=[session, key_expr, interval, probe],
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _token(self, sample):
+        topic, schema = split_token_key(sample.key_expr)
+        if sample.kind == zenoh.SampleKind.DELETE:
+            self._tokens.discard(topic)
+            if topic not in self._published:
+                self._lost(topic)
+        else:
+            self._tokens.add(topic)
+            self._collector.add(topic, schema)
+
+    def _poll(self, session, key_expr, interval, probe):
+        try:
+            if probe and not admin_space(session, interval):
+                probe_topics(
+                    session,
+                    key_expr,
+                    deadline=time.monotonic() + probe,
+                    quiet=None,
+                    on_topic=self._probed,
+                )
+                return
+            while not self._stop.is_set():
+                published = admin_publishers(session, key_expr, interval)
+                for topic in published - self._published:
+                    self._collector.add(topic, None)
+                for topic in self._published - published - self._tokens:
+                    self._lost(topic)
+                self._published = published
+                self._stop.wait(interval)
+        except zenoh.ZError:
+            # The session was closed.
+            pass
+
+    def _probed(self, topic, schema):
+        if topic not in self._tokens:
+            self._collector.add(topic, schema)
+
+    def _lost(self, topic):
+        self._collector.remove(topic)
+        if self._on_lost is not None:
+            self._on_lost(topic)
+
+    def forget(self, topic):
+        """Reports topic again the next time it appears."""
+        self._collector.remove(topic)
+
+    def undeclare(self):
+        self._stop.set()
+        for subscriber in self._subscribers:
+            subscriber.undeclare()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def watch_topics(session, on_topic, key_expr="rt/**", on_lost=None):
+    """Returns a TopicWatcher calling on_topic(topic) for each new topic and
+    on_lost(topic) for each topic whose publisher is gone."""
+    return TopicWatcher(session, on_topic, key_expr, on_lost)
@@ -0,0 +1,112 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
+
+"""
+GPS track history shared by gps.py and combined/mega_sample.py.
+"""
+
+from collections import deque
+
+import numpy as np
+import rerun as rr
+
+from .sink import log
+
+# Mean Earth radius in meters, used for the local flat-Earth approximation.
+EARTH_RADIUS = 6371000.0
+
+
+def add_track_args(parser):
+    """Adds the options of the simplified GPS track."""
+    parser.add_argument(
+        "--track-tolerance",
+        type=float,
+        default=2.0,
+        help="Maximum deviation in meters of the simplified GPS track.",
+    )
+    parser.add_argument(
+        "--track-segment",
+        type=int,
+        default=256,
+        help="Vertices per GPS track segment kept in memory.",
+    )
+    parser.add_argument(
+        "--track-segments",
+        type=int,
+        default=64,
+        help="Closed GPS track segments kept, the oldest are dropped beyond it.",
+    )
+
+
+class GpsTrack:
+    """Bounded GPS trajectory simplified as the fixes arrive.
+
+    Fixes since the last kept vertex are held in a window and the newest of them
+    is only kept as a vertex once a straight line from the previous vertex would
+    stray more than tolerance meters from the window (a streaming Douglas-Peucker).
+    Fixes closer than tolerance to the previous one are dropped.  Vertices fill a
+    fixed size segment.  The last max_segments full segments are logged together
+    as static line strings at path/history whenever one closes, so only the open
+    segment at path is logged again when the track changes.  Both are static,
+    each log replaces the previous one, which bounds the recording as well as
+    the memory of the track.
+    """
+
+    def __init__(self, path, tolerance, segment, max_segments=64):
+        self._path = path
+        self._tolerance = tolerance
+        self._vertices = np.zeros((segment, 2))
+        self._size = 0
+        self._window = np.zeros((segment, 2))
+        self._pending = 0
+        self._closed = deque(maxlen=max(1, max_segments))
+
+    @staticmethod
+    def _meters(origin, points):
+        offset = (points - origin) * np.deg2rad(EARTH_RADIUS)
+        offset[..., 1] *= np.cos(np.deg2rad(origin[0]))
+        return offset
+
+    def _keep(self, vertex):
+        self._vertices[self._size] = vertex
+        self._size += 1
+        self._pending = 0
+        if self._size == len(self._vertices):
+            self._closed.append(self._vertices.copy())
+            log(
+                "%s/history" % self._path,
+                rr.GeoLineStrings(lat_lon=list(self._closed)),
+                static=True,
+            )
+            # The next segment starts where this one ended.
+            self._vertices[0] = vertex
+            self._size = 1
+
+    def add(self, lat, lon):
+        """Adds a fix, returns whether it changed the track."""
+        point = np.array([lat, lon])
+        if self._size == 0:
+            self._keep(point)
+            return True
+        anchor = self._vertices[self._size - 1]
+        last = self._window[self._pending - 1] if self._pending else anchor
+        if np.hypot(*self._meters(last, point)) < self._tolerance:
+            return False
+        if self._pending:
+            line = self._meters(anchor, point)
+            window = self._meters(anchor, self._window[: self._pending])
+            deviation = np.abs(window[:, 0] * line[1] - window[:, 1] * line[0])
+            if deviation.max() > self._tolerance * np.hypot(
+                *line
+            ) or self._pending == len(self._window):
+                self._keep(last.copy())
+        self._window[self._pending] = point
+        self._pending += 1
+        return True
+
+    def log(self):
+        """Logs the open segment, up to the newest fix."""
+        track = self._vertices[: self._size]
+        if self._pending:
+            track = np.vstack([track, self._window[self._pending - 1]])
+        log(self._path, rr.GeoLineStrings(lat_lon=[track]), static=True)
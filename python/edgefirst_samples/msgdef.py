@@ -0,0 +1,76 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
+
+"""
+ROS 2 message definitions of the EdgeFirst schemas.
+
+An MCAP channel whose schema has the ros2msg encoding is only decodable when
+the schema carries the message definition text. The edgefirst.schemas package
+ships the messages as pycdr2 dataclasses rather than .msg files, so the text
+is rebuilt from their field annotations, followed by the definitions of the
+nested messages in the layout written by rosbag2.
+"""
+
+import dataclasses
+import typing
+
+from edgefirst.schemas import from_schema, schema_name
+from pycdr2 import IdlStruct
+from pycdr2.types import array, bounded_str, sequence
+
+# Separates the definitions of the nested messages.
+SEPARATOR = "=" * 80
+
+# Field types of the Python builtins used as annotations.
+BUILTIN_TYPES = {
+    bool: "bool",
+    bytes: "byte",
+    int: "int64",
+    float: "float64",
+    str: "string",
+}
+
+
+def _field_type(annotation, nested):
+    """The ros2msg type of a field, adding the messages it refers to to nested."""
+    if isinstance(annotation, type) and issubclass(annotation, IdlStruct):
+        name = schema_name(annotation).replace("/msg/", "/")
+        nested.setdefault(name, annotation)
+        return name
+    if annotation in BUILTIN_TYPES:
+        return BUILTIN_TYPES[annotation]
+    if typing.get_origin(annotation) is typing.Annotated:
+        kind = typing.get_args(annotation)[1]
+        if isinstance(kind, sequence):
+            bound = "<=%d" % kind.max_length if kind.max_length else ""
+            return "%s[%s]" % (_field_type(kind.subtype, nested), bound)
+        if isinstance(kind, array):
+            return "%s[%d]" % (_field_type(kind.subtype, nested), kind.length)
+        if isinstance(kind, bounded_str):
+            return "string<=%d" % kind.max_length
+        if isinstance(kind, str):
+            return kind
+    raise ValueError("No ros2msg type for %r" % (annotation,))
+
+
+def _fields(cls, nested):
+    hints = typing.get_type_hints(cls, include_extras=True)
+    return "\n".join(
+        "%s %s" % (_field_type(hints[field.name], nested), field.name)
+        for field in dataclasses.fields(cls)
+    )
+
+
+def message_definition(schema):
+    """The ros2msg definition of a schema such as "sensor_msgs/msg/Image".
+
+    Raises KeyError or ValueError for schemas edgefirst.schemas does not have.
+    """
+    nested = {}
+    parts = [_fields(from_schema(schema), nested)]
+    done = set()
+    while len(done) < len(nested):
+        name, cls = next(item for item in nested.items() if item[0] not in done)
+        done.add(name)
+        parts.append("%s\nMSG: %s\n%s" % (SEPARATOR, name, _fields(cls, nested)))
+    return "\n".join(parts) + "\n"
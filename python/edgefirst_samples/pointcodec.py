@@ -0,0 +1,259 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
+
+"""
+Quantized point cloud codec for transport and storage.
+
+A PointCloud2 spends 4 bytes on each coordinate plus padding on every field,
+and neighbouring points share nothing the chunk compressor can find. The codec
+quantizes x, y, and z to integer steps of a resolution in meters, sorts the
+points along a Morton curve so neighbours in space are neighbours in the
+stream, and stores the differences between consecutive Morton codes. Those are
+small, so after splitting every column into byte planes most planes are zeros
+and zstd removes them. The other fields are kept per point in the same order,
+integer valued float fields such as cluster_id or vision_class as the
+narrowest integer type holding them.
+
+Decoded coordinates are within resolution / 2 of the original on each axis,
+plus the float32 rounding of the value. Other fields are exact. The points
+come back in Morton order and points with a non-finite coordinate are
+dropped. An encoded cloud starts with MAGIC, which decode_point_cloud() checks
+to decode it transparently.
+"""
+
+import json
+import struct
+from types import SimpleNamespace
+
+import numpy as np
+import zstd
+
+from .cdr import POINT_FIELD_TYPES, decode_point_cloud, point_array
+
+MAGIC = b"EFQP"
+VERSION = 1
+
+# Schema name of encoded clouds in Zenoh encodings and MCAP channels.
+SCHEMA = "edgefirst_samples/msg/QuantizedPointCloud"
+
+# Message encoding of the MCAP channels of encoded clouds.
+MCAP_ENCODING = "x-edgefirst-quantized-points"
+
+# Quantized coordinates have 21 bits per axis so a Morton code fits 64 bits.
+AXIS_BITS = 21
+
+
+def _spread(values):
+    """Inserts two zero bits between each of the low 21 bits of values."""
+    values = values.astype(np.uint64) & np.uint64(0x1FFFFF)
+    for shift, mask in [
+        (32, 0x1F00000000FFFF),
+        (16, 0x1F0000FF0000FF),
+        (8, 0x100F00F00F00F00F),
+        (4, 0x10C30C30C30C30C3),
+        (2, 0x1249249249249249),
+    ]:
+        values = (values | (values << np.uint64(shift))) & np.uint64(mask)
+    return values
+
+
+def _compact(values):
+    """The inverse of _spread() on every third bit of values."""
+    values = values & np.uint64(0x1249249249249249)
+    for shift, mask in [
+        (2, 0x10C30C30C30C30C3),
+        (4, 0x100F00F00F00F00F),
+        (8, 0x1F0000FF0000FF),
+        (16, 0x1F00000000FFFF),
+        (32, 0x1FFFFF),
+    ]:
+        values = (values ^ (values >> np.uint64(shift))) & np.uint64(mask)
+    return values
+
+
+def _shuffle(array):
+    """The bytes of array grouped by position within each element."""
+    planes = np.ascontiguousarray(array).view(np.uint8)
+    return planes.reshape(len(array), _width(array.dtype, array.shape[1:])).T.tobytes()
+
+
+def _unshuffle(data, dtype, count, shape=()):
+    dtype = np.dtype(dtype)
+    planes = np.frombuffer(data, np.uint8).reshape(_width(dtype, shape), count)
+    array = np.ascontiguousarray(planes.T).view(dtype)
+    return array.reshape((count,) + shape)
+
+
+def _width(dtype, shape):
+    """Bytes per point of a column of dtype elements with shape per point."""
+    return dtype.itemsize * int(np.prod(shape, dtype=np.int64))
+
+
+def _pack(column):
+    """The narrowest integer copy of an integer valued column, else column."""
+    if len(column) == 0 or column.dtype.kind not in "iuf":
+        return column
+    if column.dtype.kind == "f":
+        if not np.all(np.isfinite(column)) or not np.all(column == np.round(column)):
+            return column
+    low, high = int(column.min()), int(column.max())
+    if low < -(1 << 31) or high >= 1 << 32:
+        return column
+    dtype = np.promote_types(np.min_scalar_type(low), np.min_scalar_type(high))
+    if dtype.itemsize >= column.dtype.itemsize:
+        return column
+    return column.astype(dtype)
+
+
+def quantize(xyz, resolution):
+    """Morton codes of the (N, 3) xyz coordinates and the origin of the steps.
+
+    Raises ValueError when the coordinates span more than 2**21 steps of
+    resolution on an axis.
+    """
+    steps = np.round(np.asarray(xyz, np.float64) / resolution).astype(np.int64)
+    origin = steps.min(axis=0) if len(steps) else np.zeros(3, np.int64)
+    steps -= origin
+    if len(steps) and steps.max() >= 1 << AXIS_BITS:
+        raise ValueError(
+            "point cloud spans %.1f m, more than 2**%d steps of %g m"
+            % (steps.max() * resolution, AXIS_BITS, resolution)
+        )
+    codes = (
+        _spread(steps[:, 0])
+        | (_spread(steps[:, 1]) << np.uint64(1))
+        | (_spread(steps[:, 2]) << np.uint64(2))
+    )
+    return codes, origin
+
+
+def encode_points(pcd, points, resolution=0.01, level=3):
+    """Encodes the structured points of a decoded PointCloud2.
+
+    pcd provides the header and fields, as returned by decode_point_cloud(),
+    and points any subset of point_array(pcd). Raises ValueError when the
+    cloud is too large for the resolution, see quantize().
+    """
+    xyz = np.column_stack((points["x"], points["y"], points["z"]))
+    finite = np.isfinite(xyz).all(axis=1)
+    if not finite.all():
+        points, xyz = points[finite], xyz[finite]
+
+    codes, origin = quantize(xyz, resolution)
+    order = np.argsort(codes, kind="stable")
+    deltas = np.diff(codes[order], prepend=np.uint64(0))
+    deltas = deltas.astype(np.min_scalar_type(int(deltas.max()) if len(deltas) else 0))
+
+    fields = []
+    columns = [_shuffle(deltas)]
+    for field in pcd.fields:
+        if field.name in ("x", "y", "z"):
+            continue
+        column = _pack(points[field.name][order])
+        fields.append(
+            {
+                "name": field.name,
+                "datatype": field.datatype,
+                "count": field.count,
+                "stored": column.dtype.str,
+            }
+        )
+        columns.append(_shuffle(column))
+
+    meta = {
+        "sec": pcd.header.sec,
+        "nanosec": pcd.header.nanosec,
+        "frame_id": pcd.header.frame_id,
+        "count": len(deltas),
+        "resolution": resolution,
+        "origin": origin.tolist(),
+        "deltas": deltas.dtype.str,
+        "fields": fields,
+    }
+    meta = json.dumps(meta).encode()
+    body = b"".join([struct.pack("<I", len(meta)), meta] + columns)
+    return MAGIC + struct.pack("<B", VERSION) + zstd.compress(body, level)
+
+
+def encode_point_cloud(payload, resolution=0.01, level=3):
+    """Encodes a serialized PointCloud2, see encode_points()."""
+    pcd = decode_point_cloud(payload)
+    return encode_points(pcd, point_array(pcd), resolution, level)
+
+
+def is_quantized(payload):
+    return bytes(payload[: len(MAGIC)]) == MAGIC
+
+
+def decode_quantized(payload):
+    """Decodes an encoded cloud into the form returned by decode_point_cloud().
+
+    The points are a single row of float32 x, y, and z followed by the other
+    fields in their original types, so point_array() reads them as usual.
+    """
+    payload = memoryview(payload)
+    (version,) = struct.unpack_from("<B", payload, len(MAGIC))
+    if version != VERSION:
+        raise ValueError("unsupported quantized point cloud version %d" % version)
+    body = zstd.decompress(payload[len(MAGIC) + 1 :].tobytes())
+    (length,) = struct.unpack_from("<I", body)
+    meta = json.loads(body[4 : 4 + length])
+    count = meta["count"]
+    pos = 4 + length
+
+    deltas = np.dtype(meta["deltas"])
+    codes = np.cumsum(
+        _unshuffle(body[pos : pos + count * deltas.itemsize], deltas, count),
+        dtype=np.uint64,
+    )
+    pos += count * deltas.itemsize
+
+    fields = [
+        SimpleNamespace(name=name, offset=4 * index, datatype=7, count=1)
+        for index, name in enumerate(["x", "y", "z"])
+    ]
+    columns = []
+    offset = 12
+    for field in meta["fields"]:
+        stored = np.dtype(field["stored"])
+        shape = (field["count"],) if field["count"] > 1 else ()
+        size = count * stored.itemsize * max(1, field["count"])
+        column = _unshuffle(body[pos : pos + size], stored, count, shape)
+        pos += size
+        kind = np.dtype("<" + POINT_FIELD_TYPES[field["datatype"]])
+        columns.append((field["name"], column.astype(kind), kind, shape))
+        fields.append(
+            SimpleNamespace(
+                name=field["name"],
+                offset=offset,
+                datatype=field["datatype"],
+                count=field["count"],
+            )
+        )
+        offset += kind.itemsize * max(1, field["count"])
+
+    points = np.zeros(
+        count,
+        dtype=[(axis, "<f4") for axis in ["x", "y", "z"]]
+        + [(name, kind, shape) for name, _, kind, shape in columns],
+    )
+    resolution = meta["resolution"]
+    for shift, (axis, origin) in enumerate(zip(["x", "y", "z"], meta["origin"])):
+        steps = _compact(codes >> np.uint64(shift)).astype(np.int64) + origin
+        points[axis] = steps * resolution
+    for name, column, _, _ in columns:
+        points[name] = column
+
+    return SimpleNamespace(
+        header=SimpleNamespace(
+            sec=meta["sec"], nanosec=meta["nanosec"], frame_id=meta["frame_id"]
+        ),
+        height=1,
+        width=count,
+        fields=fields,
+        is_bigendian=False,
+        point_step=points.dtype.itemsize,
+        row_step=points.nbytes,
+        data=points.view(np.uint8),
+        is_dense=True,
+    )
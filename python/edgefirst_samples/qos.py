@@ -0,0 +1,216 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
+
+"""
+Per-topic Zenoh QoS profiles.
+
+QoS travels with each message from its publisher, so the profiles are applied
+through the qos/publication section of the session configuration, which covers
+the publishers and puts of the session. Routers forwarding to remote clients
+honour the priority and congestion control of every message, small topics then
+overtake bulk ones on a constrained link and bulk topics are dropped instead
+of blocking. Publishers outside the samples are covered by the qos/network
+section of qos_section() in the configuration of the device router.
+"""
+
+from argparse import ArgumentTypeError
+import json
+
+import zenoh
+
+# Settings of each profile in the spelling of the Zenoh configuration.
+PROFILES = {
+    # Small periodic state where only the latest sample matters.
+    "realtime": {
+        "reliability": "reliable",
+        "congestion_control": "drop",
+        "priority": "real_time",
+        "express": True,
+    },
+    # Model, tracker and cluster outputs, small and latency critical.
+    "detections": {
+        "reliability": "reliable",
+        "congestion_control": "drop",
+        "priority": "interactive_high",
+        "express": True,
+    },
+    # Rare messages describing a sensor which must not be lost.
+    "state": {
+        "reliability": "reliable",
+        "congestion_control": "block",
+        "priority": "data_high",
+        "express": False,
+    },
+    # Images, point clouds, masks and cubes which absorb the drops.
+    "bulk": {
+        "reliability": "best_effort",
+        "congestion_control": "drop",
+        "priority": "data_low",
+        "express": False,
+    },
+    # Zenoh defaults.
+    "default": {
+        "reliability": "reliable",
+        "congestion_control": "drop",
+        "priority": "data",
+        "express": False,
+    },
+}
+
+# Profile of each topic. Zenoh does not apply the first of several matching
+# qos/publication rules, so the topics are listed one by one rather than with
+# wildcards which would overlap, rt/lidar/** would also cover rt/lidar/clusters.
+TOPIC_PROFILES = [
+    ("rt/imu", "realtime"),
+    ("rt/gps", "realtime"),
+    ("rt/camera/info", "state"),
+    ("rt/lidar/info", "state"),
+    ("rt/model/info", "state"),
+    ("rt/radar/info", "state"),
+    ("rt/model/boxes2d", "detections"),
+    ("rt/fusion/boxes3d", "detections"),
+    ("rt/radar/targets", "detections"),
+    ("rt/radar/clusters", "detections"),
+    ("rt/lidar/clusters", "detections"),
+    ("rt/camera/dma", "bulk"),
+    ("rt/camera/h264", "bulk"),
+    ("rt/camera/jpeg", "bulk"),
+    ("rt/lidar/points", "bulk"),
+    ("rt/lidar/depth", "bulk"),
+    ("rt/lidar/reflect", "bulk"),
+    ("rt/radar/cube", "bulk"),
+    ("rt/model/mask", "bulk"),
+    ("rt/model/mask_compressed", "bulk"),
+    ("rt/fusion/lidar", "bulk"),
+    ("rt/fusion/radar", "bulk"),
+    ("rt/fusion/model_output", "bulk"),
+    ("rt/fusion/occupancy", "bulk"),
+]
+
+# Words accepted in a --qos override and the setting each one changes.
+SETTINGS = {
+    "reliable": ("reliability", "reliable"),
+    "best_effort": ("reliability", "best_effort"),
+    "drop": ("congestion_control", "drop"),
+    "block": ("congestion_control", "block"),
+    "express": ("express", True),
+    "no_express": ("express", False),
+}
+for _priority in [
+    "real_time",
+    "interactive_high",
+    "interactive_low",
+    "data_high",
+    "data",
+    "data_low",
+    "background",
+]:
+    SETTINGS[_priority] = ("priority", _priority)
+
+
+def topic_profile(key_expr):
+    """Name of the default profile of key_expr."""
+    return dict(TOPIC_PROFILES).get(str(key_expr), "default")
+
+
+def qos_override(value):
+    """Parses KEY=SPEC where SPEC is a profile or comma separated settings.
+
+    Settings start from the default profile of KEY, so rt/lidar/points=express
+    keeps the bulk profile but skips batching. KEY must be a valid key
+    expression, a warning is printed when it matches none of TOPIC_PROFILES
+    as a misspelt topic would.
+    """
+    key_expr, sep, spec = value.partition("=")
+    if not sep or not key_expr or not spec:
+        raise ArgumentTypeError("expected KEY=PROFILE or KEY=SETTING,...")
+    try:
+        key = zenoh.KeyExpr(key_expr)
+    except zenoh.ZError:
+        raise ArgumentTypeError("invalid key expression %s" % key_expr)
+    if not any(key.intersects(zenoh.KeyExpr(topic)) for topic, _ in TOPIC_PROFILES):
+        print("Warning: --qos %s matches none of the known topics" % key_expr)
+    if spec in PROFILES:
+        return key_expr, dict(PROFILES[spec])
+    settings = dict(PROFILES[topic_profile(key_expr)])
+    for word in spec.split(","):
+        if word not in SETTINGS:
+            raise ArgumentTypeError(
+                "unknown QoS setting %s, expected a profile (%s) or settings (%s)"
+                % (word, ", ".join(PROFILES), ", ".join(SETTINGS))
+            )
+        name, setting = SETTINGS[word]
+        settings[name] = setting
+    return key_expr, settings
+
+
+def add_qos_arg(parser):
+    """Adds the option overriding the QoS profile of a topic.
+
+    Only for the samples which publish, the QoS of a message is chosen by its
+    publisher and a subscribing session has no say in it.
+    """
+    parser.add_argument(
+        "--qos",
+        type=qos_override,
+        action="append",
+        default=[],
+        metavar="KEY=SPEC",
+        help="Override the QoS of the topics matching KEY with a profile (%s) "
+        "or comma separated settings such as best_effort,block,data_high,express. "
+        "May be repeated." % ", ".join(PROFILES),
+    )
+
+
+def qos_rules(overrides=()):
+    """The (key_expr, settings) rules, the latest override first.
+
+    A publication matching several rules gets the settings of any one of
+    them, so each override replaces the rules of the topics it includes,
+    defaults and earlier overrides alike. Overrides which only partly overlap
+    each other are left to Zenoh, see tools/qos.py --table.
+    """
+    rules = []
+    for key_expr, settings in list(reversed(overrides)) + [
+        (topic, PROFILES[profile]) for topic, profile in TOPIC_PROFILES
+    ]:
+        if not any(
+            zenoh.KeyExpr(kept).includes(zenoh.KeyExpr(key_expr)) for kept, _ in rules
+        ):
+            rules.append((key_expr, settings))
+    return rules
+
+
+def qos_section(overrides=()):
+    """The qos section of a Zenoh configuration applying the profiles.
+
+    The rules do not overlap, so each topic matches a single publication rule
+    and a single network overwrite. The network rules rewrite the messages a
+    router forwards, whatever their publisher declared, reliability cannot be
+    changed once published.
+    """
+    rules = qos_rules(overrides)
+    publication = [
+        {"key_exprs": [key_expr], "config": settings} for key_expr, settings in rules
+    ]
+    network = [
+        {
+            "id": "edgefirst-%d" % index,
+            "messages": ["put"],
+            "flows": ["egress"],
+            "key_exprs": [key_expr],
+            "overwrite": {
+                "priority": settings["priority"],
+                "congestion_control": settings["congestion_control"],
+                "express": settings["express"],
+            },
+        }
+        for index, (key_expr, settings) in enumerate(rules)
+    ]
+    return {"publication": publication, "network": network}
+
+
+def apply_qos(config, overrides=()):
+    """Applies the profiles to the publications of a Zenoh configuration."""
+    publication = qos_section(overrides)["publication"]
+    config.insert_json5("qos/publication", json.dumps(publication))
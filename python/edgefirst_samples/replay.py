@@ -0,0 +1,207 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
+
+import _thread
+import signal
+import threading
+import time
+from collections import namedtuple
+
+import zenoh
+
+from .stats import topic_stats, wait_processed
+
+# Gives the sample time to declare all of its subscribers before playback.
+SETTLE_TIME = 0.5
+
+# When replaying as fast as possible, a message whose handler has not taken it
+# while no message of any topic was processed for this long is given up on.
+# The handler is waiting on something else and will only keep the latest.
+PROCESS_IDLE = 1.0
+
+# Mirrors the fields of zenoh.Sample used by the samples, the values themselves
+# are genuine Zenoh types so workers cannot tell a replay from a live session.
+ReplaySample = namedtuple("ReplaySample", ["key_expr", "payload", "encoding"])
+
+
+def topic_key(topic):
+    """Maps an MCAP topic such as /camera/info to its Zenoh key rt/camera/info."""
+    topic = topic.lstrip("/")
+    return topic if topic.startswith("rt/") else "rt/" + topic
+
+
+def interrupt_main():
+    """Sends SIGINT to the main thread as Ctrl+C does.
+
+    Unlike _thread.interrupt_main() alone, the signal also wakes an event loop
+    waiting in select, where available.
+    """
+    if hasattr(signal, "pthread_kill"):
+        signal.pthread_kill(threading.main_thread().ident, signal.SIGINT)
+    else:
+        _thread.interrupt_main()
+
+
+class ReplaySubscriber:
+    def __init__(self, session, key_expr, handler):
+        self._session = session
+        self.key_expr = zenoh.KeyExpr(key_expr)
+        self.handler = handler
+
+    def undeclare(self):
+        self._session.undeclare(self)
+
+
+class McapSession:
+    """Stands in for a Zenoh session, publishing the messages of an MCAP file.
+
+    rate is the playback speed relative to the recording, 1.0 replays in real
+    time while 0 replays as fast as possible. In that mode each message waits
+    for the previous one to reach its worker, so the statistics measure the
+    throughput of the pipeline rather than how many messages the drains drop.
+    start skips the given number of seconds from the beginning of the recording
+    using the chunk indexes, so the skipped chunks are never decompressed.
+
+    At the end of the recording the finished event is set. Once the messages
+    have been processed, SIGINT is raised. That is how the samples exit on
+    Ctrl+C, so timed replays end on their own.
+    """
+
+    def __init__(self, path, rate=1.0, start=0.0):
+        from mcap.reader import make_reader
+
+        self._path = path
+        self._rate = rate
+        self._lock = threading.Lock()
+        self._subscribers = []
+        self._thread = None
+        self._closed = False
+        self.finished = threading.Event()
+
+        with open(path, "rb") as f:
+            reader = make_reader(f)
+            summary = reader.get_summary()
+            if summary is None or summary.statistics is None:
+                self._start = None
+            else:
+                offset = int(start * 1e9)
+                self._start = summary.statistics.message_start_time + offset
+
+            # Schema of each channel, used for topic discovery.
+            self._topics = {}
+            if summary is not None:
+                for channel in summary.channels.values():
+                    schema = summary.schemas.get(channel.schema_id)
+                    self._topics[topic_key(channel.topic)] = (
+                        schema.name if schema is not None else ""
+                    )
+
+    @staticmethod
+    def _sample(schema, channel, message):
+        encoding = zenoh.Encoding.APPLICATION_CDR
+        if channel.message_encoding != "cdr":
+            encoding = zenoh.Encoding.ZENOH_BYTES
+        if schema is not None:
+            encoding = encoding.with_schema(schema.name)
+        return ReplaySample(
+            zenoh.KeyExpr(topic_key(channel.topic)),
+            zenoh.ZBytes(message.data),
+            encoding,
+        )
+
+    def declare_subscriber(self, key_expr, handler):
+        subscriber = ReplaySubscriber(self, key_expr, handler)
+        with self._lock:
+            self._subscribers.append(subscriber)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._play, daemon=True)
+                self._thread.start()
+        return subscriber
+
+    def undeclare(self, subscriber):
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+    def topics(self, key_expr):
+        """The {topic: schema} of the recorded channels under key_expr.
+
+        Once playback has finished nothing is published, so no topics remain.
+        """
+        if self.finished.is_set():
+            return {}
+        key_expr = zenoh.KeyExpr(key_expr)
+        return {
+            topic: schema
+            for topic, schema in self._topics.items()
+            if key_expr.intersects(zenoh.KeyExpr(topic))
+        }
+
+    def close(self):
+        self._closed = True
+
+    def _play(self):
+        from mcap.reader import make_reader
+
+        time.sleep(SETTLE_TIME)
+        origin = None
+        matches = {}
+        # Processed count of the topics whose handlers stopped taking messages,
+        # they are not waited for until they process one again.
+        stalled = {}
+        # Processed count of each topic when its latest message was delivered.
+        pending = {}
+        with open(self._path, "rb") as f:
+            reader = make_reader(f)
+            for schema, channel, message in reader.iter_messages(
+                start_time=self._start, log_time_order=True
+            ):
+                if self._closed:
+                    return
+                if self._rate > 0:
+                    if origin is None:
+                        origin = (time.monotonic(), message.log_time)
+                    delay = (message.log_time - origin[1]) / 1e9 / self._rate
+                    delay -= time.monotonic() - origin[0]
+                    if delay > 0:
+                        time.sleep(delay)
+
+                sample = self._sample(schema, channel, message)
+                topic = str(sample.key_expr)
+                processed = topic_stats(topic).processed
+                if self._deliver(sample, channel, matches):
+                    pending[topic] = processed
+                    if self._rate == 0:
+                        self._wait_processed(topic, processed, stalled)
+        self.finished.set()
+        for topic, processed in pending.items():
+            self._wait_processed(topic, processed, stalled)
+        print("Replay of %s finished" % self._path)
+        if not self._closed:
+            interrupt_main()
+
+    def _deliver(self, sample, channel, matches):
+        """Hands sample to the matching subscribers, caching in matches whether
+        each subscriber matches the channel. Returns whether any did."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        delivered = False
+        for subscriber in subscribers:
+            key = (id(subscriber), channel.id)
+            if key not in matches:
+                matches[key] = subscriber.key_expr.intersects(sample.key_expr)
+            if matches[key]:
+                subscriber.handler(sample)
+                delivered = True
+        return delivered
+
+    @staticmethod
+    def _wait_processed(topic, processed, stalled):
+        """Waits until the message delivered on topic, when processed messages
+        had been processed, or a later one reaches a worker."""
+        stats = topic_stats(topic)
+        if stalled.get(topic) == stats.processed:
+            return
+        stalled.pop(topic, None)
+        if not wait_processed(stats, processed, PROCESS_IDLE):
+            stalled[topic] = stats.processed
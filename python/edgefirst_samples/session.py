@@ -0,0 +1,83 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
+
+import zenoh
+
+from .qos import apply_qos
+from .replay import McapSession
+
+# Shared memory pool of a session, large enough for several camera frames,
+# masks, or radar cubes in flight at once.
+SHM_POOL_SIZE = 64 * 1024 * 1024
+
+
+def add_session_args(parser):
+    """Adds the options selecting where messages come from."""
+    parser.add_argument(
+        "-r",
+        "--remote",
+        type=str,
+        default=None,
+        help="Connect to the remote endpoint instead of local.",
+    )
+    parser.add_argument(
+        "--mcap",
+        type=str,
+        default=None,
+        help="Replay an MCAP recording instead of connecting to Zenoh.",
+    )
+    parser.add_argument(
+        "--replay-rate",
+        type=float,
+        default=1.0,
+        help="Playback speed of --mcap relative to the recording, "
+        "0 replays as fast as possible.",
+    )
+    parser.add_argument(
+        "--replay-start",
+        type=float,
+        default=0.0,
+        help="Seconds into the --mcap recording to start playback.",
+    )
+    add_shm_arg(parser)
+
+
+def add_shm_arg(parser):
+    """Adds the option disabling the shared memory transport."""
+    parser.add_argument(
+        "--no-shm",
+        action="store_true",
+        help="Disable the Zenoh shared memory transport between local processes.",
+    )
+
+
+def zenoh_config(args):
+    """Builds the Zenoh configuration for the --remote option."""
+    # Create the default Zenoh configuration and if the remote argument is
+    # provided set the mode to client and add the target to the endpoints.
+    config = zenoh.Config()
+    config.insert_json5("scouting/multicast/interface", "'lo'")
+    if args.remote is not None:
+        config.insert_json5("mode", "'client'")
+        config.insert_json5("connect", '{"endpoints": ["%s"]}' % args.remote)
+    # Local peers exchange payloads larger than a few KB through shared memory
+    # instead of copying them through the network stack, which cannot reach
+    # across hosts so it is only enabled in local mode.
+    shm = args.remote is None and not getattr(args, "no_shm", False)
+    config.insert_json5("transport/shared_memory/enabled", "true" if shm else "false")
+    if shm:
+        config.insert_json5(
+            "transport/shared_memory/transport_optimization/pool_size",
+            str(SHM_POOL_SIZE),
+        )
+    # Only the samples publishing offer --qos, the others publish nothing the
+    # profiles would apply to.
+    apply_qos(config, getattr(args, "qos", []))
+    return config
+
+
+def open_session(args):
+    """Opens the Zenoh session, or the MCAP replay when --mcap is given."""
+    if args.mcap is not None:
+        return McapSession(args.mcap, args.replay_rate, args.replay_start)
+    return zenoh.open(zenoh_config(args))
@@ -0,0 +1,258 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
+
+import atexit
+import threading
+import time
+from collections import deque, namedtuple
+
+import numpy as np
+import rerun as rr
+
+from .stats import current_timer, enable_latency, percentiles, report, write_json
+
+_sink = "rerun"
+_log_thread = None
+
+# Timeline of the message header stamps, shared with the imu sample's batches.
+SENSOR_TIMELINE = "sensor_time"
+
+# Flush durations kept by the log thread for its percentiles.
+FLUSH_SAMPLES = 10000
+
+# Archetypes whose logs add to a series rather than replace the previous one,
+# the log thread keeps every one of them.
+SERIES_ARCHETYPES = (rr.Scalars, rr.TextLog)
+
+# Columns queued for rr.send_columns, they carry their own times and are kept.
+Columns = namedtuple("Columns", ["indexes", "columns"])
+
+
+def add_sink_args(parser):
+    """Adds the --sink option along with the standard Rerun arguments."""
+    parser.add_argument(
+        "--sink",
+        choices=["rerun", "null"],
+        default="rerun",
+        help="Where logged data goes, null runs the full pipeline but discards "
+        "the final log and prints ingest statistics at exit.",
+    )
+    parser.add_argument(
+        "--latency",
+        action="store_true",
+        help="Record the latency from each message's header stamp to its first "
+        "log and print it with the ingest statistics at exit.",
+    )
+    parser.add_argument(
+        "--stats-json",
+        type=str,
+        default=None,
+        help="Write the ingest statistics to this JSON file at exit.",
+    )
+    parser.add_argument(
+        "--log-tick",
+        type=float,
+        default=0.0,
+        help="Log to Rerun from a dedicated thread in batches this many seconds "
+        "apart. Each batch only keeps the latest log of each entity path, so "
+        "frames are dropped. 0, the default, logs every frame from the workers.",
+    )
+    rr.script_add_args(parser)
+
+
+def setup_sink(args, application_id, report_stats=True):
+    """Replaces rr.script_setup, honouring the --sink option.
+
+    The null sink prints the ingest statistics at exit unless report_stats is
+    False, as for tools which report the statistics themselves. The Rerun sink
+    starts the log thread unless --log-tick is 0.
+    """
+    global _sink, _log_thread
+    _sink = args.sink
+    if args.latency:
+        enable_latency()
+    if _sink == "null":
+        # A recording without any sink drops everything sent to it, so the
+        # blueprint and other direct Rerun calls remain harmless.
+        rr.init(application_id)
+        rr.set_sinks()
+    else:
+        rr.script_setup(args, application_id)
+    if report_stats and (_sink == "null" or args.latency):
+        atexit.register(report)
+    if args.stats_json is not None:
+        atexit.register(write_json, args.stats_json)
+    if _sink != "null" and args.log_tick > 0:
+        _log_thread = LogThread(args.log_tick)
+        # Registered last so it flushes before the statistics are reported.
+        atexit.register(_log_thread.stop, report_stats and args.latency)
+
+
+class LogThread:
+    """Logs the archetypes built by the workers from one dedicated thread.
+
+    Workers append their logs to a deque, whose append and popleft are atomic
+    so neither side takes a lock, and return without waiting for rr.log. Every
+    tick the thread takes the queued logs and logs them as a batch. Only the
+    latest log of each entity path and archetype by sensor time is kept, the
+    others are counted as superseded, while static logs, columns, and logs
+    of SERIES_ARCHETYPES are all kept. depth is the number of logs waiting and
+    flush_times holds how long each batch took to log.
+    """
+
+    def __init__(self, tick):
+        self.tick = tick
+        self.flushes = 0
+        self.logged = 0
+        self.superseded = 0
+        self.max_depth = 0
+        # Nanoseconds spent logging each batch.
+        self.flush_times = deque(maxlen=FLUSH_SAMPLES)
+        self._queue = deque()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def depth(self):
+        return len(self._queue)
+
+    def put(self, entity_path, entity, static, timer):
+        stamp = timer.stamp if timer is not None else None
+        self._queue.append((entity_path, entity, static, stamp, timer))
+
+    def _run(self):
+        while not self._stop.wait(self.tick):
+            self.flush()
+
+    def flush(self):
+        """Logs everything queued, called every tick by the thread."""
+        count = len(self._queue)
+        if not count:
+            return
+        self.max_depth = max(self.max_depth, count)
+        batch = [self._queue.popleft() for _ in range(count)]
+        start = time.perf_counter_ns()
+
+        latest = {}
+        for index, (entity_path, entity, static, stamp, _) in enumerate(batch):
+            if static or isinstance(entity, SERIES_ARCHETYPES + (Columns,)):
+                continue
+            key = (entity_path, type(entity))
+            kept = latest.get(key)
+            if kept is None or (stamp or 0) >= (batch[kept][3] or 0):
+                latest[key] = index
+
+        for index, (entity_path, entity, static, stamp, timer) in enumerate(batch):
+            if not static and latest.get((entity_path, type(entity)), index) != index:
+                self.superseded += 1
+                continue
+            logged = time.perf_counter()
+            if isinstance(entity, Columns):
+                rr.send_columns(
+                    entity_path, indexes=entity.indexes, columns=entity.columns
+                )
+            else:
+                set_sensor_time(stamp)
+                rr.log(entity_path, entity, static=static)
+            self.logged += 1
+            if timer is not None:
+                timer.add("log", time.perf_counter() - logged)
+                timer.logged()
+
+        self.flush_times.append(time.perf_counter_ns() - start)
+        self.flushes += 1
+
+    def stop(self, report_stats=False):
+        """Stops the thread after logging what is still queued."""
+        self._stop.set()
+        self._thread.join()
+        self.flush()
+        if report_stats:
+            self.report()
+
+    def summary(self):
+        result = {
+            "flushes": self.flushes,
+            "logged": self.logged,
+            "superseded": self.superseded,
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+        }
+        if self.flush_times:
+            result["flush_ms"] = percentiles(list(self.flush_times))
+        return result
+
+    def report(self):
+        summary = self.summary()
+        print(
+            "rerun log thread: %d batches %d logged %d superseded max depth %d"
+            % (
+                summary["flushes"],
+                summary["logged"],
+                summary["superseded"],
+                summary["max_depth"],
+            )
+        )
+        flush = summary.get("flush_ms")
+        if flush:
+            print(
+                "    flush p50 %.2f p90 %.2f p99 %.2f max %.2f ms"
+                % (flush["p50"], flush["p90"], flush["p99"], flush["max"])
+            )
+
+
+def log_thread():
+    """The LogThread of the Rerun sink, None when logging from the workers."""
+    return _log_thread
+
+
+def set_sensor_time(stamp):
+    """Places the following logs of this thread at stamp nanoseconds on the
+    sensor timeline, or off it when stamp is None.
+
+    Rerun keeps the time per thread, so workers running in parallel each log
+    at the time of their own message whatever order they finish in.
+    """
+    if stamp is None:
+        rr.disable_timeline(SENSOR_TIMELINE)
+    else:
+        rr.set_time(SENSOR_TIMELINE, timestamp=np.datetime64(stamp, "ns"))
+
+
+def log(entity_path, entity, static=False):
+    """Logs to Rerun unless the null sink is selected.
+
+    Building the archetype passed in is the last step of a worker, so the time
+    since the previous stage is reported as "convert" and rr.log itself as "log".
+    The message counts as logged once rr.log returns. Logs of a worker are
+    stamped with the sensor time of its message, see stats.message_stamp().
+
+    With the log thread running the entity is only queued, so it must not be
+    modified afterwards, and its rr.log is timed on the log thread.
+    """
+    timer = current_timer()
+    if timer is not None:
+        timer.lap("convert")
+    if _log_thread is not None:
+        _log_thread.put(entity_path, entity, static, timer)
+        return
+    if _sink != "null":
+        if timer is not None:
+            set_sensor_time(timer.stamp)
+        rr.log(entity_path, entity, static=static)
+        if timer is not None:
+            timer.lap("log")
+    if timer is not None:
+        timer.logged()
+
+
+def send_columns(entity_path, indexes, columns):
+    """rr.send_columns unless the null sink is selected, queued on the log
+    thread when it runs. The columns carry their own times and are never
+    superseded.
+    """
+    if _log_thread is not None:
+        _log_thread.put(entity_path, Columns(indexes, columns), False, None)
+    elif _sink != "null":
+        rr.send_columns(entity_path, indexes=indexes, columns=columns)
@@ -0,0 +1,132 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
+
+"""
+Rarely changing topics fetched once instead of subscribed at full rate.
+
+rt/camera/info, rt/model/info, and rt/radar/info describe a sensor or model
+and are republished periodically so late joiners eventually receive them. A
+StaticTopic asks for the latest sample through an advanced subscriber with
+history, which publishers declared with a cache answer at once, otherwise it
+waits for the next publish. The subscriber is then undeclared, so the
+periodic publishes stop reaching the sample, and the topic is fetched again
+every refresh seconds to pick up changes. ChangeFilter then drops the
+samples which repeat the previous one before they are deserialized or logged.
+"""
+
+import threading
+import zlib
+
+from zenoh.ext import HistoryConfig, declare_advanced_subscriber
+
+from .replay import McapSession
+from .stats import counted
+
+# Topics describing a sensor or model, published by the device with a cache.
+STATIC_TOPICS = ["rt/camera/info", "rt/model/info", "rt/radar/info"]
+
+# Stamp of a leading std_msgs/Header, after the 4 byte CDR encapsulation.
+HEADER_STAMP = slice(4, 12)
+
+
+def add_static_arg(parser):
+    """Adds the option setting how often static topics are fetched again."""
+    parser.add_argument(
+        "--info-refresh",
+        type=float,
+        default=10.0,
+        help="Seconds between fetches of the rarely changing info topics, "
+        "0 keeps subscribing to every publish instead.",
+    )
+
+
+class ChangeFilter:
+    """Subscriber handler passing on only the messages that changed.
+
+    Each payload is reduced to a CRC32 of its raw bytes, without the bytes
+    in ignore, and compared with the previous one of its topic, so a repeat
+    is dropped before it is deserialized. The header stamp is ignored by
+    default since publishers restamp unchanged messages.
+    """
+
+    def __init__(self, handler, ignore=HEADER_STAMP):
+        self.skipped = 0
+        self._handler = handler
+        self._ignore = ignore
+        self._digests = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, msg):
+        data = memoryview(msg.payload.to_bytes())
+        digest = zlib.crc32(
+            data[self._ignore.stop :], zlib.crc32(data[: self._ignore.start])
+        )
+        digest = (len(data), digest)
+        topic = str(msg.key_expr)
+        with self._lock:
+            if self._digests.get(topic) == digest:
+                self.skipped += 1
+                return
+            self._digests[topic] = digest
+        self._handler(msg)
+
+
+class StaticTopic:
+    """Latest sample of a rarely changing topic, passed to handler on each fetch.
+
+    sample holds the latest sample, wait() blocks until the first one arrives.
+    A refresh of 0 keeps the subscriber declared, which suits publishers that
+    only publish when the topic changes. An MCAP replay plays every message.
+    """
+
+    def __init__(self, session, key_expr, handler, refresh=10.0):
+        self.key_expr = key_expr
+        self.sample = None
+        self._session = session
+        self._handler = counted(handler)
+        self._refresh = refresh
+        self._received = threading.Event()
+        self._first = threading.Event()
+        self._stop = threading.Event()
+        self._subscriber = None
+        self._thread = None
+        if isinstance(session, McapSession):
+            self._subscriber = session.declare_subscriber(key_expr, self._callback)
+        else:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def _callback(self, msg):
+        self.sample = msg
+        self._received.set()
+        self._first.set()
+        self._handler(msg)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._received.clear()
+            subscriber = declare_advanced_subscriber(
+                self._session,
+                self.key_expr,
+                self._callback,
+                history=HistoryConfig(detect_late_publishers=True, max_samples=1),
+            )
+            if self._refresh:
+                while not self._received.wait(0.1) and not self._stop.is_set():
+                    pass
+            else:
+                self._stop.wait()
+            subscriber.undeclare()
+            self._stop.wait(self._refresh)
+
+    def wait(self, timeout=None):
+        """The first sample, or None when none arrived within timeout."""
+        self._first.wait(timeout)
+        return self.sample
+
+    def undeclare(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self._subscriber is not None:
+            self._subscriber.undeclare()
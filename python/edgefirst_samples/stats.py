@@ -0,0 +1,336 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
+
+import json
+import struct
+import threading
+import time
+from collections import deque, namedtuple
+
+import numpy as np
+
+# Latency samples kept per topic, later messages are not recorded.
+LATENCY_SAMPLES = 100000
+
+# Latencies beyond this are taken as a header stamp which is not a publish
+# time, such as a replayed recording or a message without a header.
+LATENCY_LIMIT = 10_000_000_000
+
+# Message handed to the handlers, it carries the fields used by the workers
+# along with the arrival time in nanoseconds.
+TimedSample = namedtuple("TimedSample", ["key_expr", "payload", "encoding", "received"])
+
+# Schemas of messages which do not start with a Header or Time.
+UNSTAMPED_SCHEMAS = {
+    "edgefirst_msgs/msg/Mask",
+    "edgefirst_samples/msg/QuantizedPointCloud",
+}
+
+
+class TopicStats:
+    def __init__(self):
+        self.received = 0
+        self.bytes = 0
+        self.processed = 0
+        # Bytes copied by the workers after the payload left Zenoh.
+        self.copied = 0
+        self.first = None
+        self.last = None
+        self.stages = {}
+        # (transport, queue, process) nanoseconds of each logged message.
+        self.latency = []
+
+
+class StageTimer:
+    """Lap timer attributing the time spent in a worker to named stages."""
+
+    def __init__(self, stats, times=None, data=None, stamp=None):
+        self._stats = stats
+        self._mark = time.perf_counter()
+        # Header stamp, arrival and worker start times when recording latency.
+        self._times = times
+        # (message, payload) already copied out of Zenoh to read the stamp.
+        self.data = data
+        # Sensor time of the message in nanoseconds, see message_stamp().
+        self.stamp = stamp
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        self.add(stage, now - self._mark)
+        self._mark = now
+
+    def add(self, stage, elapsed):
+        with _lock:
+            self._stats.stages[stage] = self._stats.stages.get(stage, 0.0) + elapsed
+
+    def logged(self):
+        """Records the latency of the message on its first log."""
+        if self._times is None:
+            return
+        stamp, received, start = self._times
+        self._times = None
+        now = time.time_ns()
+        if not 0 <= now - stamp < LATENCY_LIMIT:
+            return
+        with _lock:
+            if len(self._stats.latency) < LATENCY_SAMPLES:
+                self._stats.latency.append(
+                    (received - stamp, start - received, now - start)
+                )
+
+
+class TopicWindow:
+    """Arrival times and payload sizes of a topic over a sliding window.
+
+    Only the payload length is read, so a callback feeding this is cheap
+    enough to run against every topic at once.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self._arrivals = deque()
+        self._lock = threading.Lock()
+        self._start = None
+
+    def add(self, size, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._start = self._start or now
+            self._arrivals.append((now, size))
+
+    def summary(self, now=None):
+        """Rate, inter-arrival jitter, sizes, and bandwidth of the window."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            while self._arrivals and self._arrivals[0][0] < now - self.window:
+                self._arrivals.popleft()
+            arrivals = np.array(self._arrivals, dtype=np.float64).reshape(-1, 2)
+            # Until a whole window has passed the bandwidth covers less time.
+            span = min(self.window, now - self._start) if self._start else 0.0
+        if len(arrivals) == 0:
+            return None
+        intervals = np.diff(arrivals[:, 0])
+        sizes = arrivals[:, 1]
+        return {
+            "count": len(arrivals),
+            "rate": 1.0 / intervals.mean() if len(intervals) else 0.0,
+            "jitter": intervals.std() if len(intervals) else 0.0,
+            "mean_size": sizes.mean(),
+            "max_size": sizes.max(),
+            "bandwidth": sizes.sum() / span if span > 0 else 0.0,
+        }
+
+
+_lock = threading.Lock()
+# Notified whenever a message of any topic starts processing.
+_processed = threading.Condition(_lock)
+_topics = {}
+_current = threading.local()
+_latency = False
+
+
+def enable_latency():
+    """Makes stage_timer record the latency of each message for reporting."""
+    global _latency
+    _latency = True
+
+
+def header_stamp(data):
+    """Time of the Header or Time leading a CDR message in nanoseconds."""
+    endian = "<" if data[1] == 1 else ">"
+    sec, nanosec = struct.unpack_from(endian + "iI", data, 4)
+    return sec * 1_000_000_000 + nanosec
+
+
+def has_header(encoding):
+    """Whether messages of encoding start with a Header or Time to stamp them.
+
+    The schema follows the ";" of the encoding, messages without one are not
+    assumed to have a header.
+    """
+    _, _, schema = str(encoding).partition(";")
+    return bool(schema) and schema not in UNSTAMPED_SCHEMAS
+
+
+def message_stamp(msg, data):
+    """Sensor time of msg in nanoseconds, its header stamp or else its arrival."""
+    if has_header(msg.encoding) and len(data) >= 12:
+        return header_stamp(data)
+    return getattr(msg, "received", None)
+
+
+def topic_stats(topic):
+    with _lock:
+        if topic not in _topics:
+            _topics[topic] = TopicStats()
+        return _topics[topic]
+
+
+def declare_subscriber(session, key_expr, handler):
+    """Declares a subscriber that counts the messages and bytes of each topic."""
+    return session.declare_subscriber(key_expr, counted(handler))
+
+
+def counted(handler):
+    """Wraps a subscriber handler to count the messages and bytes of each topic."""
+
+    def callback(msg):
+        stats = topic_stats(str(msg.key_expr))
+        now = time.perf_counter()
+        with _lock:
+            stats.received += 1
+            stats.bytes += len(msg.payload)
+            stats.first = stats.first or now
+            stats.last = now
+        handler(TimedSample(msg.key_expr, msg.payload, msg.encoding, time.time_ns()))
+
+    return callback
+
+
+def stage_timer(msg):
+    """Starts timing the processing of msg on the current thread.
+
+    The payload is copied out of Zenoh here to read the sensor time, as the
+    first part of the deserialize stage, and payload_bytes() hands the copy on.
+    """
+    stats = topic_stats(str(msg.key_expr))
+    with _processed:
+        stats.processed += 1
+        _processed.notify_all()
+    timer = _current.timer = StageTimer(stats)
+    data = msg.payload.to_bytes()
+    timer.data = (msg, data)
+    timer.stamp = message_stamp(msg, data)
+    if _latency and isinstance(msg, TimedSample) and has_header(msg.encoding):
+        timer._times = (timer.stamp, msg.received, time.time_ns())
+    return timer
+
+
+def payload_bytes(msg):
+    """The payload of msg as bytes, counted as a copy of the whole message.
+
+    Zenoh payloads do not expose the buffer protocol so this is the one copy
+    every worker makes, deserializers and np.frombuffer then view the bytes.
+    """
+    timer = current_timer()
+    if timer is not None and timer.data is not None and timer.data[0] is msg:
+        data = timer.data[1]
+        timer.data = None
+    else:
+        data = msg.payload.to_bytes()
+    count_copy(msg, len(data))
+    return data
+
+
+def count_copy(msg, size):
+    """Records size bytes of msg copied by its worker."""
+    stats = topic_stats(str(msg.key_expr))
+    with _lock:
+        stats.copied += size
+
+
+def wait_processed(stats, count, idle):
+    """Waits until the topic of stats has processed more than count messages.
+
+    With count the processed messages when a message was received, this waits
+    until that message or a later one is taken by a worker. The drains hand
+    over the latest message, so the older ones were superseded. Returns False
+    once no message of any topic has started for idle seconds, the handler of
+    the topic is then waiting on something else.
+    """
+    with _processed:
+        while stats.processed <= count:
+            if not _processed.wait(idle):
+                return False
+    return True
+
+
+def current_timer():
+    return getattr(_current, "timer", None)
+
+
+def percentiles(values):
+    values = np.asarray(values) / 1e6
+    return {
+        "p50": float(np.percentile(values, 50)),
+        "p90": float(np.percentile(values, 90)),
+        "p99": float(np.percentile(values, 99)),
+        "max": float(values.max()),
+    }
+
+
+def summary():
+    """Per-topic rates, stage times, and latency percentiles in milliseconds."""
+    with _lock:
+        topics = sorted(_topics.items())
+    result = {}
+    for topic, stats in topics:
+        elapsed = (stats.last - stats.first) if stats.first else 0.0
+        rate = (stats.received - 1) / elapsed if elapsed > 0 else 0.0
+        bandwidth = stats.bytes / stats.received * rate if stats.received else 0.0
+        # Copies of the whole payload made per processed message.
+        copies = 0.0
+        if stats.processed and stats.bytes:
+            copies = stats.copied / stats.processed / (stats.bytes / stats.received)
+        result[topic] = {
+            "received": stats.received,
+            "processed": stats.processed,
+            "rate": rate,
+            "bandwidth": bandwidth,
+            "copies": copies,
+            "stages_ms": {
+                stage: total * 1e3 / max(1, stats.processed)
+                for stage, total in stats.stages.items()
+            },
+        }
+        if stats.latency:
+            latency = np.asarray(stats.latency)
+            result[topic]["latency_ms"] = {
+                "transport": percentiles(latency[:, 0]),
+                "queue": percentiles(latency[:, 1]),
+                "process": percentiles(latency[:, 2]),
+                "total": percentiles(latency.sum(axis=1)),
+            }
+    return result
+
+
+def report():
+    """Prints the per-topic rates and the mean time spent in each stage."""
+    for topic, stats in summary().items():
+        print(
+            "%s: %.1f msg/s %.2f MB/s %d received %d processed %.2f copies/msg"
+            % (
+                topic,
+                stats["rate"],
+                stats["bandwidth"] / 1e6,
+                stats["received"],
+                stats["processed"],
+                stats["copies"],
+            )
+        )
+        stages = [
+            "%s %.3f ms" % (stage, ms) for stage, ms in stats["stages_ms"].items()
+        ]
+        if stages:
+            print("    " + "  ".join(stages))
+        latency = stats.get("latency_ms")
+        if latency:
+            total = latency["total"]
+            print(
+                "    latency p50 %.2f p90 %.2f p99 %.2f max %.2f ms"
+                "  (transport %.2f queue %.2f process %.2f p50)"
+                % (
+                    total["p50"],
+                    total["p90"],
+                    total["p99"],
+                    total["max"],
+                    latency["transport"]["p50"],
+                    latency["queue"]["p50"],
+                    latency["process"]["p50"],
+                )
+            )
+
+
+def write_json(path):
+    with open(path, "w") as f:
+        json.dump(summary(), f, indent=2)
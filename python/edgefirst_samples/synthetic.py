@@ -0,0 +1,405 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
+
+"""
+Schema-correct synthetic messages for load generation and benchmarks.
+
+Every builder returns the serialized CDR payload as a bytearray so callers can
+encode once and publish the same bytes repeatedly, restamp() refreshes the
+header time in place.
+"""
+
+import math
+import struct
+
+import numpy as np
+from edgefirst.schemas.builtin_interfaces import Time
+from edgefirst.schemas.edgefirst_msgs import (
+    Box,
+    Detect,
+    Mask,
+    ModelInfo,
+    RadarChannel,
+    RadarCube,
+    RadarInfo,
+    Track,
+)
+from edgefirst.schemas.foxglove_msgs import CompressedVideo
+from edgefirst.schemas.geometry_msgs import Quaternion, Vector3
+from edgefirst.schemas.sensor_msgs import (
+    CameraInfo,
+    CompressedImage,
+    Image,
+    Imu,
+    NavSatFix,
+    NavSatStatus,
+    PointCloud2,
+    PointField,
+    RegionOfInterest,
+)
+from edgefirst.schemas.std_msgs import Header
+
+# Schema names published in the Zenoh encoding of each topic.
+SCHEMAS = {
+    "rt/camera/h264": "foxglove_msgs/msg/CompressedVideo",
+    "rt/camera/jpeg": "sensor_msgs/msg/CompressedImage",
+    "rt/lidar/points": "sensor_msgs/msg/PointCloud2",
+    "rt/lidar/clusters": "sensor_msgs/msg/PointCloud2",
+    "rt/radar/cube": "edgefirst_msgs/msg/RadarCube",
+    "rt/model/boxes2d": "edgefirst_msgs/msg/Detect",
+    "rt/model/mask": "edgefirst_msgs/msg/Mask",
+    "rt/imu": "sensor_msgs/msg/Imu",
+    "rt/gps": "sensor_msgs/msg/NavSatFix",
+    "rt/camera/info": "sensor_msgs/msg/CameraInfo",
+    "rt/model/info": "edgefirst_msgs/msg/ModelInfo",
+    "rt/radar/info": "edgefirst_msgs/msg/RadarInfo",
+}
+
+# PointField datatypes of the numpy types used in synthetic point clouds.
+POINT_DATATYPES = {
+    np.dtype(np.uint8): 2,
+    np.dtype(np.uint16): 4,
+    np.dtype(np.float32): 7,
+}
+
+
+def header(stamp_ns=0, frame_id="base_link"):
+    return Header(
+        stamp=Time(sec=stamp_ns // 1_000_000_000, nanosec=stamp_ns % 1_000_000_000),
+        frame_id=frame_id,
+    )
+
+
+def restamp(payload, stamp_ns):
+    """Overwrites the leading Header or Time of a little-endian payload."""
+    struct.pack_into(
+        "<iI", payload, 4, stamp_ns // 1_000_000_000, stamp_ns % 1_000_000_000
+    )
+    return payload
+
+
+def stamp_of(payload):
+    """Reads back the time written by restamp() in nanoseconds."""
+    sec, nanosec = struct.unpack_from("<iI", payload, 4)
+    return sec * 1_000_000_000 + nanosec
+
+
+def point_cloud(points, frame_id="lidar", stamp_ns=0):
+    """Serializes a structured array as a single row PointCloud2."""
+    fields = [
+        PointField(
+            name=name,
+            offset=offset,
+            datatype=POINT_DATATYPES[dtype],
+            count=1,
+        )
+        for name, (dtype, offset) in points.dtype.fields.items()
+    ]
+    return bytearray(
+        PointCloud2(
+            header=header(stamp_ns, frame_id),
+            height=1,
+            width=len(points),
+            fields=fields,
+            is_bigendian=False,
+            point_step=points.dtype.itemsize,
+            row_step=points.nbytes,
+            data=points.tobytes(),
+            is_dense=True,
+        ).serialize()
+    )
+
+
+def lidar_points(count, rng, beams=128):
+    """A spinning lidar sweep of a room with a wavy floor."""
+    points = np.zeros(
+        count,
+        dtype=[("x", "f4"), ("y", "f4"), ("z", "f4"), ("reflect", "f4")],
+    )
+    azimuth = np.linspace(-np.pi, np.pi, count, endpoint=False)
+    elevation = np.deg2rad(np.tile(np.linspace(-22.5, 22.5, beams), -(-count // beams)))
+    elevation = elevation[:count]
+    distance = 10.0 + 2.0 * np.sin(4 * azimuth) + rng.normal(0, 0.02, count)
+    points["x"] = distance * np.cos(elevation) * np.cos(azimuth)
+    points["y"] = distance * np.cos(elevation) * np.sin(azimuth)
+    points["z"] = distance * np.sin(elevation)
+    points["reflect"] = rng.uniform(0, 255, count)
+    return point_cloud(points)
+
+
+def lidar_clusters(count, rng, clusters=8):
+    """Points scattered around a few objects, unclustered points have id 0."""
+    points = np.zeros(
+        count,
+        dtype=[("x", "f4"), ("y", "f4"), ("z", "f4"), ("cluster_id", "f4")],
+    )
+    ids = rng.integers(0, clusters + 1, count)
+    centers = rng.uniform([-20, -20, 0], [20, 20, 2], (clusters + 1, 3))
+    centers[0] = 0
+    spread = np.where(ids[:, None] == 0, 20.0, 0.5)
+    xyz = centers[ids] + rng.normal(0, 1, (count, 3)) * spread
+    points["x"], points["y"], points["z"] = xyz.T
+    points["cluster_id"] = ids
+    return point_cloud(points)
+
+
+def occupancy(count, rng, classes=4, cell=0.2):
+    """Occupied cells of a regular grid with the vision class of each cell."""
+    points = np.zeros(
+        count,
+        dtype=[("x", "f4"), ("y", "f4"), ("z", "f4"), ("vision_class", "f4")],
+    )
+    cells = rng.choice(200 * 200 * 10, count, replace=False)
+    x, y, z = np.unravel_index(cells, (200, 200, 10))
+    points["x"] = (x - 100) * cell
+    points["y"] = (y - 100) * cell
+    points["z"] = z * cell
+    points["vision_class"] = rng.integers(0, classes + 1, count)
+    return point_cloud(points, frame_id="base_link")
+
+
+def radar_cube(rng, range_bins=200, doppler_bins=256, rx=4, targets=8):
+    """A complex range-Doppler cube with noise and a few point targets."""
+    shape = (2, range_bins, rx, doppler_bins)
+    cube = rng.normal(0, 20, shape) + 1j * rng.normal(0, 20, shape)
+    for _ in range(targets):
+        r = rng.integers(0, range_bins)
+        d = rng.integers(0, doppler_bins)
+        angle = rng.uniform(-np.pi / 3, np.pi / 3)
+        phase = np.exp(1j * np.pi * np.sin(angle) * np.arange(rx))
+        cube[:, r, :, d] += 2000 * phase
+    pairs = np.empty(shape + (2,), dtype=np.int16)
+    pairs[..., 0] = np.clip(cube.real, -32768, 32767)
+    pairs[..., 1] = np.clip(cube.imag, -32768, 32767)
+    return bytearray(
+        RadarCube(
+            header=header(0, "radar"),
+            timestamp=0,
+            layout=[
+                channel.value
+                for channel in [
+                    RadarChannel.SEQUENCE,
+                    RadarChannel.RANGE,
+                    RadarChannel.RXCHANNEL,
+                    RadarChannel.DOPPLER,
+                ]
+            ],
+            shape=list(shape),
+            scales=[1.0, 0.2, 1.0, 0.1],
+            cube=pairs.ravel().tolist(),
+            is_complex=True,
+        ).serialize()
+    )
+
+
+def depth_image(height, width, rng):
+    """A mono16 lidar depth image in millimeters with a few missing returns."""
+    row = 10000 + 2000 * np.sin(np.linspace(0, 8 * np.pi, width))
+    depth = row[None, :] + rng.normal(0, 20, (height, width))
+    depth[rng.random((height, width)) < 0.05] = 0
+    data = depth.astype("<u2")
+    return bytearray(
+        Image(
+            header=header(0, "lidar"),
+            height=height,
+            width=width,
+            encoding="mono16",
+            is_bigendian=0,
+            step=width * 2,
+            data=data.tobytes(),
+        ).serialize()
+    )
+
+
+def boxes2d(count, rng):
+    """Detections in normalized image coordinates."""
+    boxes = [
+        Box(
+            center_x=float(rng.uniform(0.1, 0.9)),
+            center_y=float(rng.uniform(0.1, 0.9)),
+            width=float(rng.uniform(0.02, 0.2)),
+            height=float(rng.uniform(0.05, 0.4)),
+            label="person",
+            score=float(rng.uniform(0.5, 1.0)),
+            distance=float(rng.uniform(1.0, 30.0)),
+            speed=0.0,
+            track=Track(id="", lifetime=0, created=Time(sec=0, nanosec=0)),
+        )
+        for _ in range(count)
+    ]
+    return bytearray(
+        Detect(
+            header=header(0, "camera"),
+            input_timestamp=Time(sec=0, nanosec=0),
+            model_time=Time(sec=0, nanosec=0),
+            output_time=Time(sec=0, nanosec=0),
+            boxes=boxes,
+        ).serialize()
+    )
+
+
+def mask(height, width, classes, rng):
+    """Per-class scores of a few elliptical blobs, as published by the model."""
+    y, x = np.mgrid[0:height, 0:width]
+    scores = np.zeros((height, width, classes), dtype=np.uint8)
+    scores[..., 0] = 128
+    for _ in range(4):
+        cy, cx = rng.uniform(0, height), rng.uniform(0, width)
+        ry, rx = rng.uniform(0.05, 0.2) * height, rng.uniform(0.05, 0.2) * width
+        inside = ((y - cy) / ry) ** 2 + ((x - cx) / rx) ** 2 < 1
+        scores[inside, rng.integers(1, classes) if classes > 1 else 0] = 255
+    return bytearray(
+        Mask(
+            height=height,
+            width=width,
+            length=1,
+            encoding="",
+            mask=scores.tobytes(),
+            boxed=False,
+        ).serialize()
+    )
+
+
+def imu(t):
+    """A slowly rotating and vibrating platform at time t seconds."""
+    yaw = 0.1 * t
+    return bytearray(
+        Imu(
+            header=header(0, "imu"),
+            orientation=Quaternion(
+                x=0.0, y=0.0, z=math.sin(yaw / 2), w=math.cos(yaw / 2)
+            ),
+            orientation_covariance=[0.0] * 9,
+            angular_velocity=Vector3(x=0.0, y=0.0, z=0.1),
+            angular_velocity_covariance=[0.0] * 9,
+            linear_acceleration=Vector3(
+                x=0.2 * math.sin(20 * t), y=0.2 * math.cos(20 * t), z=9.81
+            ),
+            linear_acceleration_covariance=[0.0] * 9,
+        ).serialize()
+    )
+
+
+def gps(t, latitude=45.4215, longitude=-75.6972):
+    """A fix circling the given origin once every ten minutes."""
+    angle = 2 * math.pi * t / 600
+    return bytearray(
+        NavSatFix(
+            header=header(0, "gps"),
+            status=NavSatStatus(status=0, service=1),
+            latitude=latitude + 0.001 * math.sin(angle),
+            longitude=longitude + 0.001 * math.cos(angle),
+            altitude=70.0,
+            position_covariance=[0.0] * 9,
+            position_covariance_type=0,
+        ).serialize()
+    )
+
+
+def camera_info(width, height):
+    """Intrinsics of an ideal pinhole camera with a 90 degree field of view."""
+    focal = width / 2
+    return bytearray(
+        CameraInfo(
+            header=header(0, "camera"),
+            height=height,
+            width=width,
+            distortion_model="plumb_bob",
+            d=[0.0] * 5,
+            k=[focal, 0.0, width / 2, 0.0, focal, height / 2, 0.0, 0.0, 1.0],
+            r=[1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0],
+            p=[focal, 0.0, width / 2, 0.0, 0.0, focal, height / 2, 0.0]
+            + [0.0, 0.0, 1.0, 0.0],
+            binning_x=1,
+            binning_y=1,
+            roi=RegionOfInterest(
+                x_offset=0, y_offset=0, height=0, width=0, do_rectify=False
+            ),
+        ).serialize()
+    )
+
+
+def model_info(classes):
+    """A segmentation model with one label per mask class."""
+    return bytearray(
+        ModelInfo(
+            header=header(0, "model"),
+            input_shape=[1, 640, 640, 3],
+            input_type=2,
+            output_shape=[1, 320, 320, classes],
+            output_type=2,
+            labels=["background"] + ["class_%d" % i for i in range(1, classes)],
+            model_type="segmentation",
+            model_format="tflite",
+            model_name="synthetic",
+        ).serialize()
+    )
+
+
+def radar_info():
+    return bytearray(
+        RadarInfo(
+            header=header(0, "radar"),
+            center_frequency="medium",
+            frequency_sweep="long",
+            range_toggle="off",
+            detection_sensitivity="medium",
+            cube=True,
+        ).serialize()
+    )
+
+
+def test_pattern(width, height, index):
+    """An RGB frame with a moving gradient so encoders cannot skip frames."""
+    x = np.arange(width, dtype=np.uint16)[None, :]
+    y = np.arange(height, dtype=np.uint16)[:, None]
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    frame[..., 0] = (x + 4 * index) & 0xFF
+    frame[..., 1] = (y + 2 * index) & 0xFF
+    frame[..., 2] = ((x + y) // 2) & 0xFF
+    return frame
+
+
+def jpeg_frames(width, height, count):
+    import cv2
+
+    frames = []
+    for i in range(count):
+        ok, data = cv2.imencode(".jpg", test_pattern(width, height, i))
+        frames.append(
+            bytearray(
+                CompressedImage(
+                    header=header(0, "camera"), format="jpeg", data=data.tobytes()
+                ).serialize()
+            )
+        )
+    return frames
+
+
+def h264_frames(width, height, count):
+    """A closed group of pictures which can be published in a loop."""
+    import av
+
+    codec = av.CodecContext.create("libx264", "w")
+    codec.width = width
+    codec.height = height
+    codec.pix_fmt = "yuv420p"
+    codec.gop_size = count
+    codec.options = {"preset": "ultrafast", "tune": "zerolatency"}
+
+    packets = []
+    for i in range(count):
+        frame = av.VideoFrame.from_ndarray(test_pattern(width, height, i), "rgb24")
+        packets.extend(codec.encode(frame))
+    packets.extend(codec.encode(None))
+    return [
+        bytearray(
+            CompressedVideo(
+                timestamp=Time(sec=0, nanosec=0),
+                frame_id="camera",
+                data=bytes(packet),
+                format="h264",
+            ).serialize()
+        )
+        for packet in packets
+    ]
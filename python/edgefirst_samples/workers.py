@@ -0,0 +1,58 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
+
+"""
+Worker pools decoding several frames of a topic at once.
+
+A handler normally runs one worker thread at a time on the latest message of
+its drain. Topics whose frames are independent of each other, such as JPEG
+images, masks, and point clouds, can instead be decoded by a pool of workers,
+the decoders release the GIL so the frames overlap. Each log is stamped with
+the sensor time of its message, so frames finishing out of order still land
+in order on the sensor timeline. H.264 frames depend on the previous ones and
+stay serial.
+"""
+
+import asyncio
+import os
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+
+def add_workers_arg(parser, default=2):
+    """Adds the option setting how many frames are decoded at once.
+
+    The default is capped by the number of CPUs, on a single core workers
+    only take turns and each frame takes longer.
+    """
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=min(default, os.cpu_count() or 1),
+        help="Frames decoded at once, 1 decodes one frame at a time.",
+    )
+
+
+async def run_workers(drain, worker, workers, *args):
+    """Runs worker(msg, *args) on the latest messages of drain, workers at once.
+
+    A message is taken from the drain whenever a worker is free, so messages
+    queued meanwhile are skipped for the latest as with a single worker. The
+    exceptions of a worker are printed as for a thread.
+    """
+    loop = asyncio.get_running_loop()
+    pending = set()
+    with ThreadPoolExecutor(max(1, workers)) as pool:
+        while True:
+            if len(pending) >= max(1, workers):
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in done:
+                    error = future.exception()
+                    if error is not None:
+                        traceback.print_exception(
+                            type(error), error, error.__traceback__
+                        )
+            msg = await drain.get_latest()
+            pending.add(loop.run_in_executor(pool, worker, msg, *args))
@@ -1,7 +1,6 @@
 # SPDX-License-Identifier: Apache-2.0
 # Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
 
-import zenoh
 from edgefirst.schemas.edgefirst_msgs import Detect
 from argparse import ArgumentParser
 import sys
@@ -9,6 +8,19 @@ import rerun as rr
 import asyncio
 import time
 import threading
+import os
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from edgefirst_samples import (  # noqa: E402
+    add_session_args,
+    add_sink_args,
+    declare_subscriber,
+    log,
+    open_session,
+    payload_bytes,
+    setup_sink,
+    stage_timer,
+)
 
 
 class MessageDrain:
@@ -31,13 +43,15 @@ class MessageDrain:
 
 
 def boxes3d_worker(msg):
-    detection = Detect.deserialize(msg.payload.to_bytes())
+    timer = stage_timer(msg)
+    detection = Detect.deserialize(payload_bytes(msg))
+    timer.lap("deserialize")
     # The 3D boxes are in an _optical frame of reference, where x is right, y is down, and z (distance) is forward
     # We will convert them to a normal frame of reference, where x is forward, y is left, and z is up
     centers = [(x.distance, -x.center_x, -x.center_y) for x in detection.boxes]
     sizes = [(x.width, x.width, x.height) for x in detection.boxes]
 
-    rr.log("/pointcloud/fusion/boxes", rr.Boxes3D(centers=centers, sizes=sizes))
+    log("/pointcloud/fusion/boxes", rr.Boxes3D(centers=centers, sizes=sizes))
 
 
 async def boxes3d_handler(drain):
@@ -54,21 +68,15 @@ async def boxes3d_handler(drain):
 async def main_async(args):
     # Setup rerun
     args.memory_limit = 10
-    rr.script_setup(args, "fusion-boxes3d")
+    setup_sink(args, "fusion-boxes3d")
 
-    # Zenoh config
-    config = zenoh.Config()
-    config.insert_json5("scouting/multicast/interface", "'lo'")
-    if args.remote:
-        config.insert_json5("mode", "'client'")
-        config.insert_json5("connect", f'{{"endpoints": ["{args.remote}"]}}')
-    session = zenoh.open(config)
+    session = open_session(args)
 
     # Create drains
     loop = asyncio.get_running_loop()
     drain = MessageDrain(loop)
 
-    session.declare_subscriber("rt/fusion/boxes3d", drain.callback)
+    declare_subscriber(session, "rt/fusion/boxes3d", drain.callback)
     await asyncio.gather((boxes3d_handler(drain)))
 
     while True:
@@ -77,14 +85,8 @@ async def main_async(args):
 
 def main():
     parser = ArgumentParser(description="EdgeFirst Samples - Boxes3D")
-    parser.add_argument(
-        "-r",
-        "--remote",
-        type=str,
-        default=None,
-        help="Connect to the remote endpoint instead of local.",
-    )
-    rr.script_add_args(parser)
+    add_session_args(parser)
+    add_sink_args(parser)
     args = parser.parse_args()
 
     try:
@@ -1,7 +1,6 @@
 # SPDX-License-Identifier: Apache-2.0
 # Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
 
-import zenoh
 from edgefirst.schemas.sensor_msgs import PointCloud2
 from edgefirst.schemas import decode_pcd, colormap, turbo_colormap
 from argparse import ArgumentParser
@@ -10,6 +9,19 @@ import rerun as rr
 import asyncio
 import time
 import threading
+import os
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from edgefirst_samples import (  # noqa: E402
+    add_session_args,
+    add_sink_args,
+    declare_subscriber,
+    log,
+    open_session,
+    payload_bytes,
+    setup_sink,
+    stage_timer,
+)
 
 
 class MessageDrain:
@@ -32,16 +44,19 @@ class MessageDrain:
 
 
 def lidar_worker(msg):
-    pcd = PointCloud2.deserialize(msg.payload.to_bytes())
+    timer = stage_timer(msg)
+    pcd = PointCloud2.deserialize(payload_bytes(msg))
+    timer.lap("deserialize")
     points = decode_pcd(pcd)
+    timer.lap("decode")
     clusters = [p for p in points if p.cluster_id > 0]
     if not clusters:
-        rr.log("fusion/lidar", rr.Points3D([], colors=[]))
+        log("fusion/lidar", rr.Points3D([], colors=[]))
         return
     max_id = max(p.cluster_id for p in clusters)
     pos = [[p.x, p.y, p.z] for p in clusters]
     colors = [colormap(turbo_colormap, p.cluster_id / max_id) for p in clusters]
-    rr.log("fusion/lidar", rr.Points3D(pos, colors=colors))
+    log("fusion/lidar", rr.Points3D(pos, colors=colors))
 
 
 async def lidar_handler(drain):
@@ -58,21 +73,15 @@ async def lidar_handler(drain):
 async def main_async(args):
     # Setup rerun
     args.memory_limit = 10
-    rr.script_setup(args, "fusion-lidar")
+    setup_sink(args, "fusion-lidar")
 
-    # Zenoh config
-    config = zenoh.Config()
-    config.insert_json5("scouting/multicast/interface", "'lo'")
-    if args.remote:
-        config.insert_json5("mode", "'client'")
-        config.insert_json5("connect", f'{{"endpoints": ["{args.remote}"]}}')
-    session = zenoh.open(config)
+    session = open_session(args)
 
     # Create drains
     loop = asyncio.get_running_loop()
     drain = MessageDrain(loop)
 
-    session.declare_subscriber("rt/fusion/lidar", drain.callback)
+    declare_subscriber(session, "rt/fusion/lidar", drain.callback)
     await asyncio.gather((lidar_handler(drain)))
 
     while True:
@@ -81,14 +90,8 @@ async def main_async(args):
 
 def main():
     parser = ArgumentParser(description="EdgeFirst Samples - Fusion - Lidar")
-    parser.add_argument(
-        "-r",
-        "--remote",
-        type=str,
-        default=None,
-        help="Connect to the remote endpoint instead of local.",
-    )
-    rr.script_add_args(parser)
+    add_session_args(parser)
+    add_sink_args(parser)
     args = parser.parse_args()
 
     try:
@@ -1,8 +1,6 @@
 # SPDX-License-Identifier: Apache-2.0
 # Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
 
-import zenoh
-from edgefirst.schemas.edgefirst_msgs import Mask
 import rerun as rr
 from argparse import ArgumentParser
 import sys
@@ -10,6 +8,20 @@ import numpy as np
 import asyncio
 import time
 import threading
+import os
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from edgefirst_samples import (  # noqa: E402
+    add_session_args,
+    add_sink_args,
+    declare_subscriber,
+    log,
+    open_session,
+    payload_bytes,
+    setup_sink,
+    stage_timer,
+)
+from edgefirst_samples.cdr import decode_mask  # noqa: E402
 
 
 class MessageDrain:
@@ -32,17 +44,19 @@ class MessageDrain:
 
 
 def model_output_worker(msg):
-    mask = Mask.deserialize(msg.payload.to_bytes())
-    np_arr = np.asarray(mask.mask, dtype=np.uint8)
-    np_arr = np.reshape(np_arr, [mask.height, mask.width, -1])
+    timer = stage_timer(msg)
+    mask = decode_mask(payload_bytes(msg))
+    timer.lap("deserialize")
+    np_arr = mask.mask.reshape(mask.height, mask.width, -1)
+    timer.lap("decode")
     np_arr = np.argmax(np_arr, axis=2)
-    rr.log(
+    log(
         "/",
         rr.AnnotationContext(
             [(0, "background", (0, 0, 0)), (1, "person", (255, 0, 0))]
         ),
     )
-    rr.log("mask", rr.SegmentationImage(np_arr))
+    log("mask", rr.SegmentationImage(np_arr))
 
 
 async def model_output_handler(drain):
@@ -59,21 +73,15 @@ async def model_output_handler(drain):
 async def main_async(args):
     # Setup rerun
     args.memory_limit = 10
-    rr.script_setup(args, "fusion/model_output/tracked")
+    setup_sink(args, "fusion/model_output/tracked")
 
-    # Zenoh config
-    config = zenoh.Config()
-    config.insert_json5("scouting/multicast/interface", "'lo'")
-    if args.remote:
-        config.insert_json5("mode", "'client'")
-        config.insert_json5("connect", f'{{"endpoints": ["{args.remote}"]}}')
-    session = zenoh.open(config)
+    session = open_session(args)
 
     # Create drains
     loop = asyncio.get_running_loop()
     drain = MessageDrain(loop)
 
-    session.declare_subscriber("rt/fusion/model_output/tracked", drain.callback)
+    declare_subscriber(session, "rt/fusion/model_output/tracked", drain.callback)
     await asyncio.gather((model_output_handler(drain)))
 
     while True:
@@ -84,14 +92,8 @@ def main():
     parser = ArgumentParser(
         description="EdgeFirst Samples - Fusion Model Output - Tracked"
     )
-    parser.add_argument(
-        "-r",
-        "--remote",
-        type=str,
-        default=None,
-        help="Connect to the remote endpoint instead of local.",
-    )
-    rr.script_add_args(parser)
+    add_session_args(parser)
+    add_sink_args(parser)
     args = parser.parse_args()
 
     try:
@@ -1,15 +1,31 @@
 # SPDX-License-Identifier: Apache-2.0
 # Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
 
-import zenoh
-from edgefirst.schemas.sensor_msgs import PointCloud2
-from edgefirst.schemas import decode_pcd, colormap, turbo_colormap
+from edgefirst.schemas import turbo_colormap
 from argparse import ArgumentParser
 import sys
 import rerun as rr
 import asyncio
 import time
-import threading
+import os
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from edgefirst_samples import (  # noqa: E402
+    add_session_args,
+    add_sink_args,
+    add_workers_arg,
+    declare_subscriber,
+    log,
+    open_session,
+    payload_bytes,
+    run_workers,
+    setup_sink,
+    stage_timer,
+)
+from edgefirst_samples.cdr import decode_point_cloud, point_array  # noqa: E402
+
+TURBO = np.asarray(turbo_colormap, dtype=np.float32)
 
 
 class MessageDrain:
@@ -32,47 +48,38 @@ class MessageDrain:
 
 
 def occupancy_worker(msg):
-    pcd = PointCloud2.deserialize(msg.payload.to_bytes())
-    points = decode_pcd(pcd)
-    if not points:
-        rr.log("fusion/occupancy", rr.Points3D(positions=[], colors=[]))
+    timer = stage_timer(msg)
+    pcd = decode_point_cloud(payload_bytes(msg))
+    timer.lap("deserialize")
+    points = point_array(pcd)
+    timer.lap("decode")
+    if len(points) == 0:
+        log("fusion/occupancy", rr.Points3D(positions=[], colors=[]))
         return
-    max_class = max(max([p.vision_class for p in points]), 1)
-    pos = [[p.x, p.y, p.z] for p in points]
-    colors = [colormap(turbo_colormap, p.vision_class / max_class) for p in points]
-    rr.log("fusion/occupancy", rr.Points3D(positions=pos, colors=colors))
+    vision_class = points["vision_class"]
+    max_class = max(vision_class.max(), 1)
+    pos = np.column_stack((points["x"], points["y"], points["z"]))
+    colors = TURBO[(np.clip(vision_class / max_class, 0, 1) * 255).astype(np.intp)]
+    log("fusion/occupancy", rr.Points3D(positions=pos, colors=colors))
 
 
-async def occupancy_handler(drain):
-    while True:
-        msg = await drain.get_latest()
-        thread = threading.Thread(target=occupancy_worker, args=[msg])
-        thread.start()
-
-        while thread.is_alive():
-            await asyncio.sleep(0.001)
-        thread.join()
+async def occupancy_handler(drain, workers):
+    await run_workers(drain, occupancy_worker, workers)
 
 
 async def main_async(args):
     # Setup rerun
     args.memory_limit = 10
-    rr.script_setup(args, "fusion/occupancy")
+    setup_sink(args, "fusion/occupancy")
 
-    # Zenoh config
-    config = zenoh.Config()
-    config.insert_json5("scouting/multicast/interface", "'lo'")
-    if args.remote:
-        config.insert_json5("mode", "'client'")
-        config.insert_json5("connect", f'{{"endpoints": ["{args.remote}"]}}')
-    session = zenoh.open(config)
+    session = open_session(args)
 
     # Create drains
     loop = asyncio.get_running_loop()
     drain = MessageDrain(loop)
 
-    session.declare_subscriber("rt/fusion/occupancy", drain.callback)
-    await asyncio.gather((occupancy_handler(drain)))
+    declare_subscriber(session, "rt/fusion/occupancy", drain.callback)
+    await asyncio.gather((occupancy_handler(drain, args.workers)))
 
     while True:
         asyncio.sleep(0.001)
@@ -80,14 +87,9 @@ async def main_async(args):
 
 def main():
     parser = ArgumentParser(description="EdgeFirst Samples - Fusion Occupancy")
-    parser.add_argument(
-        "-r",
-        "--remote",
-        type=str,
-        default=None,
-        help="Connect to the remote endpoint instead of local.",
-    )
-    rr.script_add_args(parser)
+    add_session_args(parser)
+    add_sink_args(parser)
+    add_workers_arg(parser)
     args = parser.parse_args()
 
     try:
@@ -2,13 +2,23 @@
 # Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
 
 import rerun as rr
-import zenoh
 import sys
 import asyncio
 import time
 from argparse import ArgumentParser
 from edgefirst.schemas.sensor_msgs import NavSatFix
 import threading
+from edgefirst_samples import (
+    add_session_args,
+    add_sink_args,
+    declare_subscriber,
+    log,
+    open_session,
+    payload_bytes,
+    setup_sink,
+    stage_timer,
+)
+from edgefirst_samples.gps import GpsTrack, add_track_args
 
 
 class MessageDrain:
@@ -30,15 +40,22 @@ class MessageDrain:
         return latest
 
 
-def gps_worker(msg):
-    gps = NavSatFix.deserialize(msg.payload.to_bytes())
-    rr.log("CurrentLoc", rr.GeoPoints(lat_lon=[gps.latitude, gps.longitude]))
+def gps_worker(msg, track):
+    timer = stage_timer(msg)
+    gps = NavSatFix.deserialize(payload_bytes(msg))
+    timer.lap("deserialize")
+    log("CurrentLoc", rr.GeoPoints(lat_lon=[gps.latitude, gps.longitude]))
+    if track.add(gps.latitude, gps.longitude):
+        track.log()
 
 
-async def gps_handler(drain):
+async def gps_handler(drain, args):
+    track = GpsTrack(
+        "Track", args.track_tolerance, args.track_segment, args.track_segments
+    )
     while True:
         msg = await drain.get_latest()
-        thread = threading.Thread(target=gps_worker, args=[msg])
+        thread = threading.Thread(target=gps_worker, args=[msg, track])
         thread.start()
 
         while thread.is_alive():
@@ -49,22 +66,16 @@ async def gps_handler(drain):
 async def main_async(args):
     # Setup rerun
     args.memory_limit = 10
-    rr.script_setup(args, "gps")
+    setup_sink(args, "gps")
 
-    # Zenoh config
-    config = zenoh.Config()
-    config.insert_json5("scouting/multicast/interface", "'lo'")
-    if args.remote:
-        config.insert_json5("mode", "'client'")
-        config.insert_json5("connect", f'{{"endpoints": ["{args.remote}"]}}')
-    session = zenoh.open(config)
+    session = open_session(args)
 
     # Create drains
     loop = asyncio.get_running_loop()
     drain = MessageDrain(loop)
 
-    session.declare_subscriber("rt/gps", drain.callback)
-    await asyncio.gather((gps_handler(drain)))
+    declare_subscriber(session, "rt/gps", drain.callback)
+    await asyncio.gather((gps_handler(drain, args)))
 
     while True:
         asyncio.sleep(0.001)
@@ -72,14 +83,9 @@ async def main_async(args):
 
 def main():
     parser = ArgumentParser(description="EdgeFirst Samples - GPS")
-    parser.add_argument(
-        "-r",
-        "--remote",
-        type=str,
-        default=None,
-        help="Connect to the remote endpoint instead of local.",
-    )
-    rr.script_add_args(parser)
+    add_session_args(parser)
+    add_track_args(parser)
+    add_sink_args(parser)
     args = parser.parse_args()
 
     try:
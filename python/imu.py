@@ -1,8 +1,8 @@
 # SPDX-License-Identifier: Apache-2.0
 # Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
 
+import numpy as np
 import rerun as rr
-import zenoh
 import sys
 import asyncio
 import time
@@ -10,6 +10,17 @@ from argparse import ArgumentParser
 from edgefirst.schemas.sensor_msgs import Imu
 from rerun.datatypes import Quaternion
 import threading
+from edgefirst_samples import (
+    add_session_args,
+    add_sink_args,
+    declare_subscriber,
+    log,
+    open_session,
+    payload_bytes,
+    setup_sink,
+    stage_timer,
+)
+from edgefirst_samples.sink import SENSOR_TIMELINE, send_columns
 
 
 class MessageDrain:
@@ -32,14 +43,97 @@ class MessageDrain:
 
 
 def imu_worker(msg):
-    imu = Imu.deserialize(msg.payload.to_bytes())
+    timer = stage_timer(msg)
+    imu = Imu.deserialize(payload_bytes(msg))
+    timer.lap("deserialize")
     x = imu.orientation.x
     y = imu.orientation.y
     z = imu.orientation.z
     w = imu.orientation.w
-    rr.log(
-        "/imu", rr.Transform3D(clear=False, quaternion=Quaternion(xyzw=[x, y, z, w]))
-    )
+    log("/imu", rr.Transform3D(clear=False, quaternion=Quaternion(xyzw=[x, y, z, w])))
+
+
+class ImuColumns:
+    """Preallocated column buffers holding a batch of IMU samples."""
+
+    def __init__(self, capacity):
+        self.stamps = np.zeros(capacity, dtype=np.int64)
+        self.orientation = np.zeros((capacity, 4), dtype=np.float64)
+        self.angular_velocity = np.zeros((capacity, 3), dtype=np.float64)
+        self.linear_acceleration = np.zeros((capacity, 3), dtype=np.float64)
+        self.size = 0
+
+    def full(self):
+        return self.size == len(self.stamps)
+
+    def append(self, imu):
+        i = self.size
+        stamp = imu.header.stamp
+        self.stamps[i] = stamp.sec * 1_000_000_000 + stamp.nanosec
+        q, w, a = imu.orientation, imu.angular_velocity, imu.linear_acceleration
+        self.orientation[i] = (q.x, q.y, q.z, q.w)
+        self.angular_velocity[i] = (w.x, w.y, w.z)
+        self.linear_acceleration[i] = (a.x, a.y, a.z)
+        self.size += 1
+
+    def send(self):
+        n = self.size
+        times = [
+            rr.TimeColumn(SENSOR_TIMELINE, timestamp=self.stamps[:n].view("M8[ns]"))
+        ]
+        send_columns(
+            "/imu", times, rr.Transform3D.columns(quaternion=self.orientation[:n])
+        )
+        send_columns(
+            "/imu/angular_velocity",
+            times,
+            rr.Scalars.columns(scalars=self.angular_velocity[:n]),
+        )
+        send_columns(
+            "/imu/linear_acceleration",
+            times,
+            rr.Scalars.columns(scalars=self.linear_acceleration[:n]),
+        )
+        self.size = 0
+
+
+class ImuBatcher:
+    """Accumulates every IMU sample and sends them to Rerun as columns.
+
+    Samples are appended from the Zenoh callback into one of two column buffers
+    while the other one is being sent, so no sample is dropped and nothing is
+    allocated per message.
+    """
+
+    def __init__(self, capacity):
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._filling = ImuColumns(capacity)
+        self._sending = ImuColumns(capacity)
+
+    def callback(self, msg):
+        timer = stage_timer(msg)
+        imu = Imu.deserialize(payload_bytes(msg))
+        timer.lap("deserialize")
+        with self._lock:
+            self._filling.append(imu)
+            full = self._filling.full()
+        timer.lap("convert")
+        if full:
+            self.flush()
+
+    def flush(self):
+        with self._send_lock:
+            with self._lock:
+                self._filling, self._sending = self._sending, self._filling
+            if self._sending.size:
+                self._sending.send()
+
+
+async def imu_batch_handler(batcher, rate):
+    while True:
+        await asyncio.sleep(1.0 / rate)
+        await asyncio.to_thread(batcher.flush)
 
 
 async def imu_handler(drain):
@@ -56,25 +150,24 @@ async def imu_handler(drain):
 async def main_async(args):
     # Setup rerun
     args.memory_limit = 10
-    rr.script_setup(args, "imu")
+    setup_sink(args, "imu")
 
-    # Zenoh config
-    config = zenoh.Config()
-    config.insert_json5("scouting/multicast/interface", "'lo'")
-    if args.remote:
-        config.insert_json5("mode", "'client'")
-        config.insert_json5("connect", f'{{"endpoints": ["{args.remote}"]}}')
-    session = zenoh.open(config)
+    session = open_session(args)
 
     # Create drains
     loop = asyncio.get_running_loop()
     drain = MessageDrain(loop)
 
-    rr.log("/imu", rr.Boxes3D(half_sizes=[[0.5, 0.5, 0.5]], fill_mode="solid"))
-    rr.log("/imu", rr.Transform3D(axis_length=2))
+    log("/imu", rr.Boxes3D(half_sizes=[[0.5, 0.5, 0.5]], fill_mode="solid"))
+    log("/imu", rr.Transform3D(axis_length=2))
 
-    session.declare_subscriber("rt/imu", drain.callback)
-    await asyncio.gather((imu_handler(drain)))
+    if args.batch:
+        batcher = ImuBatcher(args.capacity)
+        declare_subscriber(session, "rt/imu", batcher.callback)
+        await asyncio.gather(imu_batch_handler(batcher, args.flush_rate))
+    else:
+        declare_subscriber(session, "rt/imu", drain.callback)
+        await asyncio.gather((imu_handler(drain)))
 
     while True:
         asyncio.sleep(0.001)
@@ -82,14 +175,25 @@ async def main_async(args):
 
 def main():
     parser = ArgumentParser(description="EdgeFirst Samples - IMU")
+    add_session_args(parser)
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Keep every IMU sample and log them in batches with send_columns.",
+    )
+    parser.add_argument(
+        "--flush-rate",
+        type=float,
+        default=10.0,
+        help="Rate in Hz at which batched IMU samples are sent to Rerun.",
+    )
     parser.add_argument(
-        "-r",
-        "--remote",
-        type=str,
-        default=None,
-        help="Connect to the remote endpoint instead of local.",
+        "--capacity",
+        type=int,
+        default=1024,
+        help="Samples per batch buffer, a full buffer is sent immediately.",
     )
-    rr.script_add_args(parser)
+    add_sink_args(parser)
     args = parser.parse_args()
 
     try:
@@ -2,14 +2,27 @@
 # Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
 
 import rerun as rr
-import zenoh
 from argparse import ArgumentParser
 from edgefirst.schemas import turbo_colormap, colormap, decode_pcd
 from edgefirst.schemas.sensor_msgs import PointCloud2
 import asyncio
 import time
 import sys
-import threading
+import os
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from edgefirst_samples import (  # noqa: E402
+    add_session_args,
+    add_sink_args,
+    add_workers_arg,
+    declare_subscriber,
+    log,
+    open_session,
+    payload_bytes,
+    run_workers,
+    setup_sink,
+    stage_timer,
+)
 
 
 class MessageDrain:
@@ -32,48 +45,38 @@ class MessageDrain:
 
 
 def clusters_worker(msg):
-    pcd = PointCloud2.deserialize(msg.payload.to_bytes())
+    timer = stage_timer(msg)
+    pcd = PointCloud2.deserialize(payload_bytes(msg))
+    timer.lap("deserialize")
     points = decode_pcd(pcd)
+    timer.lap("decode")
     clusters = [p for p in points if p.cluster_id > 0]
     if not clusters:
-        rr.log("lidar/clusters", rr.Points3D([], colors=[]))
+        log("lidar/clusters", rr.Points3D([], colors=[]))
         return
     max_id = max(p.cluster_id for p in clusters)
     pos = [[p.x, p.y, p.z] for p in clusters]
     colors = [colormap(turbo_colormap, p.cluster_id / max_id) for p in clusters]
-    rr.log("lidar/clusters", rr.Points3D(pos, colors=colors))
+    log("lidar/clusters", rr.Points3D(pos, colors=colors))
 
 
-async def clusters_handler(drain):
-    while True:
-        msg = await drain.get_latest()
-        thread = threading.Thread(target=clusters_worker, args=[msg])
-        thread.start()
-
-        while thread.is_alive():
-            await asyncio.sleep(0.001)
-        thread.join()
+async def clusters_handler(drain, workers):
+    await run_workers(drain, clusters_worker, workers)
 
 
 async def main_async(args):
     # Setup rerun
     args.memory_limit = 10
-    rr.script_setup(args, "lidar/clusters")
+    setup_sink(args, "lidar/clusters")
 
-    # Zenoh config
-    config = zenoh.Config()
-    config.insert_json5("scouting/multicast/interface", "'lo'")
-    if args.remote:
-        config.insert_json5("mode", "'client'")
-        config.insert_json5("connect", f'{{"endpoints": ["{args.remote}"]}}')
-    session = zenoh.open(config)
+    session = open_session(args)
 
     # Create drains
     loop = asyncio.get_running_loop()
     drain = MessageDrain(loop)
 
-    session.declare_subscriber("rt/lidar/clusters", drain.callback)
-    await asyncio.gather((clusters_handler(drain)))
+    declare_subscriber(session, "rt/lidar/clusters", drain.callback)
+    await asyncio.gather((clusters_handler(drain, args.workers)))
 
     while True:
         asyncio.sleep(0.001)
@@ -81,14 +84,9 @@ async def main_async(args):
 
 def main():
     parser = ArgumentParser(description="EdgeFirst Samples - Lidar Clusters")
-    parser.add_argument(
-        "-r",
-        "--remote",
-        type=str,
-        default=None,
-        help="Connect to the remote endpoint instead of local.",
-    )
-    rr.script_add_args(parser)
+    add_session_args(parser)
+    add_sink_args(parser)
+    add_workers_arg(parser)
     args = parser.parse_args()
 
     try:
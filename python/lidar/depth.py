@@ -2,15 +2,28 @@
 # Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
 
 from argparse import ArgumentParser
-from edgefirst.schemas.sensor_msgs import Image
+from edgefirst.schemas import turbo_colormap
+from functools import lru_cache
 import numpy as np
 import rerun as rr
-import struct
-import zenoh
 import asyncio
 import time
 import sys
 import threading
+import os
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from edgefirst_samples import (  # noqa: E402
+    add_session_args,
+    add_sink_args,
+    declare_subscriber,
+    log,
+    open_session,
+    payload_bytes,
+    setup_sink,
+    stage_timer,
+)
+from edgefirst_samples.cdr import decode_image  # noqa: E402
 
 
 class MessageDrain:
@@ -32,27 +45,119 @@ class MessageDrain:
         return latest
 
 
-def depth_worker(msg):
-    depth = Image.deserialize(msg.payload.to_bytes())
+def depth_lut(max_range, scale):
+    """Maps every 16-bit depth value to a turbo color up to max_range meters."""
+    turbo = (np.asarray(turbo_colormap) * 255).astype(np.uint8)
+    index = np.arange(65536) * (255.0 / (max_range * scale))
+    return turbo[np.clip(index, 0, 255).astype(np.uint8)]
+
+
+class ReflectStorage:
+    def __init__(self):
+        self._image = None
+
+    def set(self, image):
+        self._image = image
+
+    def get(self):
+        return self._image
+
+
+def beams_error(beams, height):
+    return "--beams lists %d elevations but the depth images have %d rows" % (
+        len(beams),
+        height,
+    )
+
+
+@lru_cache(maxsize=4)
+def ray_table(height, width, hfov, vfov, beams=None):
+    """Unit ray of every pixel for the given image shape and beam configuration.
+
+    Columns sweep the horizontal field of view from left to right and rows the
+    vertical field of view (or the listed beam elevations) from top to bottom,
+    in the lidar frame where x is forward, y is left, and z is up. Raises
+    ValueError when beams does not list one elevation per row.
+    """
+    if beams:
+        if len(beams) != height:
+            raise ValueError(beams_error(beams, height))
+        elevation = np.deg2rad(np.asarray(beams, dtype=np.float32))
+    else:
+        elevation = np.deg2rad(np.linspace(vfov / 2, -vfov / 2, height))
+    azimuth = np.deg2rad(np.linspace(hfov / 2, -hfov / 2, width, endpoint=hfov < 360))
+    rays = np.empty((height, width, 3), dtype=np.float32)
+    rays[..., 0] = np.cos(elevation)[:, None] * np.cos(azimuth)[None, :]
+    rays[..., 1] = np.cos(elevation)[:, None] * np.sin(azimuth)[None, :]
+    rays[..., 2] = np.sin(elevation)[:, None]
+    return rays
+
+
+def back_project(data, args, reflect):
+    rays = ray_table(
+        data.shape[0],
+        data.shape[1],
+        args.hfov,
+        args.vfov,
+        tuple(args.beams) if args.beams else None,
+    )
+    valid = data > 0
+    points = rays[valid] * (data[valid] * (1.0 / args.depth_scale))[:, None]
+    colors = None
+    if reflect is not None and reflect.shape == data.shape:
+        colors = np.repeat(reflect[valid][:, None], 3, axis=1)
+    log("lidar/cloud", rr.Points3D(points, colors=colors))
+
+
+def depth_worker(msg, args, lut, reflect_storage):
+    timer = stage_timer(msg)
+    depth = decode_image(payload_bytes(msg))
+    timer.lap("deserialize")
 
     # Process depth image
     if depth.encoding != "mono16":
         print("Depth encoding is not mono16")
         return
-    endian_format = ">" if depth.is_bigendian else "<"
-    depth_vals = list(
-        struct.unpack(f"{endian_format}{depth.width*depth.height}H", bytes(depth.data))
-    )
-    data = (np.array(depth_vals).reshape((depth.height, depth.width)) / 255).astype(
-        np.uint8
-    )
-    rr.log("lidar/depth", rr.Image(data))
+    dtype = ">u2" if depth.is_bigendian else "<u2"
+    data = np.frombuffer(depth.data, dtype=dtype).reshape(depth.height, -1)
+    # Native byte order is required by Rerun, this is a no-op on little-endian.
+    data = data[:, : depth.width].astype(np.uint16, copy=False)
+    timer.lap("decode")
+    log("lidar/depth", rr.DepthImage(data, meter=args.depth_scale))
+    if lut is not None:
+        log("lidar/depth/preview", rr.Image(lut[data]))
+    if args.points:
+        back_project(data, args, reflect_storage.get())
+
+
+def reflect_worker(msg, reflect_storage):
+    timer = stage_timer(msg)
+    reflect = decode_image(payload_bytes(msg))
+    timer.lap("deserialize")
+    if reflect.encoding != "mono8":
+        return
+    data = np.frombuffer(reflect.data, dtype=np.uint8).reshape(reflect.height, -1)
+    reflect_storage.set(data[:, : reflect.width])
+
 
+async def depth_handler(drain, args, reflect_storage):
+    lut = depth_lut(args.max_range, args.depth_scale) if args.preview else None
+    while True:
+        msg = await drain.get_latest()
+        thread = threading.Thread(
+            target=depth_worker, args=[msg, args, lut, reflect_storage]
+        )
+        thread.start()
 
-async def depth_handler(drain):
+        while thread.is_alive():
+            await asyncio.sleep(0.001)
+        thread.join()
+
+
+async def reflect_handler(drain, reflect_storage):
     while True:
         msg = await drain.get_latest()
-        thread = threading.Thread(target=depth_worker, args=[msg])
+        thread = threading.Thread(target=reflect_worker, args=[msg, reflect_storage])
         thread.start()
 
         while thread.is_alive():
@@ -63,22 +168,29 @@ async def depth_handler(drain):
 async def main_async(args):
     # Setup rerun
     args.memory_limit = 10
-    rr.script_setup(args, "lidar/depth")
+    setup_sink(args, "lidar/depth")
 
-    # Zenoh config
-    config = zenoh.Config()
-    config.insert_json5("scouting/multicast/interface", "'lo'")
-    if args.remote:
-        config.insert_json5("mode", "'client'")
-        config.insert_json5("connect", f'{{"endpoints": ["{args.remote}"]}}')
-    session = zenoh.open(config)
+    session = open_session(args)
 
     # Create drains
     loop = asyncio.get_running_loop()
     drain = MessageDrain(loop)
+    reflect_drain = MessageDrain(loop)
+    reflect_storage = ReflectStorage()
 
-    session.declare_subscriber("rt/lidar/depth", drain.callback)
-    await asyncio.gather((depth_handler(drain)))
+    declare_subscriber(session, "rt/lidar/depth", drain.callback)
+    if args.points and args.beams:
+        # The image height is only known once the first image arrives.
+        msg = await drain.read()
+        height = decode_image(msg.payload.to_bytes()).height
+        if len(args.beams) != height:
+            session.close()
+            return beams_error(args.beams, height)
+    handlers = [depth_handler(drain, args, reflect_storage)]
+    if args.points and args.reflect:
+        declare_subscriber(session, "rt/lidar/reflect", reflect_drain.callback)
+        handlers.append(reflect_handler(reflect_drain, reflect_storage))
+    await asyncio.gather(*handlers)
 
     while True:
         asyncio.sleep(0.001)
@@ -86,20 +198,63 @@ async def main_async(args):
 
 def main():
     parser = ArgumentParser(description="EdgeFirst Samples - Lidar Depth")
+    add_session_args(parser)
+    parser.add_argument(
+        "--depth-scale",
+        type=float,
+        default=1000.0,
+        help="Depth image units per meter.",
+    )
+    parser.add_argument(
+        "--preview",
+        action="store_true",
+        help="Also log a colorized preview of the depth image.",
+    )
+    parser.add_argument(
+        "--max-range",
+        type=float,
+        default=50.0,
+        help="Range in meters mapped to the end of the preview colormap.",
+    )
+    parser.add_argument(
+        "--points",
+        action="store_true",
+        help="Back-project the depth image into a 3D point cloud.",
+    )
+    parser.add_argument(
+        "--reflect",
+        action="store_true",
+        help="Color the back-projected points using rt/lidar/reflect.",
+    )
+    parser.add_argument(
+        "--hfov",
+        type=float,
+        default=360.0,
+        help="Horizontal field of view in degrees covered by the image columns.",
+    )
+    parser.add_argument(
+        "--vfov",
+        type=float,
+        default=45.0,
+        help="Vertical field of view in degrees covered by the image rows.",
+    )
     parser.add_argument(
-        "-r",
-        "--remote",
-        type=str,
+        "--beams",
+        type=float,
+        nargs="+",
         default=None,
-        help="Connect to the remote endpoint instead of local.",
+        help="Elevation in degrees of each image row, top to bottom, for lidars "
+        "with non-uniform beam spacing (overrides --vfov).",
     )
-    rr.script_add_args(parser)
+    add_sink_args(parser)
     args = parser.parse_args()
 
     try:
-        asyncio.run(main_async(args))
+        error = asyncio.run(main_async(args))
     except KeyboardInterrupt:
         sys.exit(0)
+    if error is not None:
+        parser.error(error)
 
 
 if __name__ == "__main__":
@@ -2,14 +2,27 @@
 # Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
 
 import rerun as rr
-import zenoh
 import sys
 import asyncio
 import time
 from argparse import ArgumentParser
-from edgefirst.schemas import decode_pcd
-from edgefirst.schemas.sensor_msgs import PointCloud2
-import threading
+import numpy as np
+import os
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from edgefirst_samples import (  # noqa: E402
+    add_session_args,
+    add_sink_args,
+    add_workers_arg,
+    declare_subscriber,
+    log,
+    open_session,
+    payload_bytes,
+    run_workers,
+    setup_sink,
+    stage_timer,
+)
+from edgefirst_samples.cdr import decode_point_cloud, point_array  # noqa: E402
 
 
 class MessageDrain:
@@ -32,42 +45,32 @@ class MessageDrain:
 
 
 def points_worker(msg):
-    pcd = PointCloud2.deserialize(msg.payload.to_bytes())
-    points = decode_pcd(pcd)
-    pos = [[p.x, p.y, p.z] for p in points]
-    rr.log("lidar/points", rr.Points3D(pos))
+    timer = stage_timer(msg)
+    pcd = decode_point_cloud(payload_bytes(msg))
+    timer.lap("deserialize")
+    points = point_array(pcd)
+    timer.lap("decode")
+    pos = np.column_stack((points["x"], points["y"], points["z"]))
+    log("lidar/points", rr.Points3D(pos))
 
 
-async def points_handler(drain):
-    while True:
-        msg = await drain.get_latest()
-        thread = threading.Thread(target=points_worker, args=[msg])
-        thread.start()
-
-        while thread.is_alive():
-            await asyncio.sleep(0.001)
-        thread.join()
+async def points_handler(drain, workers):
+    await run_workers(drain, points_worker, workers)
 
 
 async def main_async(args):
     # Setup rerun
     args.memory_limit = 10
-    rr.script_setup(args, "lidar/points")
+    setup_sink(args, "lidar/points")
 
-    # Zenoh config
-    config = zenoh.Config()
-    config.insert_json5("scouting/multicast/interface", "'lo'")
-    if args.remote:
-        config.insert_json5("mode", "'client'")
-        config.insert_json5("connect", f'{{"endpoints": ["{args.remote}"]}}')
-    session = zenoh.open(config)
+    session = open_session(args)
 
     # Create drains
     loop = asyncio.get_running_loop()
     drain = MessageDrain(loop)
 
-    session.declare_subscriber("rt/lidar/points", drain.callback)
-    await asyncio.gather((points_handler(drain)))
+    declare_subscriber(session, "rt/lidar/points", drain.callback)
+    await asyncio.gather((points_handler(drain, args.workers)))
 
     while True:
         asyncio.sleep(0.001)
@@ -75,14 +78,9 @@ async def main_async(args):
 
 def main():
     parser = ArgumentParser(description="EdgeFirst Samples - Lidar Points")
-    parser.add_argument(
-        "-r",
-        "--remote",
-        type=str,
-        default=None,
-        help="Connect to the remote endpoint instead of local.",
-    )
-    rr.script_add_args(parser)
+    add_session_args(parser)
+    add_sink_args(parser)
+    add_workers_arg(parser)
     args = parser.parse_args()
 
     try:
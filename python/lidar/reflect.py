@@ -3,13 +3,25 @@
 
 import numpy as np
 import rerun as rr
-import zenoh
 import sys
 import asyncio
 import time
 from argparse import ArgumentParser
-from edgefirst.schemas.sensor_msgs import Image
 import threading
+import os
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from edgefirst_samples import (  # noqa: E402
+    add_session_args,
+    add_sink_args,
+    declare_subscriber,
+    log,
+    open_session,
+    payload_bytes,
+    setup_sink,
+    stage_timer,
+)
+from edgefirst_samples.cdr import decode_image  # noqa: E402
 
 
 class MessageDrain:
@@ -32,17 +44,17 @@ class MessageDrain:
 
 
 def reflect_worker(msg):
-    reflect = Image.deserialize(msg.payload.to_bytes())
+    timer = stage_timer(msg)
+    reflect = decode_image(payload_bytes(msg))
+    timer.lap("deserialize")
 
     # Process reflect image
     if reflect.encoding != "mono8":
         print("Reflect encoding is not mono8")
         return
 
-    data = (
-        np.array(reflect.data).reshape((reflect.height, reflect.width)).astype(np.uint8)
-    )
-    rr.log("lidar/depth", rr.Image(data))
+    data = np.frombuffer(reflect.data, dtype=np.uint8).reshape(reflect.height, -1)
+    log("lidar/reflect", rr.Image(data[:, : reflect.width]))
 
 
 async def reflect_handler(drain):
@@ -59,21 +71,15 @@ async def reflect_handler(drain):
 async def main_async(args):
     # Setup rerun
     args.memory_limit = 10
-    rr.script_setup(args, "lidar/reflect")
+    setup_sink(args, "lidar/reflect")
 
-    # Zenoh config
-    config = zenoh.Config()
-    config.insert_json5("scouting/multicast/interface", "'lo'")
-    if args.remote:
-        config.insert_json5("mode", "'client'")
-        config.insert_json5("connect", f'{{"endpoints": ["{args.remote}"]}}')
-    session = zenoh.open(config)
+    session = open_session(args)
 
     # Create drains
     loop = asyncio.get_running_loop()
     drain = MessageDrain(loop)
 
-    session.declare_subscriber("rt/lidar/reflect", drain.callback)
+    declare_subscriber(session, "rt/lidar/reflect", drain.callback)
     await asyncio.gather((reflect_handler(drain)))
 
     while True:
@@ -82,14 +88,8 @@ async def main_async(args):
 
 def main():
     parser = ArgumentParser(description="EdgeFirst Samples - Lidar Reflect")
-    parser.add_argument(
-        "-r",
-        "--remote",
-        type=str,
-        default=None,
-        help="Connect to the remote endpoint instead of local.",
-    )
-    rr.script_add_args(parser)
+    add_session_args(parser)
+    add_sink_args(parser)
     args = parser.parse_args()
 
     try:
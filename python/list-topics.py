@@ -2,10 +2,74 @@
 # Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
 
 from argparse import ArgumentParser
-from time import time
+import os
+import sys
+import time
 
 import zenoh
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from edgefirst_samples import add_shm_arg, discover_topics, zenoh_config  # noqa: E402
+from edgefirst_samples.stats import TopicWindow  # noqa: E402
+
+
+def format_bytes(size):
+    for unit in ["B", "KB", "MB"]:
+        if size < 1000:
+            return "%.1f %s" % (size, unit)
+        size /= 1000
+    return "%.1f GB" % size
+
+
+def print_stats(windows):
+    print(
+        "%-28s %9s %10s %10s %10s %12s"
+        % ("topic", "rate Hz", "jitter ms", "mean size", "max size", "bandwidth")
+    )
+    for topic, window in sorted(windows.items()):
+        stats = window.summary()
+        if stats is None:
+            continue
+        print(
+            "%-28s %9.2f %10.2f %10s %10s %10s/s"
+            % (
+                topic,
+                stats["rate"],
+                stats["jitter"] * 1e3,
+                format_bytes(stats["mean_size"]),
+                format_bytes(stats["max_size"]),
+                format_bytes(stats["bandwidth"]),
+            )
+        )
+    print()
+
+
+def topic_stats(session, args):
+    """Prints the rate, jitter, sizes and bandwidth of every topic each second.
+
+    Only the payload length of each message is read, the payloads are never
+    deserialized.
+    """
+    windows = {}
+
+    def callback(msg):
+        topic = str(msg.key_expr)
+        window = windows.get(topic)
+        if window is None:
+            window = windows.setdefault(topic, TopicWindow(args.window))
+        window.add(len(msg.payload))
+
+    subscriber = session.declare_subscriber("rt/**", callback)
+    start = time.monotonic()
+    try:
+        while args.time is None or time.monotonic() - start < args.time:
+            time.sleep(args.interval)
+            print_stats(windows)
+    except KeyboardInterrupt:
+        pass
+    subscriber.undeclare()
+
+
 if __name__ == "__main__":
     args = ArgumentParser(description="EdgeFirst Samples - List Topics")
     args.add_argument(
@@ -15,6 +79,7 @@ if __name__ == "__main__":
         default=None,
         help="Connect to the remote endpoint instead of local.",
     )
+    add_shm_arg(args)
     args.add_argument(
         "-t",
         "--time",
@@ -22,36 +87,50 @@ if __name__ == "__main__":
         default=None,
         help="Time in seconds to run command before exiting.",
     )
+    args.add_argument(
+        "-s",
+        "--stats",
+        action="store_true",
+        help="Continuously print the rate, jitter, message sizes, and bandwidth "
+        "of every topic.",
+    )
+    args.add_argument(
+        "--window",
+        type=float,
+        default=5.0,
+        help="Sliding window in seconds of the --stats figures.",
+    )
+    args.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        help="Seconds between --stats reports.",
+    )
     args = args.parse_args()
 
     # Create the default Zenoh configuration and if the remote argument is
     # provided set the mode to client and add the target to the endpoints.
-    config = zenoh.Config()
-    config.insert_json5("scouting/multicast/interface", "'lo'")
-    if args.remote is not None:
-        config.insert_json5("mode", "'client'")
-        config.insert_json5("connect", '{"endpoints": ["%s"]}' % args.remote)
-    session = zenoh.open(config)
-
-    # Create a subscriber for all topics matching the pattern "rt/**"
-    subscriber = session.declare_subscriber("rt/**")
-
-    # Keep a list of discovered topics to avoid noise from duplicates
-    topics = set()
-    start = time()
-
-    while True:
-        if args.time is not None and time() - start >= args.time:
-            break
-        msg = subscriber.recv()
-
-        # Ignore message if the topic is known otherwise save the topic
-        topic = str(msg.key_expr)
-        if topic in topics:
-            continue
-        topics.add(topic)
+    session = zenoh.open(zenoh_config(args))
 
-        # Capture the message encoding MIME type then split on the first ';'
-        # to get the schema.
-        schema = str(msg.encoding).split(";", maxsplit=1)[-1]
-        print("topic: %s → %s" % (topic, schema))
+    if args.stats:
+        topic_stats(session, args)
+    else:
+        # Topics announced with liveliness tokens are listed without receiving
+        # any payload, with the schema carried by the token or else read from
+        # one message. Otherwise listen to "rt/**" until Ctrl+C or for --time,
+        # so slow topics such as the info topics are listed too. Duplicates
+        # are ignored and the schema is the part of the message encoding
+        # after the first ';'.
+        try:
+            discover_topics(
+                session,
+                "rt/**",
+                timeout=args.time,
+                quiet=None,
+                on_topic=lambda topic, schema: print(
+                    "topic: %s → %s" % (topic, schema)
+                ),
+            )
+        except KeyboardInterrupt:
+            pass
+    session.close()
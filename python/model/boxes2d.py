@@ -1,7 +1,6 @@
 # SPDX-License-Identifier: Apache-2.0
 # Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
 
-import zenoh
 from edgefirst.schemas.edgefirst_msgs import Detect
 from argparse import ArgumentParser
 import sys
@@ -9,6 +8,19 @@ import rerun as rr
 import asyncio
 import time
 import threading
+import os
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from edgefirst_samples import (  # noqa: E402
+    add_session_args,
+    add_sink_args,
+    declare_subscriber,
+    log,
+    open_session,
+    payload_bytes,
+    setup_sink,
+    stage_timer,
+)
 
 
 class MessageDrain:
@@ -31,7 +43,9 @@ class MessageDrain:
 
 
 def boxes2d_worker(msg):
-    detection = Detect.deserialize(msg.payload.to_bytes())
+    timer = stage_timer(msg)
+    detection = Detect.deserialize(payload_bytes(msg))
+    timer.lap("deserialize")
     centers = []
     sizes = []
     labels = []
@@ -39,7 +53,7 @@ def boxes2d_worker(msg):
         centers.append((box.center_x, box.center_y))
         sizes.append((box.width, box.height))
         labels.append(box.label)
-    rr.log("boxes", rr.Boxes2D(centers=centers, sizes=sizes, labels=labels))
+    log("boxes", rr.Boxes2D(centers=centers, sizes=sizes, labels=labels))
 
 
 async def boxes2d_handler(drain):
@@ -56,21 +70,15 @@ async def boxes2d_handler(drain):
 async def main_async(args):
     # Setup rerun
     args.memory_limit = 10
-    rr.script_setup(args, "model-boxes2d")
+    setup_sink(args, "model-boxes2d")
 
-    # Zenoh config
-    config = zenoh.Config()
-    config.insert_json5("scouting/multicast/interface", "'lo'")
-    if args.remote:
-        config.insert_json5("mode", "'client'")
-        config.insert_json5("connect", f'{{"endpoints": ["{args.remote}"]}}')
-    session = zenoh.open(config)
+    session = open_session(args)
 
     # Create drains
     loop = asyncio.get_running_loop()
     drain = MessageDrain(loop)
 
-    session.declare_subscriber("rt/model/boxes2d", drain.callback)
+    declare_subscriber(session, "rt/model/boxes2d", drain.callback)
     await asyncio.gather((boxes2d_handler(drain)))
 
     while True:
@@ -79,14 +87,8 @@ async def main_async(args):
 
 def main():
     parser = ArgumentParser(description="EdgeFirst Samples - Boxes2D")
-    parser.add_argument(
-        "-r",
-        "--remote",
-        type=str,
-        default=None,
-        help="Connect to the remote endpoint instead of local.",
-    )
-    rr.script_add_args(parser)
+    add_session_args(parser)
+    add_sink_args(parser)
     args = parser.parse_args()
 
     try:
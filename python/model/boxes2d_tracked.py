@@ -1,7 +1,6 @@
 # SPDX-License-Identifier: Apache-2.0
 # Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
 
-import zenoh
 from edgefirst.schemas.edgefirst_msgs import Detect
 from argparse import ArgumentParser
 import sys
@@ -10,6 +9,19 @@ import asyncio
 import time
 import numpy as np
 import threading
+import os
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from edgefirst_samples import (  # noqa: E402
+    add_session_args,
+    add_sink_args,
+    declare_subscriber,
+    log,
+    open_session,
+    payload_bytes,
+    setup_sink,
+    stage_timer,
+)
 
 
 class MessageDrain:
@@ -32,7 +44,9 @@ class MessageDrain:
 
 
 def boxes2d_worker(msg, boxes_tracked):
-    detection = Detect.deserialize(msg.payload.to_bytes())
+    timer = stage_timer(msg)
+    detection = Detect.deserialize(payload_bytes(msg))
+    timer.lap("deserialize")
     centers = []
     sizes = []
     labels = []
@@ -51,9 +65,7 @@ def boxes2d_worker(msg, boxes_tracked):
             labels.append(box.label)
         centers.append((box.center_x, box.center_y))
         sizes.append((box.width, box.height))
-    rr.log(
-        "boxes", rr.Boxes2D(centers=centers, sizes=sizes, labels=labels, colors=colors)
-    )
+    log("boxes", rr.Boxes2D(centers=centers, sizes=sizes, labels=labels, colors=colors))
 
 
 async def boxes2d_handler(drain):
@@ -72,21 +84,15 @@ async def boxes2d_handler(drain):
 async def main_async(args):
     # Setup rerun
     args.memory_limit = 10
-    rr.script_setup(args, "model-boxes2d")
+    setup_sink(args, "model-boxes2d")
 
-    # Zenoh config
-    config = zenoh.Config()
-    config.insert_json5("scouting/multicast/interface", "'lo'")
-    if args.remote:
-        config.insert_json5("mode", "'client'")
-        config.insert_json5("connect", f'{{"endpoints": ["{args.remote}"]}}')
-    session = zenoh.open(config)
+    session = open_session(args)
 
     # Create drains
     loop = asyncio.get_running_loop()
     drain = MessageDrain(loop)
 
-    session.declare_subscriber("rt/model/boxes2d", drain.callback)
+    declare_subscriber(session, "rt/model/boxes2d", drain.callback)
     await asyncio.gather((boxes2d_handler(drain)))
 
     while True:
@@ -95,14 +101,8 @@ async def main_async(args):
 
 def main():
     parser = ArgumentParser(description="EdgeFirst Samples - Boxes2D Tracked")
-    parser.add_argument(
-        "-r",
-        "--remote",
-        type=str,
-        default=None,
-        help="Connect to the remote endpoint instead of local.",
-    )
-    rr.script_add_args(parser)
+    add_session_args(parser)
+    add_sink_args(parser)
     args = parser.parse_args()
 
     try:
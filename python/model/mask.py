@@ -1,15 +1,28 @@
 # SPDX-License-Identifier: Apache-2.0
 # Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
 
-import zenoh
-from edgefirst.schemas.edgefirst_msgs import Mask
 from argparse import ArgumentParser
 import sys
 import rerun as rr
 import asyncio
 import time
-import threading
 import numpy as np
+import os
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from edgefirst_samples import (  # noqa: E402
+    add_session_args,
+    add_sink_args,
+    add_workers_arg,
+    declare_subscriber,
+    log,
+    open_session,
+    payload_bytes,
+    run_workers,
+    setup_sink,
+    stage_timer,
+)
+from edgefirst_samples.cdr import decode_mask  # noqa: E402
 
 
 class MessageDrain:
@@ -34,49 +47,38 @@ class MessageDrain:
 
 
 def mask_worker(msg):
-    mask = Mask.deserialize(msg.payload.to_bytes())
-    np_arr = np.asarray(mask.mask, dtype=np.uint8)
-    np_arr = np.reshape(np_arr, [mask.height, mask.width, -1])
+    timer = stage_timer(msg)
+    mask = decode_mask(payload_bytes(msg))
+    timer.lap("deserialize")
+    np_arr = mask.mask.reshape(mask.height, mask.width, -1)
+    timer.lap("decode")
     np_arr = np.argmax(np_arr, axis=2)
-    rr.log("mask", rr.SegmentationImage(np_arr))
+    log("mask", rr.SegmentationImage(np_arr))
 
 
-async def mask_handler(drain):
-    rr.log(
+async def mask_handler(drain, workers):
+    log(
         "/",
         rr.AnnotationContext(
             [(0, "background", (0, 0, 0)), (1, "person", (0, 255, 0))]
         ),
     )
-    while True:
-        msg = await drain.get_latest()
-        thread = threading.Thread(target=mask_worker, args=[msg])
-        thread.start()
-
-        while thread.is_alive():
-            await asyncio.sleep(0.001)
-        thread.join()
+    await run_workers(drain, mask_worker, workers)
 
 
 async def main_async(args):
     # Setup rerun
     args.memory_limit = 10
-    rr.script_setup(args, "model-mask")
+    setup_sink(args, "model-mask")
 
-    # Zenoh config
-    config = zenoh.Config()
-    config.insert_json5("scouting/multicast/interface", "'lo'")
-    if args.remote:
-        config.insert_json5("mode", "'client'")
-        config.insert_json5("connect", f'{{"endpoints": ["{args.remote}"]}}')
-    session = zenoh.open(config)
+    session = open_session(args)
 
     # Create drains
     loop = asyncio.get_running_loop()
     drain = MessageDrain(loop)
 
-    session.declare_subscriber("rt/model/mask", drain.callback)
-    await asyncio.gather((mask_handler(drain)))
+    declare_subscriber(session, "rt/model/mask", drain.callback)
+    await asyncio.gather((mask_handler(drain, args.workers)))
 
     while True:
         asyncio.sleep(0.001)
@@ -84,14 +86,9 @@ async def main_async(args):
 
 def main():
     parser = ArgumentParser(description="EdgeFirst Samples - Mask")
-    parser.add_argument(
-        "-r",
-        "--remote",
-        type=str,
-        default=None,
-        help="Connect to the remote endpoint instead of local.",
-    )
-    rr.script_add_args(parser)
+    add_session_args(parser)
+    add_sink_args(parser)
+    add_workers_arg(parser)
     args = parser.parse_args()
 
     try:
@@ -4,12 +4,28 @@
 from argparse import ArgumentParser
 import numpy as np
 import rerun as rr
-import zenoh
 import sys
 import asyncio
 import time
-from edgefirst.schemas.edgefirst_msgs import RadarCube
+from edgefirst.schemas import turbo_colormap
+from edgefirst.schemas.edgefirst_msgs import RadarChannel
+from functools import lru_cache
+from numpy.lib.stride_tricks import sliding_window_view
 import threading
+import os
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from edgefirst_samples import (  # noqa: E402
+    add_session_args,
+    add_sink_args,
+    declare_subscriber,
+    log,
+    open_session,
+    payload_bytes,
+    setup_sink,
+    stage_timer,
+)
+from edgefirst_samples.cdr import decode_radar_cube  # noqa: E402
 
 
 class MessageDrain:
@@ -31,18 +47,328 @@ class MessageDrain:
         return latest
 
 
-def cube_worker(msg):
-    radar_cube = RadarCube.deserialize(msg.payload.to_bytes())
-    data = np.array(radar_cube.cube).reshape(radar_cube.shape)
-    # Take the absolute value of the data to improve visualization.
-    data = np.abs(data)
-    rr.log("radar/cube", rr.Tensor(data, dim_names=["SEQ", "RANGE", "RX", "DOPPLER"]))
+class Waterfall:
+    """Fixed size history of per-frame profiles for a scrolling image.
+
+    Every row is written twice, half a buffer apart, so the most recent rows are
+    always available in order as a single contiguous view.  Writes are O(1) and
+    the buffer is never reallocated once the profile width is known.
+    """
+
+    def __init__(self, length):
+        self._length = length
+        self._buffer = None
+        self._index = 0
+        self.count = 0
+
+    def push(self, row):
+        if self._buffer is None or self._buffer.shape[1] != len(row):
+            self._buffer = np.zeros((2 * self._length, len(row)), dtype=np.float32)
+            self._index = 0
+        self._buffer[self._index] = row
+        self._buffer[self._index + self._length] = row
+        self._index = (self._index + 1) % self._length
+        self.count += 1
+
+    def view(self):
+        return self._buffer[self._index : self._index + self._length]
+
+
+# Dimension labels of RadarCube.layout.
+RANGE = RadarChannel.RANGE.value
+DOPPLER = RadarChannel.DOPPLER.value
+RXCHANNEL = RadarChannel.RXCHANNEL.value
+SEQUENCE = RadarChannel.SEQUENCE.value
+DIM_NAMES = {channel.value: channel.name for channel in RadarChannel}
+
+# Layout used by the radar service when the message does not provide one.
+DEFAULT_LAYOUT = [SEQUENCE, RANGE, RXCHANNEL, DOPPLER]
+
+# 8-bit turbo lookup table used to colorize the dB maps.
+TURBO_LUT = (np.asarray(turbo_colormap) * 255).astype(np.uint8)
+
+
+def cube_to_array(radar_cube):
+    """Returns the cube as an ndarray along with its dimension labels."""
+    layout = list(radar_cube.layout) or DEFAULT_LAYOUT
+    shape = list(radar_cube.shape)
+    data = np.asarray(radar_cube.cube, dtype=np.int16)
+    if radar_cube.is_complex:
+        # Interleaved [real, imag] int16 pairs become a single complex sample,
+        # the last dimension is reported doubled when it counts the pairs.
+        data = data.astype(np.float32).view(np.complex64)
+        if data.size != np.prod(shape):
+            shape[-1] //= 2
+    return data.reshape(shape), layout
+
+
+def power(data):
+    """Returns |x|^2 without taking the square root of each cell."""
+    if np.iscomplexobj(data):
+        return data.real * data.real + data.imag * data.imag
+    data = data.astype(np.float32)
+    return data * data
+
+
+@lru_cache(maxsize=8)
+def steering_matrix(n_rx, bins, fov):
+    """Precomputed steering vectors for a half-wavelength uniform linear array."""
+    theta = np.deg2rad(np.linspace(-fov / 2, fov / 2, bins))
+    k = np.arange(n_rx)
+    return np.exp(-1j * np.pi * np.outer(np.sin(theta), k)).astype(np.complex64)
+
+
+@lru_cache(maxsize=8)
+def fft_matrix(n_rx, bins):
+    """Weights of a zero-padded FFT across the RX channels, zero angle centred."""
+    k = np.arange(bins)
+    weights = np.exp(-2j * np.pi * np.outer(k, np.arange(n_rx)) / bins)
+    return np.fft.fftshift(weights, axes=0).astype(np.complex64)
+
+
+def range_doppler(data, layout):
+    """Non-coherent integration over the RX and SEQ (and any other) dimensions."""
+    axes = tuple(i for i, dim in enumerate(layout) if dim not in (RANGE, DOPPLER))
+    rd = power(data).sum(axis=axes)
+    kept = [dim for dim in layout if dim in (RANGE, DOPPLER)]
+    return rd.transpose(kept.index(RANGE), kept.index(DOPPLER))
+
+
+def range_profile(data, layout):
+    """Non-coherent integration of every dimension except range."""
+    axes = tuple(i for i, dim in enumerate(layout) if dim != RANGE)
+    return power(data).sum(axis=axes)
+
+
+def range_azimuth(data, layout, bins, fov, method):
+    """Beamforms across the RX channels then integrates the other dimensions.
+
+    The power of a beam with weights w summed over the other dimensions is
+    w R w^H, with R the RX covariance of each range bin. Reducing the cube to
+    R first leaves the beams a product of small matrices per range bin.
+    """
+    # Range first and the RX channels last, every other dimension between.
+    x = np.moveaxis(data, [layout.index(RANGE), layout.index(RXCHANNEL)], [0, -1])
+    x = x.reshape(x.shape[0], -1, x.shape[-1])
+    covariance = np.swapaxes(x, 1, 2) @ x.conj()
+    if method == "fft":
+        weights = fft_matrix(x.shape[-1], bins)
+    else:
+        weights = steering_matrix(x.shape[-1], bins, fov)
+    return np.einsum("bi,rij,bj->rb", weights, covariance, weights.conj()).real
+
+
+def db_image(pwr, db_range, db_max=None):
+    """Maps a power map to an 8-bit turbo image spanning db_range below the peak."""
+    db = 10.0 * np.log10(pwr + 1e-12)
+    top = db.max() if db_max is None else db_max
+    scaled = (db - (top - db_range)) * (255.0 / db_range)
+    return TURBO_LUT[np.clip(scaled, 0, 255).astype(np.uint8)]
+
+
+# Detections reported by the client-side CFAR.
+DETECTION_DTYPE = np.dtype(
+    [
+        ("range_bin", np.uint16),
+        ("doppler_bin", np.uint16),
+        ("range", np.float32),
+        ("doppler", np.float32),
+        ("power", np.float32),
+        ("snr", np.float32),
+    ]
+)
+
+
+def pad_map(pwr, pad):
+    """Pads a range-Doppler map, Doppler wraps around while range is mirrored."""
+    pwr = np.pad(pwr, ((pad[0], pad[0]), (0, 0)), mode="symmetric")
+    return np.pad(pwr, ((0, 0), (pad[1], pad[1])), mode="wrap")
+
+
+def box_sum(pwr, half):
+    """Sums every (2*half+1) window of the map using an integral image."""
+    w0, w1 = 2 * half[0] + 1, 2 * half[1] + 1
+    padded = pad_map(pwr, half)
+    integral = np.zeros((padded.shape[0] + 1, padded.shape[1] + 1))
+    np.cumsum(np.cumsum(padded, axis=0), axis=1, out=integral[1:, 1:])
+    return (
+        integral[w0:, w1:]
+        - integral[:-w0, w1:]
+        - integral[w0:, :-w1]
+        + integral[:-w0, :-w1]
+    )
+
+
+def training_cells(guard, train):
+    """Returns the outer half-window and the offsets of the training cells."""
+    outer = (guard[0] + train[0], guard[1] + train[1])
+    cells = [
+        np.r_[0 : train[axis], train[axis] + 2 * guard[axis] + 1 : 2 * outer[axis] + 1]
+        for axis in range(2)
+    ]
+    return outer, cells
+
+
+@lru_cache(maxsize=32)
+def ca_alpha(n, pfa):
+    """CA-CFAR threshold factor for a square-law detector."""
+    return n * (pfa ** (-1.0 / n) - 1.0)
+
+
+@lru_cache(maxsize=32)
+def os_alpha(n, k, pfa):
+    """OS-CFAR threshold factor, solved by bisection of Pfa(alpha)."""
+    i = np.arange(k)
+    lo, hi = 0.0, 1e6
+    for _ in range(100):
+        alpha = 0.5 * (lo + hi)
+        if np.prod((n - i) / (n - i + alpha)) > pfa:
+            lo = alpha
+        else:
+            hi = alpha
+    return hi
+
+
+def ca_cfar(pwr, guard, train, pfa):
+    """Cell-averaging CFAR, the noise level is the mean of the training cells."""
+    outer, _ = training_cells(guard, train)
+    n = (2 * outer[0] + 1) * (2 * outer[1] + 1) - (2 * guard[0] + 1) * (
+        2 * guard[1] + 1
+    )
+    noise = (box_sum(pwr, outer) - box_sum(pwr, guard)) / n
+    return noise * ca_alpha(n, pfa), noise
+
+
+def os_cfar(pwr, guard, train, pfa, rank):
+    """Ordered-statistic CFAR, the noise level is the k-th smallest training cell.
+
+    The training cells form a cross along the range and Doppler lines through the
+    cell under test, which keeps the per-cell sort short enough to run per frame.
+    """
+    outer, cells = training_cells(guard, train)
+    padded = pad_map(pwr, outer)
+    rows = padded[:, outer[1] : outer[1] + pwr.shape[1]]
+    cols = padded[outer[0] : outer[0] + pwr.shape[0], :]
+    window = np.concatenate(
+        [
+            sliding_window_view(rows, 2 * outer[0] + 1, axis=0)[..., cells[0]],
+            sliding_window_view(cols, 2 * outer[1] + 1, axis=1)[..., cells[1]],
+        ],
+        axis=-1,
+    )
+    n = window.shape[-1]
+    k = min(n, max(1, int(rank * n)))
+    noise = np.partition(window, k - 1, axis=-1)[..., k - 1]
+    return noise * os_alpha(n, k, pfa), noise
 
 
-async def cube_handler(drain):
+def cfar(pwr, args, scales=(1.0, 1.0)):
+    """Runs the selected CFAR over a range-Doppler power map.
+
+    The Doppler axis of the cube is centred, zero velocity is the middle bin.
+    """
+    if args.cfar == "os":
+        threshold, noise = os_cfar(pwr, args.guard, args.train, args.pfa, args.os_rank)
+    else:
+        threshold, noise = ca_cfar(pwr, args.guard, args.train, args.pfa)
+    rbin, dbin = np.nonzero(pwr > threshold)
+    detections = np.empty(len(rbin), dtype=DETECTION_DTYPE)
+    detections["range_bin"] = rbin
+    detections["doppler_bin"] = dbin
+    detections["range"] = rbin * scales[0]
+    detections["doppler"] = (dbin.astype(np.int64) - pwr.shape[1] // 2) * scales[1]
+    detections["power"] = pwr[rbin, dbin]
+    detections["snr"] = 10.0 * np.log10(pwr[rbin, dbin] / (noise[rbin, dbin] + 1e-12))
+    return detections
+
+
+def cfar_benchmark(args):
+    """Times the CFAR over synthetic exponential noise maps and prints the rate."""
+    rng = np.random.default_rng(0)
+    shape = tuple(args.benchmark)
+    maps = rng.exponential(size=(8,) + shape)
+    for method in ["ca", "os"]:
+        args.cfar = method
+        cfar(maps[0], args)
+        start = time.perf_counter()
+        found = sum(len(cfar(pwr, args)) for pwr in maps)
+        elapsed = (time.perf_counter() - start) / len(maps)
+        print(
+            "%s-CFAR %dx%d: %.2f ms/frame %.1f Mcells/s %.1f false alarms/frame"
+            % (
+                method.upper(),
+                shape[0],
+                shape[1],
+                elapsed * 1e3,
+                shape[0] * shape[1] / elapsed / 1e6,
+                found / len(maps),
+            )
+        )
+
+
+def cube_worker(msg, args, waterfall):
+    timer = stage_timer(msg)
+    radar_cube = decode_radar_cube(payload_bytes(msg))
+    timer.lap("deserialize")
+    data, layout = cube_to_array(radar_cube)
+    timer.lap("decode")
+
+    if args.tensor:
+        log(
+            "radar/cube",
+            rr.Tensor(np.abs(data), dim_names=[DIM_NAMES[dim] for dim in layout]),
+        )
+
+    if RANGE not in layout:
+        return
+
+    rd = None
+    if DOPPLER in layout:
+        rd = range_doppler(data, layout)
+        log("radar/range_doppler", rr.Image(db_image(rd, args.db_range, args.db_max)))
+
+        if args.cfar != "off":
+            scales = list(radar_cube.scales) or [1.0] * len(layout)
+            detections = cfar(
+                rd, args, (scales[layout.index(RANGE)], scales[layout.index(DOPPLER)])
+            )
+            log(
+                "radar/range_doppler/detections",
+                rr.Points2D(
+                    np.stack(
+                        [detections["doppler_bin"], detections["range_bin"]], axis=-1
+                    ),
+                    radii=0.5,
+                    colors=[255, 255, 255],
+                ),
+            )
+            log("radar/cfar/count", rr.Scalars(len(detections)))
+
+    row = None
+    if args.waterfall == "range":
+        row = range_profile(data, layout) if rd is None else rd.sum(axis=1)
+    elif args.waterfall == "doppler" and rd is not None:
+        row = rd[min(args.waterfall_bin, rd.shape[0] - 1)]
+    # Only a frame which added a row changes the image.
+    if row is not None:
+        waterfall.push(row)
+        if waterfall.count % args.waterfall_every == 0:
+            log(
+                "radar/waterfall",
+                rr.Image(db_image(waterfall.view(), args.db_range, args.db_max)),
+            )
+
+    # Angle estimation needs the phase across the RX channels.
+    if RXCHANNEL in layout and np.iscomplexobj(data):
+        ra = range_azimuth(data, layout, args.azimuth_bins, args.fov, args.azimuth)
+        log("radar/range_azimuth", rr.Image(db_image(ra, args.db_range, args.db_max)))
+
+
+async def cube_handler(drain, args):
+    waterfall = Waterfall(args.waterfall_length)
     while True:
         msg = await drain.get_latest()
-        thread = threading.Thread(target=cube_worker, args=[msg])
+        thread = threading.Thread(target=cube_worker, args=[msg, args, waterfall])
         thread.start()
 
         while thread.is_alive():
@@ -53,22 +379,16 @@ async def cube_handler(drain):
 async def main_async(args):
     # Setup rerun
     args.memory_limit = 10
-    rr.script_setup(args, "radar/cube")
+    setup_sink(args, "radar/cube")
 
-    # Zenoh config
-    config = zenoh.Config()
-    config.insert_json5("scouting/multicast/interface", "'lo'")
-    if args.remote:
-        config.insert_json5("mode", "'client'")
-        config.insert_json5("connect", f'{{"endpoints": ["{args.remote}"]}}')
-    session = zenoh.open(config)
+    session = open_session(args)
 
     # Create drains
     loop = asyncio.get_running_loop()
     drain = MessageDrain(loop)
 
-    session.declare_subscriber("rt/radar/cube", drain.callback)
-    await asyncio.gather((cube_handler(drain)))
+    declare_subscriber(session, "rt/radar/cube", drain.callback)
+    await asyncio.gather((cube_handler(drain, args)))
 
     while True:
         asyncio.sleep(0.001)
@@ -76,16 +396,116 @@ async def main_async(args):
 
 def main():
     parser = ArgumentParser(description="EdgeFirst Samples - Radar Cube")
+    add_session_args(parser)
+    parser.add_argument(
+        "--db-range",
+        type=float,
+        default=40.0,
+        help="Dynamic range in dB shown below the peak of each map.",
+    )
     parser.add_argument(
-        "-r",
-        "--remote",
-        type=str,
+        "--db-max",
+        type=float,
         default=None,
-        help="Connect to the remote endpoint instead of local.",
+        help="Fix the top of the dB scale instead of following each frame's peak.",
+    )
+    parser.add_argument(
+        "--azimuth",
+        choices=["fft", "steering"],
+        default="fft",
+        help="Range-azimuth beamforming with an angle FFT or a steering matrix.",
+    )
+    parser.add_argument(
+        "--azimuth-bins",
+        type=int,
+        default=64,
+        help="Number of angle bins in the range-azimuth map.",
+    )
+    parser.add_argument(
+        "--fov",
+        type=float,
+        default=120.0,
+        help="Azimuth field of view in degrees covered by the steering matrix.",
+    )
+    parser.add_argument(
+        "--cfar",
+        choices=["off", "ca", "os"],
+        default="off",
+        help="Run a cell-averaging or ordered-statistic CFAR on the range-Doppler map.",
     )
-    rr.script_add_args(parser)
+    parser.add_argument(
+        "--guard",
+        type=int,
+        nargs=2,
+        default=[2, 2],
+        metavar=("RANGE", "DOPPLER"),
+        help="CFAR guard cells on each side of the cell under test.",
+    )
+    parser.add_argument(
+        "--train",
+        type=int,
+        nargs=2,
+        default=[8, 4],
+        metavar=("RANGE", "DOPPLER"),
+        help="CFAR training cells on each side beyond the guard cells.",
+    )
+    parser.add_argument(
+        "--pfa",
+        type=float,
+        default=1e-4,
+        help="CFAR probability of false alarm.",
+    )
+    parser.add_argument(
+        "--os-rank",
+        type=float,
+        default=0.75,
+        help="Rank of the OS-CFAR order statistic as a fraction of training cells.",
+    )
+    parser.add_argument(
+        "--benchmark",
+        type=int,
+        nargs=2,
+        default=None,
+        metavar=("RANGE", "DOPPLER"),
+        help="Benchmark the CFAR on synthetic maps of the given size and exit.",
+    )
+    parser.add_argument(
+        "--waterfall",
+        choices=["off", "range", "doppler"],
+        default="off",
+        help="Keep a scrolling history of range profiles or of the Doppler "
+        "spectrum at --waterfall-bin.",
+    )
+    parser.add_argument(
+        "--waterfall-bin",
+        type=int,
+        default=0,
+        help="Range bin of the Doppler spectrum kept by --waterfall doppler.",
+    )
+    parser.add_argument(
+        "--waterfall-length",
+        type=int,
+        default=256,
+        help="Number of frames kept in the waterfall history.",
+    )
+    parser.add_argument(
+        "--waterfall-every",
+        type=int,
+        default=10,
+        help="Log the waterfall image every N frames.",
+    )
+    parser.add_argument(
+        "--tensor",
+        action="store_true",
+        help="Also log the full radar cube as a tensor (heavy).",
+    )
+    add_sink_args(parser)
     args = parser.parse_args()
 
+    if args.benchmark:
+        cfar_benchmark(args)
+        return
+
     try:
         asyncio.run(main_async(args))
     except KeyboardInterrupt:
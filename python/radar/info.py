@@ -1,7 +1,6 @@
 # SPDX-License-Identifier: Apache-2.0
 # Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
 
-import zenoh
 import sys
 import asyncio
 import time
@@ -9,6 +8,23 @@ from argparse import ArgumentParser
 from edgefirst.schemas.edgefirst_msgs import RadarInfo
 import rerun as rr
 import threading
+import os
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from edgefirst_samples import (  # noqa: E402
+    add_session_args,
+    add_sink_args,
+    log,
+    open_session,
+    payload_bytes,
+    setup_sink,
+    stage_timer,
+)
+from edgefirst_samples.static import (  # noqa: E402
+    ChangeFilter,
+    StaticTopic,
+    add_static_arg,
+)
 
 
 class MessageDrain:
@@ -31,12 +47,14 @@ class MessageDrain:
 
 
 def info_worker(msg):
-    radar_info = RadarInfo.deserialize(msg.payload.to_bytes())
+    timer = stage_timer(msg)
+    radar_info = RadarInfo.deserialize(payload_bytes(msg))
+    timer.lap("deserialize")
     radar_log = "Range Mode: %s\n" % str(radar_info.frequency_sweep)
     radar_log += "Center Band: %s\n" % str(radar_info.center_frequency)
     radar_log += "Sensitivity: %s\n" % str(radar_info.detection_sensitivity)
     radar_log += "Range Toggle: %s\n" % str(radar_info.range_toggle)
-    rr.log("RadarInfo", rr.TextLog(radar_log))
+    log("RadarInfo", rr.TextLog(radar_log))
 
 
 async def info_handler(drain):
@@ -53,21 +71,19 @@ async def info_handler(drain):
 async def main_async(args):
     # Setup rerun
     args.memory_limit = 10
-    rr.script_setup(args, "radar/info")
+    setup_sink(args, "radar/info")
 
-    # Zenoh config
-    config = zenoh.Config()
-    config.insert_json5("scouting/multicast/interface", "'lo'")
-    if args.remote:
-        config.insert_json5("mode", "'client'")
-        config.insert_json5("connect", f'{{"endpoints": ["{args.remote}"]}}')
-    session = zenoh.open(config)
+    session = open_session(args)
 
     # Create drains
     loop = asyncio.get_running_loop()
     drain = MessageDrain(loop)
 
-    session.declare_subscriber("rt/radar/info", drain.callback)
+    # Fetched once and then every --info-refresh seconds, not on every publish,
+    # and only logged again when the contents change.
+    StaticTopic(
+        session, "rt/radar/info", ChangeFilter(drain.callback), args.info_refresh
+    )
     await asyncio.gather((info_handler(drain)))
 
     while True:
@@ -76,14 +92,9 @@ async def main_async(args):
 
 def main():
     parser = ArgumentParser(description="EdgeFirst Samples - Radar Info")
-    parser.add_argument(
-        "-r",
-        "--remote",
-        type=str,
-        default=None,
-        help="Connect to the remote endpoint instead of local.",
-    )
-    rr.script_add_args(parser)
+    add_session_args(parser)
+    add_static_arg(parser)
+    add_sink_args(parser)
     args = parser.parse_args()
 
     try:
@@ -2,7 +2,6 @@
 # Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
 
 import rerun as rr
-import zenoh
 import sys
 import asyncio
 import time
@@ -10,6 +9,19 @@ from argparse import ArgumentParser
 from edgefirst.schemas import decode_pcd
 from edgefirst.schemas.sensor_msgs import PointCloud2
 import threading
+import os
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from edgefirst_samples import (  # noqa: E402
+    add_session_args,
+    add_sink_args,
+    declare_subscriber,
+    log,
+    open_session,
+    payload_bytes,
+    setup_sink,
+    stage_timer,
+)
 
 
 class MessageDrain:
@@ -32,10 +44,13 @@ class MessageDrain:
 
 
 def targets_worker(msg):
-    pcd = PointCloud2.deserialize(msg.payload.to_bytes())
+    timer = stage_timer(msg)
+    pcd = PointCloud2.deserialize(payload_bytes(msg))
+    timer.lap("deserialize")
     points = decode_pcd(pcd)
+    timer.lap("decode")
     pos = [[p.x, p.y, p.z] for p in points]
-    rr.log("radar/targets", rr.Points3D(pos))
+    log("radar/targets", rr.Points3D(pos))
 
 
 async def targets_handler(drain):
@@ -52,21 +67,15 @@ async def targets_handler(drain):
 async def main_async(args):
     # Setup rerun
     args.memory_limit = 10
-    rr.script_setup(args, "radar/targets")
+    setup_sink(args, "radar/targets")
 
-    # Zenoh config
-    config = zenoh.Config()
-    config.insert_json5("scouting/multicast/interface", "'lo'")
-    if args.remote:
-        config.insert_json5("mode", "'client'")
-        config.insert_json5("connect", f'{{"endpoints": ["{args.remote}"]}}')
-    session = zenoh.open(config)
+    session = open_session(args)
 
     # Create drains
     loop = asyncio.get_running_loop()
     drain = MessageDrain(loop)
 
-    session.declare_subscriber("rt/radar/targets", drain.callback)
+    declare_subscriber(session, "rt/radar/targets", drain.callback)
     await asyncio.gather((targets_handler(drain)))
 
     while True:
@@ -75,14 +84,8 @@ async def main_async(args):
 
 def main():
     parser = ArgumentParser(description="EdgeFirst Samples - Radar Targets")
-    parser.add_argument(
-        "-r",
-        "--remote",
-        type=str,
-        default=None,
-        help="Connect to the remote endpoint instead of local.",
-    )
-    rr.script_add_args(parser)
+    add_session_args(parser)
+    add_sink_args(parser)
     args = parser.parse_args()
 
     try:
@@ -0,0 +1,234 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
+
+from argparse import ArgumentParser
+import os
+import queue
+import sys
+import threading
+import time
+
+import zenoh
+from mcap.writer import CompressionType, Writer
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from edgefirst_samples import add_shm_arg, zenoh_config  # noqa: E402
+from edgefirst_samples.msgdef import message_definition  # noqa: E402
+from edgefirst_samples.pointcodec import (  # noqa: E402
+    MCAP_ENCODING,
+    SCHEMA,
+    encode_point_cloud,
+)
+
+COMPRESSION = {
+    "zstd": CompressionType.ZSTD,
+    "lz4": CompressionType.LZ4,
+    "none": CompressionType.NONE,
+}
+
+# Point cloud topics stored with the quantized codec by --quantize-points,
+# their samples decode it with edgefirst_samples.cdr.
+QUANTIZED_TOPICS = ["rt/lidar/points", "rt/fusion/occupancy"]
+
+
+class Recorder:
+    """Writes the messages received from Zenoh to an MCAP file.
+
+    The Zenoh callback only queues the sample with its arrival time, a writer
+    thread drains the queue in bulk and lets the MCAP writer batch messages
+    into compressed chunks, so a slow disk never stalls the Zenoh threads.
+    With quantize set, the QUANTIZED_TOPICS are stored with the quantized
+    point cloud codec at that resolution, which only the EdgeFirst samples
+    can read back.
+    """
+
+    def __init__(self, path, chunk_size, compression, quantize=None):
+        self._file = open(path, "wb", buffering=1 << 20)
+        self._writer = Writer(
+            self._file, chunk_size=chunk_size, compression=COMPRESSION[compression]
+        )
+        # Quantized channels are not CDR, which the ros2 profile requires.
+        profile = "ros2" if quantize is None else ""
+        self._writer.start(profile=profile, library="edgefirst-samples")
+        self._quantize = quantize
+        self._queue = queue.SimpleQueue()
+        self._channels = {}
+        self._schemas = {}
+        self._thread = threading.Thread(target=self._run)
+        self.messages = 0
+        self.bytes = 0
+        self.backlog = 0
+
+    def start(self):
+        self._thread.start()
+
+    def callback(self, msg):
+        self._queue.put((msg, time.time_ns()))
+
+    def _register_schema(self, schema, quantized):
+        """Registers schema with its ros2msg definition, or without an encoding
+        for the quantized codec and schemas edgefirst.schemas does not know,
+        which readers then cannot decode.
+        """
+        encoding, data = "", b""
+        if schema and not quantized:
+            try:
+                data = message_definition(schema).encode()
+                encoding = "ros2msg"
+            except (KeyError, ValueError):
+                pass
+        return self._writer.register_schema(name=schema, encoding=encoding, data=data)
+
+    def _channel(self, msg):
+        key = str(msg.key_expr)
+        channel = self._channels.get(key)
+        if channel is None:
+            # The Zenoh encoding carries the schema after the first ';'.
+            encoding = str(msg.encoding)
+            schema = encoding.split(";", maxsplit=1)[-1] if ";" in encoding else ""
+            quantized = self._quantize is not None and key in QUANTIZED_TOPICS
+            if quantized:
+                schema = SCHEMA
+            if schema not in self._schemas:
+                self._schemas[schema] = self._register_schema(schema, quantized)
+            # ROS 2 style topic names, as written by the EdgeFirst Recorder.
+            topic = "/" + key[3:] if key.startswith("rt/") else "/" + key
+            channel = self._writer.register_channel(
+                topic=topic,
+                message_encoding=MCAP_ENCODING if quantized else "cdr",
+                schema_id=self._schemas[schema],
+            )
+            channel = self._channels[key] = (channel, quantized)
+        return channel
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self.backlog = max(self.backlog, len(batch))
+            for item in batch:
+                if item is None:
+                    return
+                msg, log_time = item
+                channel, quantized = self._channel(msg)
+                data = msg.payload.to_bytes()
+                self.bytes += len(data)
+                if quantized:
+                    try:
+                        data = encode_point_cloud(data, self._quantize)
+                    except ValueError:
+                        # Too large for the resolution, readers detect the codec
+                        # from the payload so the CDR is stored as it is.
+                        pass
+                self._writer.add_message(
+                    channel,
+                    log_time=log_time,
+                    data=data,
+                    publish_time=log_time,
+                    sequence=self.messages,
+                )
+                self.messages += 1
+
+    def close(self):
+        """Writes the remaining messages along with the summary and index."""
+        self._queue.put(None)
+        self._thread.join()
+        self._writer.finish()
+        self._file.close()
+
+
+def main():
+    parser = ArgumentParser(description="EdgeFirst Samples - Record")
+    parser.add_argument(
+        "-r",
+        "--remote",
+        type=str,
+        default=None,
+        help="Connect to the remote endpoint instead of local.",
+    )
+    add_shm_arg(parser)
+    parser.add_argument(
+        "topics",
+        nargs="*",
+        default=["rt/**"],
+        help="Topics or key expressions to record, all topics by default.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        default=None,
+        help="MCAP file to write, named after the current time by default.",
+    )
+    parser.add_argument(
+        "-t",
+        "--time",
+        type=float,
+        default=None,
+        help="Time in seconds to record before exiting.",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=4 * 1024 * 1024,
+        help="Uncompressed bytes of messages gathered into each chunk.",
+    )
+    parser.add_argument(
+        "--compression",
+        choices=list(COMPRESSION),
+        default="zstd",
+        help="Chunk compression.",
+    )
+    parser.add_argument(
+        "--quantize-points",
+        type=float,
+        default=None,
+        metavar="RESOLUTION",
+        help="Store %s with the quantized point cloud codec at this resolution "
+        "in meters." % " and ".join(QUANTIZED_TOPICS),
+    )
+    args = parser.parse_args()
+
+    output = args.output or time.strftime("recording-%Y%m%d-%H%M%S.mcap")
+    recorder = Recorder(output, args.chunk_size, args.compression, args.quantize_points)
+    recorder.start()
+
+    session = zenoh.open(zenoh_config(args))
+    subscribers = [
+        session.declare_subscriber(topic, recorder.callback) for topic in args.topics
+    ]
+    print("Recording %s to %s, press Ctrl+C to stop" % (" ".join(args.topics), output))
+
+    start = time.monotonic()
+    try:
+        if args.time is not None:
+            time.sleep(args.time)
+        else:
+            while True:
+                time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+
+    for subscriber in subscribers:
+        subscriber.undeclare()
+    session.close()
+    elapsed = time.monotonic() - start
+    recorder.close()
+    print(
+        "Recorded %d messages, %.2f MB/s of payload into %.1f MB, "
+        "largest backlog %d messages"
+        % (
+            recorder.messages,
+            recorder.bytes / elapsed / 1e6,
+            os.path.getsize(output) / 1e6,
+            recorder.backlog,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,392 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
+
+from argparse import ArgumentParser
+import os
+import sys
+import threading
+import time
+
+import cv2
+import numpy as np
+import zenoh
+import zstd
+from edgefirst.schemas.builtin_interfaces import Time
+from edgefirst.schemas.edgefirst_msgs import Mask
+from edgefirst.schemas.sensor_msgs import CompressedImage, PointCloud2, PointField
+from edgefirst.schemas.std_msgs import Header
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from edgefirst_samples import add_qos_arg, add_shm_arg, zenoh_config  # noqa: E402
+from edgefirst_samples.cdr import (  # noqa: E402
+    decode_compressed_image,
+    decode_mask,
+    decode_point_cloud,
+    point_array,
+)
+from edgefirst_samples.discovery import schema_of, token_key  # noqa: E402
+from edgefirst_samples.pointcodec import (  # noqa: E402
+    SCHEMA,
+    encode_point_cloud,
+    encode_points,
+)
+from edgefirst_samples.qos import PROFILES, topic_profile  # noqa: E402
+
+REDUCTIONS = ["points", "clusters", "jpeg", "mask", "imu"]
+
+# Reductions which are only run when named, occupancy needs --quantize.
+OPTIONAL_REDUCTIONS = ["occupancy"]
+
+
+def header(decoded):
+    return Header(
+        stamp=Time(sec=decoded.sec, nanosec=decoded.nanosec),
+        frame_id=decoded.frame_id,
+    )
+
+
+def serialize_points(pcd, points, fields=None):
+    """Serializes the points of a structured array as a single row PointCloud2."""
+    if fields is None:
+        fields = [
+            PointField(
+                name=field.name,
+                offset=field.offset,
+                datatype=field.datatype,
+                count=field.count,
+            )
+            for field in pcd.fields
+        ]
+    return PointCloud2(
+        header=header(pcd.header),
+        height=1,
+        width=len(points),
+        fields=fields,
+        is_bigendian=pcd.is_bigendian,
+        point_step=points.dtype.itemsize,
+        row_step=points.nbytes,
+        data=points.tobytes(),
+        is_dense=pcd.is_dense,
+    ).serialize()
+
+
+def voxel_points(payload, args):
+    """Keeps the first point of every --voxel sized cube, with all its fields."""
+    pcd = decode_point_cloud(payload)
+    points = point_array(pcd)
+    xyz = np.column_stack((points["x"], points["y"], points["z"]))
+    if not pcd.is_dense:
+        finite = np.isfinite(xyz).all(axis=1)
+        points, xyz = points[finite], xyz[finite]
+    # Voxel indices packed 21 bits per axis into a single key.
+    cells = np.floor(xyz / args.voxel).astype(np.int64) + (1 << 20)
+    keys = (cells[:, 0] << 42) | (cells[:, 1] << 21) | cells[:, 2]
+    _, first = np.unique(keys, return_index=True)
+    if args.quantize is not None:
+        return encode_points(pcd, points[first], args.quantize)
+    return serialize_points(pcd, points[np.sort(first)])
+
+
+# Fields of the cluster summaries, one point per cluster.
+SUMMARY_FIELDS = [
+    PointField(name=name, offset=4 * index, datatype=7, count=1)
+    for index, name in enumerate(["x", "y", "z", "cluster_id", "count"])
+]
+
+
+def cluster_summary(payload, args):
+    """Replaces the points of each cluster by their centroid and count."""
+    pcd = decode_point_cloud(payload)
+    points = point_array(pcd)
+    ids = points["cluster_id"].astype(np.int64)
+    clustered = ids > 0
+    ids = ids[clustered]
+    cluster_ids, index, counts = np.unique(ids, return_inverse=True, return_counts=True)
+    summary = np.zeros(
+        len(cluster_ids),
+        dtype=[(field.name, "<f4") for field in SUMMARY_FIELDS],
+    )
+    for axis in ["x", "y", "z"]:
+        summary[axis] = (
+            np.bincount(index, points[axis][clustered], len(cluster_ids)) / counts
+        )
+    summary["cluster_id"] = cluster_ids
+    summary["count"] = counts
+    return serialize_points(pcd, summary, SUMMARY_FIELDS)
+
+
+def jpeg_preview(payload, args):
+    """Downscales a JPEG frame by --jpeg-scale and re-encodes it."""
+    image = decode_compressed_image(payload)
+    frame = cv2.imdecode(image.data, cv2.IMREAD_COLOR)
+    if frame is None:
+        return None
+    frame = cv2.resize(
+        frame,
+        None,
+        fx=args.jpeg_scale,
+        fy=args.jpeg_scale,
+        interpolation=cv2.INTER_AREA,
+    )
+    _, data = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, args.jpeg_quality])
+    return CompressedImage(
+        header=header(image.header), format="jpeg", data=data.tobytes()
+    ).serialize()
+
+
+def compress_mask(payload, args):
+    """zstd compresses the mask as published on rt/model/mask_compressed."""
+    mask = decode_mask(payload)
+    return Mask(
+        height=mask.height,
+        width=mask.width,
+        length=mask.length,
+        encoding="zstd",
+        mask=zstd.compress(mask.mask.tobytes(), args.mask_level),
+        boxed=mask.boxed,
+    ).serialize()
+
+
+def quantize_points(payload, args):
+    """Encodes the point cloud with the quantized codec at --quantize."""
+    return encode_point_cloud(payload, args.quantize)
+
+
+def passthrough(payload, args):
+    return payload
+
+
+class Reduction:
+    """Republishes a reduced version of a topic.
+
+    The Zenoh callback keeps one in every decimate messages and only the
+    latest of those, a worker thread reduces and publishes it, so a reduction
+    that falls behind skips messages instead of queueing them.
+    """
+
+    def __init__(self, session, source, topic, reduce, args, decimate=1, encoding=None):
+        self.source = source
+        self.topic = topic
+        self.received = 0
+        self.received_bytes = 0
+        self.published = 0
+        self.published_bytes = 0
+        self._reduce = reduce
+        self._args = args
+        self._decimate = decimate
+        self._encoding = encoding
+        self._latest = None
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._session = session
+        self._publisher = session.declare_publisher(topic)
+        self._token = None
+        self._subscriber = session.declare_subscriber(source, self.callback)
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def callback(self, msg):
+        self.received += 1
+        self.received_bytes += len(msg.payload)
+        if (self.received - 1) % self._decimate:
+            return
+        with self._lock:
+            self._latest = msg
+        self._ready.set()
+
+    def _run(self):
+        while True:
+            self._ready.wait()
+            with self._lock:
+                msg, self._latest = self._latest, None
+                self._ready.clear()
+            if msg is None:
+                continue
+            try:
+                data = self._reduce(msg.payload.to_bytes(), self._args)
+            except ValueError as error:
+                print("%s: %s" % (self.source, error))
+                continue
+            if data is None:
+                continue
+            encoding = self._encoding or msg.encoding
+            if self._token is None:
+                # Announces the reduced topic and its schema, known from the
+                # first message, so it can be discovered without payload.
+                self._token = self._session.liveliness().declare_token(
+                    token_key(self.topic, schema_of(encoding))
+                )
+            self._publisher.put(data, encoding=encoding)
+            self.published += 1
+            self.published_bytes += len(data)
+
+    def undeclare(self):
+        self._subscriber.undeclare()
+        if self._token is not None:
+            self._token.undeclare()
+        self._publisher.undeclare()
+
+
+def lite_topic(prefix, source):
+    """rt/lidar/points becomes rt/lite/lidar/points under the default prefix."""
+    return prefix + source[len("rt") :]
+
+
+def main():
+    parser = ArgumentParser(description="EdgeFirst Samples - Reduction Relay")
+    parser.add_argument(
+        "-r",
+        "--remote",
+        type=str,
+        default=None,
+        help="Connect to the remote endpoint instead of local.",
+    )
+    add_shm_arg(parser)
+    add_qos_arg(parser)
+    parser.add_argument(
+        "--prefix",
+        type=str,
+        default="rt/lite",
+        help="Key prefix replacing rt of the republished topics.",
+    )
+    parser.add_argument(
+        "--reductions",
+        nargs="+",
+        choices=REDUCTIONS + OPTIONAL_REDUCTIONS,
+        default=REDUCTIONS,
+        help="Reductions to run, all but %s by default."
+        % ", ".join(OPTIONAL_REDUCTIONS),
+    )
+    parser.add_argument(
+        "--voxel",
+        type=float,
+        default=0.25,
+        help="Voxel size in meters of the downsampled rt/lidar/points.",
+    )
+    parser.add_argument(
+        "--quantize",
+        type=float,
+        default=None,
+        metavar="RESOLUTION",
+        help="Encode rt/lidar/points and rt/fusion/occupancy with the quantized "
+        "point cloud codec at this resolution in meters.",
+    )
+    parser.add_argument(
+        "--jpeg-scale",
+        type=float,
+        default=0.25,
+        help="Scale of the rt/camera/jpeg previews.",
+    )
+    parser.add_argument(
+        "--jpeg-quality",
+        type=int,
+        default=70,
+        help="JPEG quality of the previews.",
+    )
+    parser.add_argument(
+        "--mask-level",
+        type=int,
+        default=3,
+        help="zstd compression level of rt/model/mask.",
+    )
+    parser.add_argument(
+        "--imu-decimate",
+        type=int,
+        default=10,
+        help="Republish every Nth rt/imu message.",
+    )
+    parser.add_argument(
+        "--decimate",
+        type=int,
+        default=1,
+        help="Reduce every Nth message of the other topics.",
+    )
+    parser.add_argument(
+        "-t",
+        "--time",
+        type=float,
+        default=None,
+        help="Time in seconds to run command before exiting.",
+    )
+    args = parser.parse_args()
+    if "occupancy" in args.reductions and args.quantize is None:
+        parser.error("the occupancy reduction requires --quantize")
+
+    # Quantized clouds are no longer CDR, decode_point_cloud() detects them.
+    quantized = None
+    if args.quantize is not None:
+        quantized = zenoh.Encoding.ZENOH_BYTES.with_schema(SCHEMA)
+
+    # source, republished topic, reduction, decimation and encoding, None
+    # keeps the encoding of the source, of each reduction.
+    reductions = {
+        "points": ("rt/lidar/points", None, voxel_points, args.decimate, quantized),
+        "occupancy": (
+            "rt/fusion/occupancy",
+            None,
+            quantize_points,
+            args.decimate,
+            quantized,
+        ),
+        "clusters": ("rt/lidar/clusters", None, cluster_summary, args.decimate, None),
+        "jpeg": ("rt/camera/jpeg", None, jpeg_preview, args.decimate, None),
+        "mask": (
+            "rt/model/mask",
+            lite_topic(args.prefix, "rt/model/mask_compressed"),
+            compress_mask,
+            args.decimate,
+            None,
+        ),
+        "imu": ("rt/imu", None, passthrough, args.imu_decimate, None),
+    }
+    selected = [reductions[name] for name in args.reductions]
+    selected = [
+        (source, topic or lite_topic(args.prefix, source), *reduction)
+        for source, topic, *reduction in selected
+    ]
+
+    # Reduced topics keep the QoS profile of their source unless overridden.
+    overridden = {key_expr for key_expr, _ in args.qos}
+    args.qos += [
+        (topic, dict(PROFILES[topic_profile(source)]))
+        for source, topic, *_ in selected
+        if topic not in overridden
+    ]
+    session = zenoh.open(zenoh_config(args))
+
+    relays = [
+        Reduction(session, source, topic, reduce, args, decimate, encoding)
+        for source, topic, reduce, decimate, encoding in selected
+    ]
+    print("Relaying to %s/**, press Ctrl+C to stop" % args.prefix)
+
+    start = time.monotonic()
+    try:
+        if args.time is not None:
+            time.sleep(args.time)
+        else:
+            while True:
+                time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+
+    for relay in relays:
+        relay.undeclare()
+    session.close()
+    elapsed = time.monotonic() - start
+    for relay in relays:
+        print(
+            "%s -> %s: %.1f -> %.1f msg/s, %.2f -> %.3f MB/s (%.1f%%)"
+            % (
+                relay.source,
+                relay.topic,
+                relay.received / elapsed,
+                relay.published / elapsed,
+                relay.received_bytes / elapsed / 1e6,
+                relay.published_bytes / elapsed / 1e6,
+                100.0 * relay.published_bytes / max(1, relay.received_bytes),
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
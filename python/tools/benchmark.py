@@ -0,0 +1,315 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
+
+from argparse import ArgumentParser, Namespace
+from collections import namedtuple
+import importlib.util
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import zenoh
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from edgefirst_samples import setup_sink, synthetic  # noqa: E402
+from edgefirst_samples.pointcodec import encode_point_cloud  # noqa: E402
+from edgefirst_samples.replay import ReplaySample  # noqa: E402
+from edgefirst_samples.stats import topic_stats  # noqa: E402
+
+PYTHON_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Fixed worker options so results stay comparable when sample defaults change.
+CUBE_ARGS = Namespace(
+    db_range=40.0,
+    db_max=None,
+    azimuth="fft",
+    azimuth_bins=64,
+    fov=120.0,
+    cfar="ca",
+    guard=[2, 2],
+    train=[8, 4],
+    pfa=1e-4,
+    os_rank=0.75,
+    waterfall="range",
+    waterfall_bin=0,
+    waterfall_length=256,
+    waterfall_every=10,
+    tensor=False,
+)
+DEPTH_ARGS = Namespace(
+    depth_scale=1000.0,
+    preview=False,
+    max_range=50.0,
+    points=True,
+    hfov=360.0,
+    vfov=45.0,
+    beams=None,
+)
+
+# sample is relative to python/, fixture builds the payload from a seeded rng
+# and call runs the worker of the loaded sample module on a message.
+Case = namedtuple("Case", ["name", "sample", "fixture", "call"])
+
+
+def simple(worker):
+    return lambda module, msg: getattr(module, worker)(msg)
+
+
+def cube_call(module, msg):
+    if not hasattr(module, "bench_waterfall"):
+        module.bench_waterfall = module.Waterfall(CUBE_ARGS.waterfall_length)
+    module.cube_worker(msg, CUBE_ARGS, module.bench_waterfall)
+
+
+def depth_call(module, msg):
+    module.depth_worker(msg, DEPTH_ARGS, None, module.ReflectStorage())
+
+
+CASES = [
+    Case(
+        "points_%d" % n,
+        "lidar/points.py",
+        lambda rng, n=n: synthetic.lidar_points(n, rng),
+        simple("points_worker"),
+    )
+    for n in (1024, 8192, 65536)
+]
+CASES += [
+    Case(
+        "clusters_%d" % n,
+        "lidar/clusters.py",
+        lambda rng, n=n: synthetic.lidar_clusters(n, rng),
+        simple("clusters_worker"),
+    )
+    for n in (1024, 8192)
+]
+CASES += [
+    Case(
+        "points_quantized_65536",
+        "lidar/points.py",
+        lambda rng: encode_point_cloud(bytes(synthetic.lidar_points(65536, rng))),
+        simple("points_worker"),
+    ),
+    Case(
+        "occupancy_20000",
+        "fusion/occupancy.py",
+        lambda rng: synthetic.occupancy(20000, rng),
+        simple("occupancy_worker"),
+    ),
+]
+CASES += [
+    Case(
+        "boxes2d_%d" % n,
+        "model/boxes2d.py",
+        lambda rng, n=n: synthetic.boxes2d(n, rng),
+        simple("boxes2d_worker"),
+    )
+    for n in (10, 100, 1000)
+]
+CASES += [
+    Case(
+        "mask_%dx%dx%d" % shape,
+        "model/mask.py",
+        lambda rng, shape=shape: synthetic.mask(*shape, rng),
+        simple("mask_worker"),
+    )
+    for shape in ((160, 160, 2), (320, 320, 2), (480, 640, 8))
+]
+CASES += [
+    Case(
+        "radar_cube_200x256",
+        "radar/cube.py",
+        lambda rng: synthetic.radar_cube(rng, 200, 256),
+        cube_call,
+    ),
+    Case(
+        "depth_mono16_128x2048",
+        "lidar/depth.py",
+        lambda rng: synthetic.depth_image(128, 2048, rng),
+        depth_call,
+    ),
+    Case(
+        "jpeg_1280x720",
+        "camera/jpeg.py",
+        lambda rng: synthetic.jpeg_frames(1280, 720, 1)[0],
+        simple("jpeg_worker"),
+    ),
+]
+
+
+def load_sample(sample):
+    """Imports a sample script as a module without running its main()."""
+    name = "bench_" + sample.replace("/", "_")[:-3]
+    if name not in sys.modules:
+        path = os.path.join(PYTHON_DIR, sample)
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        sys.modules[name] = module
+    return sys.modules[name]
+
+
+def load_fixture(case, args):
+    """Uses a recorded payload from --fixtures when present, else a synthetic one."""
+    if args.fixtures is not None:
+        path = os.path.join(args.fixtures, case.name + ".cdr")
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                return f.read()
+    return bytes(case.fixture(np.random.default_rng(0)))
+
+
+def run_case(case, payload, args):
+    module = load_sample(case.sample)
+    key = "bench/" + case.name
+    msg = ReplaySample(
+        zenoh.KeyExpr(key), zenoh.ZBytes(payload), zenoh.Encoding.APPLICATION_CDR
+    )
+
+    # Warm up caches such as lru_cache tables and lazily imported modules.
+    for _ in range(args.warmup):
+        case.call(module, msg)
+
+    stats = topic_stats(key)
+    stats.processed = 0
+    stats.stages.clear()
+    start = time.perf_counter()
+    elapsed = 0.0
+    while stats.processed < args.min_iterations or (
+        elapsed < args.min_time and stats.processed < args.max_iterations
+    ):
+        case.call(module, msg)
+        elapsed = time.perf_counter() - start
+    iterations = stats.processed
+    stages = {stage: total * 1e3 / iterations for stage, total in stats.stages.items()}
+
+    # Allocation tracing slows the worker down so it is measured separately.
+    tracemalloc.start()
+    case.call(module, msg)
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+    case.call(module, msg)
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "sample": case.sample,
+        "payload_bytes": len(payload),
+        "iterations": iterations,
+        "ops_per_sec": iterations / elapsed,
+        "mean_ms": elapsed * 1e3 / iterations,
+        "stages_ms": stages,
+        "peak_alloc_bytes": peak - before,
+        "retained_bytes": after - before,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PYTHON_DIR,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_result(name, result, baseline):
+    stages = "  ".join(
+        "%s %.3f" % (stage, ms) for stage, ms in result["stages_ms"].items()
+    )
+    line = "%-24s %10.1f ops/s %9.3f ms %10.1f KiB peak  %s" % (
+        name,
+        result["ops_per_sec"],
+        result["mean_ms"],
+        result["peak_alloc_bytes"] / 1024,
+        stages,
+    )
+    if baseline is not None and name in baseline["cases"]:
+        ratio = result["ops_per_sec"] / baseline["cases"][name]["ops_per_sec"]
+        line += "  (%.2fx)" % ratio
+    print(line)
+
+
+def main():
+    parser = ArgumentParser(description="EdgeFirst Samples - Worker Benchmarks")
+    parser.add_argument(
+        "-k",
+        "--filter",
+        type=str,
+        default=None,
+        help="Only run cases whose name contains this string.",
+    )
+    parser.add_argument(
+        "--fixtures",
+        type=str,
+        default=None,
+        help="Directory of recorded <case>.cdr payloads replacing the synthetic ones.",
+    )
+    parser.add_argument(
+        "--save-fixtures",
+        type=str,
+        default=None,
+        help="Write the payload of every case to this directory.",
+    )
+    parser.add_argument(
+        "-o", "--output", type=str, default=None, help="Write the results as JSON."
+    )
+    parser.add_argument(
+        "--compare",
+        type=str,
+        default=None,
+        help="JSON results of a previous run to compare throughput against.",
+    )
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--min-time", type=float, default=1.0)
+    parser.add_argument("--min-iterations", type=int, default=5)
+    parser.add_argument("--max-iterations", type=int, default=10000)
+    args = parser.parse_args()
+
+    # Workers run their full pipeline while the null sink drops the final log.
+    setup_sink(
+        Namespace(sink="null", latency=False, stats_json=None),
+        "benchmark",
+        report_stats=False,
+    )
+
+    baseline = None
+    if args.compare is not None:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    results = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "numpy": np.__version__,
+        "cases": {},
+    }
+    for case in CASES:
+        if args.filter is not None and args.filter not in case.name:
+            continue
+        payload = load_fixture(case, args)
+        if args.save_fixtures is not None:
+            os.makedirs(args.save_fixtures, exist_ok=True)
+            path = os.path.join(args.save_fixtures, case.name + ".cdr")
+            with open(path, "wb") as f:
+                f.write(payload)
+        result = run_case(case, payload, args)
+        results["cases"][case.name] = result
+        print_result(case.name, result, baseline)
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
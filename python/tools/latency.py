@@ -0,0 +1,167 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
+
+from argparse import ArgumentParser
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+PYTHON_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Topics published for each sample, mega_sample picks its inputs from these.
+SAMPLES = {
+    "camera/h264.py": ["rt/camera/h264"],
+    "lidar/points.py": ["rt/lidar/points"],
+    "combined/mega_sample.py": [
+        "rt/camera/h264",
+        "rt/model/boxes2d",
+        "rt/model/mask",
+        "rt/lidar/clusters",
+        "rt/gps",
+    ],
+}
+
+# Seconds each sample needs before it subscribes.
+STARTUP = {"combined/mega_sample.py": 2.0}
+
+# Publish rates at a load of 1, matching the devices.
+RATES = {"camera": 30.0, "lidar": 10.0, "model": 30.0, "gps": 10.0}
+
+
+def start_publisher(topics, load, args):
+    command = [
+        sys.executable,
+        os.path.join(PYTHON_DIR, "tools", "synthetic.py"),
+        "--topics",
+        *topics,
+        "--width",
+        str(args.width),
+        "--height",
+        str(args.height),
+        "--points",
+        str(args.points),
+    ]
+    for kind, rate in RATES.items():
+        command += ["--%s-rate" % kind, str(rate * load)]
+    publisher = subprocess.Popen(
+        command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+    )
+    # Encoding the payloads takes a while, wait until publishing begins.
+    for line in publisher.stdout:
+        if line.startswith("Publishing"):
+            break
+    return publisher
+
+
+def run_sample(sample, load, args):
+    """Runs the sample under the given load and returns its statistics."""
+    publisher = start_publisher(SAMPLES[sample], load, args)
+    with tempfile.TemporaryDirectory() as tmp:
+        stats = os.path.join(tmp, "stats.json")
+        process = subprocess.Popen(
+            [
+                sys.executable,
+                os.path.join(PYTHON_DIR, sample),
+                "--sink",
+                args.sink,
+                "--latency",
+                "--stats-json",
+                stats,
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        time.sleep(STARTUP.get(sample, 1.0) + args.duration)
+        process.send_signal(signal.SIGINT)
+        process.wait()
+        publisher.send_signal(signal.SIGINT)
+        publisher.communicate()
+        if not os.path.exists(stats):
+            print("%s did not write its statistics" % sample)
+            return {}
+        with open(stats) as f:
+            return json.load(f)
+
+
+def print_stats(sample, load, stats):
+    for topic, topic_stats in stats.items():
+        latency = topic_stats.get("latency_ms")
+        if latency is None:
+            continue
+        total = latency["total"]
+        print(
+            "%-24s %4gx %-18s %6.1f msg/s %5.0f%% processed  "
+            "p50 %7.2f p90 %7.2f p99 %7.2f max %7.2f ms  "
+            "transport %6.2f queue %6.2f process %6.2f ms"
+            % (
+                sample,
+                load,
+                topic,
+                topic_stats["rate"],
+                100.0 * topic_stats["processed"] / max(1, topic_stats["received"]),
+                total["p50"],
+                total["p90"],
+                total["p99"],
+                total["max"],
+                latency["transport"]["p50"],
+                latency["queue"]["p50"],
+                latency["process"]["p50"],
+            )
+        )
+
+
+def main():
+    parser = ArgumentParser(description="EdgeFirst Samples - Latency Harness")
+    parser.add_argument(
+        "--samples",
+        nargs="+",
+        choices=list(SAMPLES),
+        default=list(SAMPLES),
+        help="Samples to measure, all of them by default.",
+    )
+    parser.add_argument(
+        "--loads",
+        type=float,
+        nargs="+",
+        default=[1.0, 2.0, 4.0],
+        help="Multiples of the device publish rates to measure at.",
+    )
+    parser.add_argument(
+        "-d",
+        "--duration",
+        type=float,
+        default=10.0,
+        help="Seconds to measure each sample at each load.",
+    )
+    parser.add_argument(
+        "--sink",
+        choices=["rerun", "null"],
+        default="null",
+        help="Sink of the measured sample, rerun includes rr.log in the latency.",
+    )
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--points", type=int, default=65536)
+    parser.add_argument(
+        "-o", "--output", type=str, default=None, help="Write the results as JSON."
+    )
+    args = parser.parse_args()
+
+    results = []
+    for sample in args.samples:
+        for load in args.loads:
+            stats = run_sample(sample, load, args)
+            print_stats(sample, load, stats)
+            results.append({"sample": sample, "load": load, "topics": stats})
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
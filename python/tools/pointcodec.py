@@ -0,0 +1,145 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
+
+from argparse import ArgumentParser
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import zstd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from edgefirst_samples import synthetic  # noqa: E402
+from edgefirst_samples.cdr import decode_point_cloud, point_array  # noqa: E402
+from edgefirst_samples.pointcodec import (  # noqa: E402
+    encode_point_cloud,
+    quantize,
+)
+
+# Synthetic clouds benchmarked when no payload files are given.
+FIXTURES = {
+    "points_65536": lambda rng: synthetic.lidar_points(65536, rng),
+    "clusters_8192": lambda rng: synthetic.lidar_clusters(8192, rng),
+    "occupancy_20000": lambda rng: synthetic.occupancy(20000, rng),
+}
+
+
+def timed(call, min_time):
+    """Mean seconds per call over at least min_time seconds."""
+    iterations = 0
+    start = time.perf_counter()
+    while True:
+        call()
+        iterations += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed / iterations
+
+
+def max_error(points, decoded, resolution):
+    """Largest coordinate error, with the points sorted as the codec does."""
+    xyz = np.column_stack((points["x"], points["y"], points["z"]))
+    order = np.argsort(quantize(xyz, resolution)[0], kind="stable")
+    return max(
+        float(np.abs(points[axis][order].astype(np.float64) - decoded[axis]).max())
+        for axis in ["x", "y", "z"]
+    )
+
+
+def run(name, payload, args):
+    pcd = decode_point_cloud(payload)
+    points = point_array(pcd)
+    finite = np.isfinite(np.column_stack((points["x"], points["y"], points["z"])))
+    points = points[finite.all(axis=1)]
+    result = {
+        "payload_bytes": len(payload),
+        "points": len(points),
+        "zstd_bytes": len(zstd.compress(payload, args.level)),
+        "resolutions": {},
+    }
+    print(
+        "%s: %d points, %d bytes, zstd alone %.2fx"
+        % (name, len(points), len(payload), len(payload) / result["zstd_bytes"])
+    )
+    for resolution in args.resolution:
+        encoded = encode_point_cloud(payload, resolution, args.level)
+        decoded = point_array(decode_point_cloud(encoded))
+        encode = timed(lambda: encode_point_cloud(payload, resolution, args.level), 0.5)
+        decode = timed(lambda: decode_point_cloud(encoded), 0.5)
+        error = max_error(points, decoded, resolution) if len(points) else 0.0
+        # Half a step of quantization plus the float32 rounding of the output.
+        extent = max(float(np.abs(decoded[axis]).max(initial=0)) for axis in "xyz")
+        bound = resolution / 2 + float(np.spacing(np.float32(extent)))
+        result["resolutions"][str(resolution)] = {
+            "bytes": len(encoded),
+            "ratio": len(payload) / len(encoded),
+            "encode_ms": encode * 1e3,
+            "decode_ms": decode * 1e3,
+            "encode_mb_s": len(payload) / encode / 1e6,
+            "decode_mb_s": len(payload) / decode / 1e6,
+            "max_error": error,
+            "within_bound": bool(error <= bound),
+        }
+        print(
+            "  %8g m %9d bytes %6.2fx  encode %7.2f ms %7.1f MB/s  "
+            "decode %7.2f ms %7.1f MB/s  max error %.6f m%s"
+            % (
+                resolution,
+                len(encoded),
+                len(payload) / len(encoded),
+                encode * 1e3,
+                len(payload) / encode / 1e6,
+                decode * 1e3,
+                len(payload) / decode / 1e6,
+                error,
+                "" if error <= bound else "  OUT OF BOUND",
+            )
+        )
+    return result
+
+
+def main():
+    parser = ArgumentParser(
+        description="EdgeFirst Samples - Point Cloud Codec Benchmark",
+        epilog="Reports the compression ratio, throughput, and round-trip error "
+        "of the quantized point cloud codec against zstd on the raw PointCloud2.",
+    )
+    parser.add_argument(
+        "payloads",
+        nargs="*",
+        help="Serialized PointCloud2 files, such as the points_*.cdr and "
+        "clusters_*.cdr written by benchmark.py --save-fixtures. Synthetic clouds "
+        "by default.",
+    )
+    parser.add_argument(
+        "--resolution",
+        type=float,
+        nargs="+",
+        default=[0.001, 0.005, 0.01, 0.05],
+        help="Quantization steps in meters.",
+    )
+    parser.add_argument("--level", type=int, default=3, help="zstd level.")
+    parser.add_argument(
+        "-o", "--output", type=str, default=None, help="Write the results as JSON."
+    )
+    args = parser.parse_args()
+
+    if args.payloads:
+        payloads = {}
+        for path in args.payloads:
+            with open(path, "rb") as f:
+                payloads[os.path.basename(path)] = f.read()
+    else:
+        rng = np.random.default_rng(0)
+        payloads = {name: bytes(build(rng)) for name, build in FIXTURES.items()}
+
+    results = {name: run(name, payload, args) for name, payload in payloads.items()}
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
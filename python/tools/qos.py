@@ -0,0 +1,92 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
+
+from argparse import ArgumentParser
+import json
+import os
+import sys
+
+import zenoh
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from edgefirst_samples import add_qos_arg  # noqa: E402
+from edgefirst_samples.qos import (  # noqa: E402
+    TOPIC_PROFILES,
+    apply_qos,
+    qos_section,
+)
+
+
+def setting_name(value):
+    """real_time for Priority.REAL_TIME."""
+    return str(value).rpartition(".")[2].lower()
+
+
+def applied_qos(overrides):
+    """[(topic, reliability, congestion, priority, express)] as Zenoh applies
+    the publication rules to each topic of TOPIC_PROFILES and each override
+    naming a single topic.
+
+    A session without scouting or listeners publishes an empty message on
+    every topic and reads the settings back from its own subscriber, so
+    nothing leaves the process.
+    """
+    topics = [topic for topic, _ in TOPIC_PROFILES]
+    topics += [
+        key_expr
+        for key_expr, _ in overrides
+        if "*" not in key_expr and "$" not in key_expr and key_expr not in topics
+    ]
+    config = zenoh.Config()
+    config.insert_json5("scouting/multicast/enabled", "false")
+    config.insert_json5("listen/endpoints", "[]")
+    apply_qos(config, overrides)
+    session = zenoh.open(config)
+    subscriber = session.declare_subscriber("**")
+    publishers = {topic: session.declare_publisher(topic) for topic in topics}
+    for publisher in publishers.values():
+        publisher.put(b"")
+    applied = {}
+    while len(applied) < len(topics):
+        msg = subscriber.recv()
+        topic = str(msg.key_expr)
+        applied[topic] = (
+            topic,
+            setting_name(publishers[topic].reliability),
+            setting_name(msg.congestion_control),
+            setting_name(msg.priority),
+            msg.express,
+        )
+    session.close()
+    return [applied[topic] for topic in topics]
+
+
+def main():
+    parser = ArgumentParser(
+        description="EdgeFirst Samples - QoS Profiles",
+        epilog="Prints the qos section to merge into the Zenoh configuration of "
+        "the device router, so topics from every publisher are forwarded to "
+        "remote clients with the sample profiles.",
+    )
+    add_qos_arg(parser)
+    parser.add_argument(
+        "--table",
+        action="store_true",
+        help="Print the QoS Zenoh applies to each topic with these rules "
+        "instead of the JSON.",
+    )
+    args = parser.parse_args()
+
+    if args.table:
+        print(
+            "%-26s %-12s %-18s %-17s %s"
+            % ("topic", "reliability", "congestion", "priority", "express")
+        )
+        for row in applied_qos(args.qos):
+            print("%-26s %-12s %-18s %-17s %s" % row)
+    else:
+        print(json.dumps({"qos": qos_section(args.qos)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
+
+from argparse import ArgumentParser, Namespace
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+import zenoh
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from edgefirst_samples import zenoh_config  # noqa: E402
+
+PYTHON_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+class Ingest:
+    """Subscriber callback reading every payload into Python as a sample does.
+
+    Counts the messages delivered through shared memory and the time spent
+    copying payloads out of Zenoh with to_bytes(), the one copy a sample
+    makes itself.
+    """
+
+    def __init__(self):
+        self.topics = {}
+        self._lock = threading.Lock()
+
+    def callback(self, msg):
+        shm = msg.payload.as_shm() is not None
+        start = time.perf_counter()
+        data = msg.payload.to_bytes()
+        copy = time.perf_counter() - start
+        topic = str(msg.key_expr)
+        with self._lock:
+            stats = self.topics.setdefault(
+                topic, {"messages": 0, "bytes": 0, "shm": 0, "copy": 0.0}
+            )
+            stats["messages"] += 1
+            stats["bytes"] += len(data)
+            stats["shm"] += shm
+            stats["copy"] += copy
+
+    def reset(self):
+        with self._lock:
+            self.topics.clear()
+
+
+def start_publisher(shm, args):
+    command = [
+        sys.executable,
+        os.path.join(PYTHON_DIR, "tools", "synthetic.py"),
+        "--topics",
+        *args.topics,
+        "--variants",
+        "4",
+        "--camera-rate",
+        str(args.rate),
+        "--lidar-rate",
+        str(args.rate),
+        "--radar-rate",
+        str(args.rate),
+        "--model-rate",
+        str(args.rate),
+        "--mask-size",
+        *[str(size) for size in args.mask_size],
+    ]
+    if not shm:
+        command.append("--no-shm")
+    publisher = subprocess.Popen(
+        command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+    )
+    for line in publisher.stdout:
+        if line.startswith("Publishing"):
+            break
+    return publisher
+
+
+def measure(shm, args):
+    """Returns the per-topic ingest figures with shared memory on or off."""
+    session = zenoh.open(zenoh_config(Namespace(remote=None, no_shm=not shm)))
+    ingest = Ingest()
+    subscriber = session.declare_subscriber("rt/**", ingest.callback)
+    publisher = start_publisher(shm, args)
+
+    # Skip the first second while the publisher threads and sessions settle.
+    time.sleep(1.0)
+    ingest.reset()
+    cpu = time.process_time()
+    start = time.perf_counter()
+    time.sleep(args.duration)
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu
+    topics = {topic: dict(stats) for topic, stats in ingest.topics.items()}
+
+    publisher.send_signal(signal.SIGINT)
+    publisher.communicate()
+    subscriber.undeclare()
+    session.close()
+
+    total = sum(stats["bytes"] for stats in topics.values())
+    results = {"cpu_ms_per_mb": cpu * 1e3 / max(total / 1e6, 1e-9), "topics": {}}
+    for topic, stats in topics.items():
+        results["topics"][topic] = {
+            "rate": stats["messages"] / elapsed,
+            "bandwidth": stats["bytes"] / elapsed,
+            "mean_size": stats["bytes"] / stats["messages"],
+            "shm_ratio": stats["shm"] / stats["messages"],
+            "copy_ms": stats["copy"] * 1e3 / stats["messages"],
+        }
+    return results
+
+
+def print_results(shm, results):
+    print(
+        "shared memory %s, %.1f ms of subscriber CPU per MB"
+        % ("on" if shm else "off", results["cpu_ms_per_mb"])
+    )
+    for topic, stats in sorted(results["topics"].items()):
+        print(
+            "  %-18s %7.1f msg/s %8.1f MB/s %9.1f KB %4.0f%% via shm "
+            "to_bytes %.3f ms"
+            % (
+                topic,
+                stats["rate"],
+                stats["bandwidth"] / 1e6,
+                stats["mean_size"] / 1e3,
+                100.0 * stats["shm_ratio"],
+                stats["copy_ms"],
+            )
+        )
+
+
+def main():
+    parser = ArgumentParser(
+        description="EdgeFirst Samples - Shared Memory Transport Comparison"
+    )
+    parser.add_argument(
+        "--topics",
+        nargs="+",
+        default=["rt/camera/jpeg", "rt/lidar/points", "rt/radar/cube", "rt/model/mask"],
+        help="Synthetic topics to publish.",
+    )
+    parser.add_argument(
+        "--rate", type=float, default=30.0, help="Publish rate of every topic."
+    )
+    parser.add_argument(
+        "--mask-size", type=int, nargs=2, default=[1080, 1920], metavar=("H", "W")
+    )
+    parser.add_argument(
+        "-d",
+        "--duration",
+        type=float,
+        default=5.0,
+        help="Seconds to measure with shared memory on and then off.",
+    )
+    parser.add_argument(
+        "-o", "--output", type=str, default=None, help="Write the results as JSON."
+    )
+    args = parser.parse_args()
+
+    results = {}
+    for shm in (True, False):
+        results["on" if shm else "off"] = measure(shm, args)
+        print_results(shm, results["on" if shm else "off"])
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
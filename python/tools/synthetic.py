@@ -0,0 +1,321 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 Au-Zone Technologies. All Rights Reserved.
+
+from argparse import ArgumentParser
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import zenoh
+from zenoh.ext import CacheConfig, declare_advanced_publisher
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from edgefirst_samples import add_qos_arg, add_shm_arg, zenoh_config  # noqa: E402
+from edgefirst_samples import synthetic  # noqa: E402
+from edgefirst_samples.discovery import token_key  # noqa: E402
+from edgefirst_samples.static import STATIC_TOPICS  # noqa: E402
+
+
+class TopicPublisher:
+    """Publishes pre-encoded payloads of one topic at a fixed rate."""
+
+    def __init__(self, session, topic, payloads, rate, stamped=True):
+        self.topic = topic
+        self.rate = rate
+        self.published = 0
+        self.bytes = 0
+        self.late = 0
+        self._payloads = payloads
+        self._stamped = stamped
+        encoding = zenoh.Encoding.APPLICATION_CDR.with_schema(synthetic.SCHEMAS[topic])
+        if topic in STATIC_TOPICS:
+            # Keeps the last sample for subscribers asking for history, as
+            # the device does for its info topics.
+            self._publisher = declare_advanced_publisher(
+                session,
+                topic,
+                encoding=encoding,
+                cache=CacheConfig(max_samples=1),
+                publisher_detection=True,
+            )
+        else:
+            self._publisher = session.declare_publisher(topic, encoding=encoding)
+        # Announces the topic and its schema so it can be discovered without
+        # its payload.
+        self._token = session.liveliness().declare_token(
+            token_key(topic, synthetic.SCHEMAS[topic])
+        )
+
+    def run(self, stop):
+        period = 1.0 / self.rate
+        deadline = time.monotonic()
+        while not stop.is_set():
+            payload = self._payloads[self.published % len(self._payloads)]
+            if self._stamped:
+                synthetic.restamp(payload, time.time_ns())
+            self._publisher.put(payload)
+            self.published += 1
+            self.bytes += len(payload)
+
+            deadline += period
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                stop.wait(delay)
+            elif delay < -period:
+                # Skip the missed ticks rather than bursting to catch up.
+                self.late += 1
+                deadline = time.monotonic()
+
+
+def camera_h264(args, rng):
+    return synthetic.h264_frames(args.width, args.height, args.variants)
+
+
+def camera_jpeg(args, rng):
+    return synthetic.jpeg_frames(args.width, args.height, args.variants)
+
+
+def lidar_points(args, rng):
+    return [synthetic.lidar_points(args.points, rng) for _ in range(args.variants)]
+
+
+def lidar_clusters(args, rng):
+    return [
+        synthetic.lidar_clusters(args.cluster_points, rng) for _ in range(args.variants)
+    ]
+
+
+def radar_cube(args, rng):
+    return [
+        synthetic.radar_cube(
+            rng, args.range_bins, args.doppler_bins, targets=args.targets
+        )
+        for _ in range(args.variants)
+    ]
+
+
+def model_boxes2d(args, rng):
+    return [synthetic.boxes2d(args.boxes, rng) for _ in range(args.variants)]
+
+
+def model_mask(args, rng):
+    height, width = args.mask_size
+    return [
+        synthetic.mask(height, width, args.mask_classes, rng)
+        for _ in range(args.variants)
+    ]
+
+
+def imu(args, rng):
+    return [synthetic.imu(i / args.imu_rate) for i in range(args.variants)]
+
+
+def gps(args, rng):
+    return [synthetic.gps(i / args.gps_rate) for i in range(args.variants)]
+
+
+def camera_info(args, rng):
+    return [synthetic.camera_info(args.width, args.height)]
+
+
+def model_info(args, rng):
+    return [synthetic.model_info(args.mask_classes)]
+
+
+def radar_info(args, rng):
+    return [synthetic.radar_info()]
+
+
+# Encodes the payloads cycled through on each topic, --variants of them unless
+# the topic is static.
+PAYLOAD_BUILDERS = {
+    "rt/camera/h264": camera_h264,
+    "rt/camera/jpeg": camera_jpeg,
+    "rt/lidar/points": lidar_points,
+    "rt/lidar/clusters": lidar_clusters,
+    "rt/radar/cube": radar_cube,
+    "rt/model/boxes2d": model_boxes2d,
+    "rt/model/mask": model_mask,
+    "rt/imu": imu,
+    "rt/gps": gps,
+    "rt/camera/info": camera_info,
+    "rt/model/info": model_info,
+    "rt/radar/info": radar_info,
+}
+
+
+def build_payloads(topic, args, rng):
+    """Encodes the --variants payloads cycled through for a topic."""
+    if topic not in PAYLOAD_BUILDERS:
+        raise ValueError("unknown topic %s" % topic)
+    return PAYLOAD_BUILDERS[topic](args, rng)
+
+
+def topic_rate(topic, args):
+    if topic in STATIC_TOPICS:
+        return args.info_rate
+    if topic.startswith("rt/camera"):
+        return args.camera_rate
+    if topic.startswith("rt/lidar"):
+        return args.lidar_rate
+    if topic.startswith("rt/radar"):
+        return args.radar_rate
+    if topic.startswith("rt/model"):
+        return args.model_rate
+    if topic == "rt/imu":
+        return args.imu_rate
+    return args.gps_rate
+
+
+def main():
+    parser = ArgumentParser(description="EdgeFirst Samples - Synthetic Publisher")
+    parser.add_argument(
+        "-r",
+        "--remote",
+        type=str,
+        default=None,
+        help="Connect to the remote endpoint instead of local.",
+    )
+    add_shm_arg(parser)
+    add_qos_arg(parser)
+    parser.add_argument(
+        "--topics",
+        nargs="+",
+        choices=list(synthetic.SCHEMAS),
+        default=list(synthetic.SCHEMAS),
+        help="Topics to publish, all of them by default.",
+    )
+    parser.add_argument(
+        "-t",
+        "--time",
+        type=float,
+        default=None,
+        help="Time in seconds to run command before exiting.",
+    )
+    parser.add_argument(
+        "--variants",
+        type=int,
+        default=30,
+        help="Distinct pre-encoded messages cycled through on each topic, "
+        "also the H.264 group of pictures.",
+    )
+    parser.add_argument(
+        "--camera-rate", type=float, default=30.0, help="Camera frames per second."
+    )
+    parser.add_argument(
+        "--width", type=int, default=1280, help="Camera frame width in pixels."
+    )
+    parser.add_argument(
+        "--height", type=int, default=720, help="Camera frame height in pixels."
+    )
+    parser.add_argument(
+        "--lidar-rate", type=float, default=10.0, help="LiDAR scans per second."
+    )
+    parser.add_argument(
+        "--points", type=int, default=65536, help="Points in each LiDAR scan."
+    )
+    parser.add_argument(
+        "--cluster-points",
+        type=int,
+        default=8192,
+        help="Points in each LiDAR clusters message.",
+    )
+    parser.add_argument(
+        "--radar-rate", type=float, default=18.0, help="Radar cubes per second."
+    )
+    parser.add_argument(
+        "--range-bins", type=int, default=200, help="Range bins of the radar cube."
+    )
+    parser.add_argument(
+        "--doppler-bins", type=int, default=256, help="Doppler bins of the radar cube."
+    )
+    parser.add_argument(
+        "--targets", type=int, default=8, help="Targets drawn into each radar cube."
+    )
+    parser.add_argument(
+        "--model-rate", type=float, default=30.0, help="Model results per second."
+    )
+    parser.add_argument(
+        "--boxes", type=int, default=20, help="Boxes in each boxes2d message."
+    )
+    parser.add_argument(
+        "--mask-size",
+        type=int,
+        nargs=2,
+        default=[320, 320],
+        metavar=("H", "W"),
+        help="Height and width of the segmentation mask.",
+    )
+    parser.add_argument(
+        "--mask-classes", type=int, default=2, help="Classes of the segmentation mask."
+    )
+    parser.add_argument(
+        "--imu-rate", type=float, default=200.0, help="IMU messages per second."
+    )
+    parser.add_argument(
+        "--gps-rate", type=float, default=10.0, help="GPS fixes per second."
+    )
+    parser.add_argument(
+        "--info-rate",
+        type=float,
+        default=1.0,
+        help="Messages per second on the info topics.",
+    )
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    config = zenoh_config(args)
+    # Advanced publishers order their cached samples by timestamp.
+    config.insert_json5("timestamping/enabled", "true")
+    session = zenoh.open(config)
+
+    publishers = []
+    for topic in args.topics:
+        print("Encoding %d %s messages" % (args.variants, topic))
+        publishers.append(
+            TopicPublisher(
+                session,
+                topic,
+                build_payloads(topic, args, rng),
+                topic_rate(topic, args),
+                stamped=topic != "rt/model/mask",
+            )
+        )
+
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=publisher.run, args=[stop], daemon=True)
+        for publisher in publishers
+    ]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    print("Publishing, press Ctrl+C to stop")
+
+    try:
+        stop.wait(args.time)
+    except KeyboardInterrupt:
+        pass
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    elapsed = time.monotonic() - start
+    for publisher in publishers:
+        print(
+            "%s: %.1f/%.1f msg/s %.2f MB/s %d late"
+            % (
+                publisher.topic,
+                publisher.published / elapsed,
+                publisher.rate,
+                publisher.bytes / elapsed / 1e6,
+                publisher.late,
+            )
+        )
+    session.close()
+
+
+if __name__ == "__main__":
+    main()